@@ -5,3 +5,5 @@ from chartpy.style import Style
 from chartpy.canvas import Canvas
 from chartpy.chartconstants import ChartConstants
 from chartpy.twitter import Twitter
+from chartpy.engineregistry import EngineRegistry
+from chartpy.datasource import DataSource
@@ -0,0 +1,214 @@
+__author__ = 'saeedamen'  # Saeed Amen
+
+#
+# Copyright 2016 Cuemacro
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+"""
+BatchPlotter
+
+Plots many independent Chart objects in parallel over a pool of processes (matplotlib isn't thread safe, so we can't
+use threads). Each worker process uses the Agg backend and clears pyplot after each chart, so no state leaks between
+charts.
+
+"""
+
+import os
+import traceback
+
+
+class ChartPlotError(Exception):
+    """Returned (or raised) in place of the output of a chart which failed to plot in BatchPlotter
+
+    Attributes
+    ----------
+    index : int
+        Position of the chart in the list given to BatchPlotter
+    error : str
+        Description of the original exception
+    traceback : str
+        Traceback of the original exception (from the worker process)
+    """
+
+    def __init__(self, index, error, traceback):
+        super(ChartPlotError, self).__init__("Chart " + str(index) + " failed: " + error)
+
+        self.index = index
+        self.error = error
+        self.traceback = traceback
+
+    def __reduce__(self):
+        return (ChartPlotError, (self.index, self.error, self.traceback))
+
+
+class BatchPlotter(object):
+
+    def plot_many(self, charts, workers=None, output='figure', raise_errors=False, mp_context='spawn',
+                  share_memory=False):
+        """Plots many Chart objects in parallel over a process pool, with each chart using its own engine, Style and
+        output mode (eg. style.plotly_plot_mode = 'offline_image_png_bytes' or matplotlib's style.file_output). Charts
+        are always plotted with style.silent_display = True, given there's no screen in the workers.
+
+        Parameters
+        ----------
+        charts : Chart (list)
+            Charts to be plotted (with their DataFrames, engines and styles already set)
+        workers : int
+            Number of worker processes (defaults to the number of CPUs), if 1 plots in this process
+        output : str
+            'figure' - return whatever the engine returns (eg. matplotlib Figure, Plotly Figure, HTML div, PNG bytes),
+            or the file written if the engine returns nothing
+
+            'file' - return the path of the file written by the engine
+        raise_errors : bool
+            If True, raise the first ChartPlotError, otherwise return a ChartPlotError for each chart which failed
+        mp_context : str
+            multiprocessing start method, 'spawn' is safest with matplotlib (fresh interpreter per worker)
+        share_memory : bool
+            Hand large DataFrames (above ChartConstants.chartfactory_shared_memory_min_bytes) to the workers through
+            shared memory (see SharedDataFrame), rather than pickling a copy for every chart
+
+        Returns
+        -------
+        list
+            Output for each chart, in the same order as charts
+        """
+        charts = list(charts)
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        workers = max(min(workers, len(charts)), 1)
+
+        if workers == 1:
+            results = [_plot_chart(i, chart, output, False) for i, chart in enumerate(charts)]
+        else:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            shared_frames = {}
+
+            try:
+                if share_memory:
+                    charts = [self._share_chart(chart, shared_frames) for chart in charts]
+
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         mp_context=multiprocessing.get_context(mp_context)) as executor:
+
+                    futures = [executor.submit(_plot_chart, i, chart, output, True) for i, chart in enumerate(charts)]
+
+                    results = []
+
+                    for i, future in enumerate(futures):
+                        try:
+                            results.append(future.result())
+                        except Exception as e:
+                            # eg. the chart or its output couldn't be pickled, or the worker died
+                            results.append(ChartPlotError(i, repr(e), traceback.format_exc()))
+            finally:
+                for shared_frame in shared_frames.values():
+                    shared_frame.release()
+
+        if raise_errors:
+            for result in results:
+                if isinstance(result, ChartPlotError):
+                    raise result
+
+        return results
+
+    def _share_chart(self, chart, shared_frames):
+        # copy of the chart, with its large DataFrames swapped for SharedDataFrames (each DataFrame is only written
+        # once, even if several charts plot it)
+        import copy
+
+        import pandas
+
+        from chartpy.chartconstants import ChartConstants
+        from chartpy.sharedframe import SharedDataFrame
+
+        min_bytes = ChartConstants().chartfactory_shared_memory_min_bytes
+
+        def share(df):
+            if not (isinstance(df, pandas.DataFrame)) or df.memory_usage(index=True, deep=False).sum() < min_bytes:
+                return df
+
+            if id(df) not in shared_frames:
+                shared_frames[id(df)] = SharedDataFrame(df)
+
+            return shared_frames[id(df)]
+
+        if isinstance(chart.df, list):
+            df = [share(d) for d in chart.df]
+        else:
+            df = share(chart.df)
+
+        if df is chart.df or (isinstance(df, list) and all(d is c for d, c in zip(df, chart.df))):
+            return chart
+
+        chart = copy.copy(chart)
+        chart.df = df
+
+        return chart
+
+
+def _init_worker():
+    # No screen in the workers, so always render off screen (needs to be done before pyplot is imported)
+    try:
+        import matplotlib
+
+        matplotlib.use('Agg')
+    except:
+        pass
+
+
+def _plot_chart(index, chart, output, in_worker):
+    try:
+        import copy
+
+        # work on copies, so the caller's Chart/Style aren't changed when plotting inline (no worker processes)
+        chart = copy.copy(chart)
+        chart.style = style = copy.copy(chart.style)
+
+        style.silent_display = True
+
+        from chartpy.sharedframe import SharedDataFrame
+
+        # DataFrames handed over in shared memory, mapped read only into this process (lazy DataSources are left to
+        # Chart.plot, which only reads what the style and chart type need)
+        if isinstance(chart.df, SharedDataFrame):
+            chart.df = chart.df.to_data_frame()
+        elif isinstance(chart.df, list):
+            chart.df = [d.to_data_frame() if isinstance(d, SharedDataFrame) else d for d in chart.df]
+
+        fig = chart.plot()
+
+        if output == 'file' or fig is None:
+            # only return a path if the chart was actually written there (eg. plot modes which return images as
+            # bytes don't write any file)
+            for path in (style.file_output, style.html_file_output):
+                if path is not None and os.path.exists(path):
+                    return path
+
+            return ChartPlotError(index, "no file was written (file_output: " + str(style.file_output)
+                                  + ", html_file_output: " + str(style.html_file_output) + ")", '')
+
+        return fig
+    except Exception as e:
+        return ChartPlotError(index, repr(e), traceback.format_exc())
+    finally:
+        # Don't let figures from one chart leak into the next one plotted by this worker
+        try:
+            import sys
+
+            if in_worker and 'matplotlib.pyplot' in sys.modules:
+                sys.modules['matplotlib.pyplot'].close('all')
+        except:
+            pass
@@ -177,35 +177,37 @@ class CanvasPlotterPlain(CanvasPlotterTemplate):
 
                             old_margin = chart.style.thin_margin
                             old_silent_display = chart.style.silent_display
+                            old_matplotlib_plot_mode = chart.style.matplotlib_plot_mode
                             chart.style.silent_display = True
                             chart.style.thin_margin = True
 
-                            chart.plot()
+                            # matplotlib charts are embedded directly in the page as PNGs, rather than saved to files
+                            if chart.engine == 'matplotlib':
+                                chart.style.matplotlib_plot_mode = 'offline_image_png_in_html'
+
+                            output = chart.plot()
 
                             chart.style.thin_margin = old_margin
                             chart.style.silent_display = old_silent_display
+                            chart.style.matplotlib_plot_mode = old_matplotlib_plot_mode
 
-                            # grab file name
                             if chart.engine == 'matplotlib':
-                                # if (chart.style.file_output is None):
-                                #     import time
-                                #     chart.style.file_output = str(time.time()) + "matplotlib.png"
-
-                                source_file = chart.style.file_output
+                                html.append(output)
                             else:
+                                # grab file name
                                 source_file = chart.style.html_file_output
 
-                            try:
-                                width = chart.style.width * abs(chart.style.scale_factor) + padding
-                                height = chart.style.height * abs(chart.style.scale_factor) + padding
+                                try:
+                                    width = chart.style.width * abs(chart.style.scale_factor) + padding
+                                    height = chart.style.height * abs(chart.style.scale_factor) + padding
 
-                                # html.append('<div align="center"><div>')
-                                html.append('<iframe src="' + source_file + '" width="' + str(width) + \
-                                            '" height="' + str(height) + '" frameborder="0" scrolling="no"></iframe>')
+                                    # html.append('<div align="center"><div>')
+                                    html.append('<iframe src="' + source_file + '" width="' + str(width) + \
+                                                '" height="' + str(height) + '" frameborder="0" scrolling="no"></iframe>')
 
-                                # html.append('</div></div>')
-                            except:
-                                pass
+                                    # html.append('</div></div>')
+                                except:
+                                    pass
 
                             # print(chart.style.html_file_output)
                             # print(chart)
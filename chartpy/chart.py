@@ -15,7 +15,8 @@ __author__ = 'saeedamen'  # Saeed Amen
 from chartpy.twitter import Twitter
 from chartpy.chartconstants import ChartConstants
 from chartpy.style import Style
-from chartpy.engine import EngineMatplotlib, EngineBokeh, EngineBqplot, EnginePlotly, EngineVisPy
+from chartpy.engineregistry import EngineRegistry
+from chartpy.datasource import DataSource
 
 import pandas
 
@@ -66,11 +67,23 @@ class Chart(object):
                 pass
 
         if isinstance(df, list):
-            for i in range(0, len(df)):
-                if isinstance(df[i], pandas.Series):
-                    df[i] = pandas.DataFrame(df[i])
+            # new list, so the caller's (eg. lazy DataSources) isn't changed
+            df_list = []
+
+            for d in df:
+                if isinstance(d, DataSource):
+                    d = d.to_data_frame(style=style, chart_type=chart_type)
+                elif isinstance(d, pandas.Series):
+                    d = pandas.DataFrame(d)
+
+                df_list.append(d)
+
+            df = df_list
         else:
-            if isinstance(df, pandas.Series):
+            # only read the columns/rows we need (downsampled) from lazy sources eg. Parquet files
+            if isinstance(df, DataSource):
+                df = df.to_data_frame(style=style, chart_type=chart_type)
+            elif isinstance(df, pandas.Series):
                 df = pandas.DataFrame(df)
 
         if engine is None:
@@ -91,21 +104,111 @@ class Chart(object):
         return fig
 
     def get_engine(self, engine):
+        """Gets the (cached) engine instance for an engine name, eg. 'matplotlib', 'plotly', 'bokeh' or any engine
+        added with Chart.register_engine. Engines are built once per process and then reused by every Chart.
+        """
 
         if engine is None:
             return self.get_engine(self.engine)
-        elif engine == 'matplotlib':
-            return EngineMatplotlib()
-        elif engine == 'bokeh':
-            return EngineBokeh()
-        elif engine == 'bqplot':
-            return EngineBqplot()
-        elif engine == 'vispy':
-            return EngineVisPy()
-        elif engine == 'plotly':
-            return EnginePlotly()
-
-        return None
+
+        return EngineRegistry().get_engine(engine)
+
+    @staticmethod
+    def register_engine(name, engine, replace=True):
+        """Registers a third party engine by name, so it can be used with Chart(engine=name)
+
+        Parameters
+        ----------
+        name : str
+            Name of the engine
+        engine : str or class or callable or EngineTemplate
+            "module:ClassName" string, EngineTemplate subclass, factory or engine instance
+        replace : bool
+            Replace an existing engine with the same name?
+        """
+        EngineRegistry().register_engine(name, engine, replace=replace)
+
+    @staticmethod
+    def plot_many(charts, workers=None, output='figure', raise_errors=False, share_memory=False):
+        """Plots many independent Chart objects in parallel over a pool of processes, see BatchPlotter.plot_many
+
+        Parameters
+        ----------
+        charts : Chart (list)
+            Charts to plot
+        workers : int
+            Number of worker processes (defaults to number of CPUs)
+        output : str
+            'figure' (whatever each engine returns) or 'file' (path of the file written)
+        raise_errors : bool
+            Raise the first ChartPlotError, rather than returning it in place of that chart's output
+        share_memory : bool
+            Hand large DataFrames to the workers in shared memory, rather than pickling them for every chart
+
+        Returns
+        -------
+        list
+            Output of each chart, in the same order as charts
+        """
+        from chartpy.batchplotter import BatchPlotter
+
+        return BatchPlotter().plot_many(charts, workers=workers, output=output, raise_errors=raise_errors,
+                                        share_memory=share_memory)
+
+    def plot_live(self, df=None, engine=None, style=None, max_points=None):
+        """Plots a line chart which can be updated in place as new rows arrive, with extend_plot (or the update
+        method of the returned object), for matplotlib (redrawn in place) and bokeh (served from a local Bokeh server,
+        which streams the new points to the browser)
+
+        Parameters
+        ----------
+        df : DataFrame
+            Initial data
+        engine : str
+            Engine (default is this Chart's engine)
+        style : Style
+            Style of the chart
+        max_points : int
+            Only keep the last max_points on each line (rolling window), if None keep all of them
+
+        Returns
+        -------
+        obj
+            Engine specific live chart (eg. LiveChartMatplotlib or LiveChartBokeh)
+        """
+        if style is None: style = self.style
+        if df is None: df = self.df
+
+        if isinstance(df, pandas.Series):
+            df = pandas.DataFrame(df)
+
+        return self.get_engine(engine).plot_live(df, style, chart_type='line', max_points=max_points)
+
+    def extend_plot(self, fig, df, engine=None, max_points=None):
+        """Gets the update for a live chart which has already been plotted, when new rows have been appended to its
+        data, rather than plotting the whole chart again (so the work done only depends on the number of new rows).
+        For Plotly, fig isn't modified and the returned delta should be applied on the client (eg. Dash extendData).
+
+        Parameters
+        ----------
+        fig : obj
+            Chart already returned by plot (eg. Plotly Figure)
+        df : DataFrame
+            Newly appended rows, with the same columns as the original data
+        engine : str
+            Engine which plotted fig (default is this Chart's engine)
+        max_points : int
+            Only keep the last max_points on each trace (rolling window), if None keep all of them
+
+        Returns
+        -------
+        obj
+            Engine specific update (eg. extendTraces style dict for Plotly)
+        """
+        if isinstance(df, pandas.Series):
+            df = pandas.DataFrame(df)
+
+        return self.get_engine(engine).extend_chart(fig, df, max_points=max_points)
 
     # TODO fix this
     def _iplot(self, data_frame, engine=None, chart_type=None, style=None):
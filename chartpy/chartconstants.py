@@ -36,9 +36,18 @@ class ChartConstants(object):
     # for plots
     chartfactory_silent_display = False
 
-    if (chartfactory_silent_display == True):
-        import matplotlib
-        matplotlib.use('Agg')
+    # headless/server mode (eg. generating PNGs in a web server), matplotlib always uses the Agg backend and charts are
+    # never displayed, can also be switched on with the environment variable CHARTPY_HEADLESS=1
+    chartfactory_headless = os.environ.get('CHARTPY_HEADLESS', '').lower() in ('1', 'true', 'yes')
+
+    if (chartfactory_silent_display == True or chartfactory_headless == True):
+        import sys
+
+        # only import matplotlib here if it's already been imported (otherwise it picks up Agg when first imported)
+        if 'matplotlib' in sys.modules:
+            sys.modules['matplotlib'].use('Agg')
+        else:
+            os.environ['MPLBACKEND'] = 'Agg'
 
     chartfactory_default_engine = "matplotlib"
     chartfactory_source = "Web"
@@ -61,8 +70,30 @@ class ChartConstants(object):
     chartfactory_width = 600
     chartfactory_height = 400
     chartfactory_bubble_size_scalar = 35
+    chartfactory_heatmap_label_max_cells = 2500 # don't label heatmap cells above this (None to always label)
+    chartfactory_bar_collection = False # draw each bar series as one PolyCollection, rather than a Rectangle per bar
+    chartfactory_line_collection_threshold = 100 # draw line charts with this many series as one LineCollection (None never)
+    chartfactory_legend_max_series = 10 # series listed in the legend of a LineCollection chart (None for all)
     chartfactory_font_family = 'open sans'
 
+    ########## RENDER CACHE
+    # cache rendered charts (eg. Plotly JSON/PNG/HTML divs) keyed on a hash of the DataFrame & Style
+    chartfactory_render_cache = False
+    chartfactory_render_cache_memory_bytes = 256 * 1024 * 1024
+    chartfactory_render_cache_disk_folder = None # eg. '/tmp/chartpy_cache', None for memory only
+    chartfactory_render_cache_disk_bytes = 2 * 1024 * 1024 * 1024
+
+    ########## SHARED MEMORY (for Chart.plot_many with share_memory=True)
+    chartfactory_shared_memory_folder = None # None for /dev/shm (or the temp folder if there isn't one)
+    chartfactory_shared_memory_min_bytes = 16 * 1024 * 1024 # smaller DataFrames are just pickled
+
+    ########## MATPLOTLIB SETTINGS
+    # 'offline_file' - save to style.file_output (if style.save_fig)
+    # 'offline_image_png_bytes'/'offline_image_svg_bytes' - return the image as bytes
+    # 'offline_image_png_bytesio'/'offline_image_svg_bytesio' - return the image in a BytesIO
+    # 'offline_image_png_in_html'/'offline_image_svg_in_html' - return an HTML <img> with the image embedded in base64
+    matplotlib_plot_mode = 'offline_file'
+
     ########## BOKEH SETTINGS
     bokeh_font       = 'open sans'
     bokeh_font_style = "normal"
@@ -77,6 +108,16 @@ class ChartConstants(object):
 
     bokeh_plot_mode = 'offline_html'  # 'offline_jupyter'
 
+    # Put the index and series of each chart in one ColumnDataSource, shared by all the glyphs (and linked subplots),
+    # so the index is only written once to the HTML
+    bokeh_shared_source = True
+
+    # Port of the local Bokeh server for live charts (plot_live)
+    bokeh_server_port = 5006
+
+    # Heatmaps with more cells than this are drawn as an image, rather than a rect for each cell (None to always use rects)
+    bokeh_heatmap_rect_max_cells = 10000
+
     ########## PLOTLY SETTINGS
     plotly_world_readable = False
     plotly_plot_mode = 'offline_html_exc_embed_js' # 'online', 'offline_jupyter', 'offline_html_exc_embed_js', 'offline_html'
@@ -89,8 +130,20 @@ class ChartConstants(object):
                        '#FFB5B8',
                        '#ee538b']
     plotly_webgl = False
+
+    # Switch line/scatter traces to WebGL (scattergl) automatically when a chart has more points than this (None to
+    # only use WebGL when plotly_webgl = True)
+    plotly_webgl_threshold = 100000
     plotly_helper = 'plotly_express' # plotly_express
 
+    # How style.candlestick_series is drawn, 'candlestick' (native go.Candlestick), 'ohlc' (go.Ohlc) or 'box' (older
+    # box traces, 6 points per candle)
+    plotly_candlestick_trace = 'candlestick'
+
+    # Static image export (eg. offline_image_png_bytes) with long lived image server process(es)
+    plotly_image_engine = 'auto' # 'kaleido', 'orca' or 'auto'
+    plotly_image_export_workers = 1 # number of Kaleido processes used by publish_many
+
     # 'plotly' - Default Plotly theme
     # 'plotly_white' - White background with light gray grid lines
     # 'plotly_dark' - Dark background
@@ -131,6 +184,9 @@ class ChartConstants(object):
 
     chartfactory_default_colormap = 'Blues'
 
+    # Number of sampled colormaps and converted colors (to RGBA/hex) which are cached between charts
+    chartfactory_color_cache_size = 1024
+
     # nicer than the default colors of matplotlib (fully editable!)
     # list of colors from http://www.github.com/santosjorge/cufflinks project
     # where I've overwritten some of the primary colours (with the above)
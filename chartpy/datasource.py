@@ -0,0 +1,264 @@
+__author__ = 'saeedamen'  # Saeed Amen
+
+#
+# Copyright 2016 Cuemacro
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+"""
+DataSource
+
+Lazy source of data for a Chart, such as a Parquet file, an Arrow IPC/Feather file, an Arrow Table or a (memory mapped)
+NumPy array, which may be much larger than we'd want to load in memory. Only the columns and time range we ask for are
+read, and if the Style downsamples (style.resample), only the downsampled rows are copied into the DataFrame given to
+the chart engine. Arrow IPC files and .npy files are memory mapped, so the full columns are never held in memory.
+
+Needs pyarrow for Parquet and Arrow sources.
+
+"""
+
+import os
+
+import numpy
+import pandas
+
+
+class DataSource(object):
+
+    def __init__(self, source, columns=None, start_date=None, finish_date=None, index_column=None,
+                 column_names=None, index=None):
+        """Creates a lazy data source (nothing is read until to_data_frame is called)
+
+        Parameters
+        ----------
+        source : str or pyarrow.Table or numpy.ndarray or DataFrame
+            Path of a Parquet (.parquet, .pq), Arrow IPC/Feather (.arrow, .feather, .ipc) or NumPy (.npy) file, or an
+            Arrow Table, NumPy array (eg. numpy.memmap) or DataFrame
+        columns : str (list)
+            Columns to read (if None, reads all of them)
+        start_date : str or datetime
+            First date to read (inclusive)
+        finish_date : str or datetime
+            Last date to read (inclusive)
+        index_column : str
+            Column to use as the index for Arrow sources (if None, uses the index stored by pandas, if any)
+        column_names : str (list)
+            Names of the columns of NumPy sources (default is 0, 1, 2...)
+        index : array-like
+            Index of NumPy sources (default is 0, 1, 2...)
+        """
+        self.source = source
+        self.columns = [columns] if isinstance(columns, str) else columns
+        self.start_date = start_date
+        self.finish_date = finish_date
+        self.index_column = index_column
+        self.column_names = column_names
+        self.index = index
+
+    def to_data_frame(self, style=None, chart_type=None):
+        """Reads the requested columns and time range, downsampling (as specified by style.resample) before copying
+        the data into the DataFrame
+
+        Parameters
+        ----------
+        style : Style
+            Style of the chart (for style.resample and the chart width)
+        chart_type : str (list)
+            Chart type(s), we only downsample line/scatter style charts
+
+        Returns
+        -------
+        DataFrame
+        """
+        # DataFrame which (where possible) doesn't copy the underlying data
+        data_frame = self._read_view()
+
+        if self.start_date is not None or self.finish_date is not None:
+            start_date = self.start_date
+            finish_date = self.finish_date
+
+            if isinstance(data_frame.index, pandas.DatetimeIndex):
+                if start_date is not None:
+                    start_date = self._to_timestamp(start_date, data_frame.index.tz)
+
+                if finish_date is not None:
+                    finish_date = self._to_timestamp(finish_date, data_frame.index.tz)
+
+            data_frame = data_frame.loc[start_date:finish_date]
+
+        if style is not None:
+            from chartpy.downsampler import Downsampler
+
+            data_frame = Downsampler().downsample_style(data_frame, style, chart_type)
+
+        # materialise only what is left (so we don't keep memory maps open once the source is gone)
+        return data_frame.copy()
+
+    def _read_view(self):
+        source = self.source
+
+        if isinstance(source, pandas.DataFrame):
+            return source if self.columns is None else source[self.columns]
+
+        if isinstance(source, numpy.ndarray):
+            return self._numpy_to_data_frame(source)
+
+        if isinstance(source, str):
+            extension = os.path.splitext(source)[1].lower()
+
+            if extension == '.npy':
+                return self._numpy_to_data_frame(numpy.load(source, mmap_mode='r', allow_pickle=False))
+            elif extension in ('.parquet', '.pq'):
+                return self._read_parquet(source)
+            elif extension in ('.arrow', '.feather', '.ipc'):
+                return self._read_arrow_ipc(source)
+
+            raise Exception("Unknown data source file type " + source)
+
+        # otherwise assume it's an Arrow Table
+        return self._arrow_to_data_frame(source)
+
+    def _numpy_to_data_frame(self, values):
+        if values.ndim == 1:
+            values = values[:, None]
+
+        column_names = self.column_names
+
+        if column_names is None:
+            column_names = list(range(values.shape[1]))
+
+        data_frame = pandas.DataFrame(values, columns=column_names, index=self.index, copy=False)
+
+        if self.columns is not None:
+            data_frame = data_frame[self.columns]
+
+        return data_frame
+
+    def _read_parquet(self, path):
+        import pyarrow.parquet
+
+        parquet_file = pyarrow.parquet.ParquetFile(path)
+        index_column = self._get_index_column(parquet_file.schema_arrow)
+
+        columns = None
+        filters = None
+
+        if self.columns is not None:
+            columns = [str(c) for c in self.columns]
+
+            if index_column is not None and index_column not in columns:
+                columns.append(index_column)
+
+        # skip row groups (and rows) outside the time range, before decoding them
+        if index_column is not None:
+            filters = []
+
+            tz = self._get_column_tz(parquet_file.schema_arrow, index_column)
+
+            if self.start_date is not None:
+                filters.append((index_column, '>=', self._to_timestamp(self.start_date, tz)))
+
+            if self.finish_date is not None:
+                filters.append((index_column, '<=', self._to_timestamp(self.finish_date, tz)))
+
+            if filters == []:
+                filters = None
+
+        table = pyarrow.parquet.read_table(path, columns=columns, filters=filters, use_pandas_metadata=False)
+
+        return self._arrow_to_data_frame(table, index_column=index_column)
+
+    def _get_column_tz(self, schema, column):
+        # time zone of a timestamp column (None if it's naive or not a timestamp)
+        import pyarrow
+
+        try:
+            column_type = schema.field(column).type
+        except KeyError:
+            return None
+
+        if pyarrow.types.is_timestamp(column_type):
+            return column_type.tz
+
+        return None
+
+    def _to_timestamp(self, date, tz):
+        # pyarrow can't compare naive and tz-aware timestamps, so match the bound to the index column
+        date = pandas.Timestamp(date)
+
+        if tz is not None:
+            return date.tz_localize(tz) if date.tz is None else date.tz_convert(tz)
+
+        return date if date.tz is None else date.tz_convert(None)
+
+    def _read_arrow_ipc(self, path):
+        import pyarrow
+
+        # memory mapped, so the columns are only paged in as they are read
+        table = pyarrow.ipc.open_file(pyarrow.memory_map(path, 'r')).read_all()
+
+        return self._arrow_to_data_frame(table)
+
+    def _arrow_to_data_frame(self, table, index_column=None):
+        if index_column is None:
+            index_column = self._get_index_column(table.schema)
+
+        columns = self.columns
+
+        if columns is None:
+            columns = [c for c in table.column_names if c != index_column]
+
+        data = {}
+
+        for c in columns:
+            # no copy for numeric columns without nulls
+            data[c] = self._arrow_to_numpy(table.column(str(c)))
+
+        index = None
+
+        if index_column is not None:
+            # via pandas, to keep any time zone
+            index = pandas.Index(table.column(index_column).to_pandas(),
+                                 name=self._get_index_name(table.schema, index_column))
+
+        return pandas.DataFrame(data, index=index, copy=False)
+
+    def _arrow_to_numpy(self, chunked_array):
+        if chunked_array.num_chunks == 1:
+            return chunked_array.chunk(0).to_numpy(zero_copy_only=False)
+
+        return chunked_array.to_numpy()
+
+    def _get_index_column(self, schema):
+        if self.index_column is not None:
+            return self.index_column
+
+        # pandas writes the names of its index columns into the schema's metadata
+        try:
+            for index_column in schema.pandas_metadata['index_columns']:
+                if isinstance(index_column, str):
+                    return index_column
+        except Exception:
+            pass
+
+        return None
+
+    def _get_index_name(self, schema, index_column):
+        if index_column.startswith('__index_level_'):
+            try:
+                for c in schema.pandas_metadata['columns']:
+                    if c['field_name'] == index_column:
+                        return c['name']
+            except Exception:
+                pass
+
+            return None
+
+        return index_column
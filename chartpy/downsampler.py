@@ -0,0 +1,274 @@
+__author__ = 'saeedamen'  # Saeed Amen
+
+#
+# Copyright 2016 Cuemacro
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+"""
+Downsampler
+
+Reduces the number of points in large time series before they are sent to a chart engine, so we don't end up
+rendering millions of points on a chart which is only a few thousand pixels wide. Supports LTTB (largest triangle three
+buckets), min/max per bucket and plain time based resampling (eg. '1min').
+
+"""
+
+import numpy
+import pandas
+
+# Chart types where we can drop points (with style.resample) without changing the look of the chart
+_downsample_chart_types = {'line', 'line+markers', 'scatter', 'dash', 'dashdot', 'dot',
+                           'hv', 'vh', 'vhv', 'spline', 'linear'}
+
+# Number of rows processed at a time (the temporary arrays for LTTB/min max are only this long)
+_chunk_rows = 64 * 1024
+
+
+class Downsampler(object):
+
+    def downsample_style(self, data_frame, style, chart_type):
+        """Downsamples a DataFrame as specified by style.resample ('lttb', 'minmax' or a pandas frequency such as
+        '1min'). For 'lttb' and 'minmax', we keep roughly one point per pixel of the chart width (or
+        style.resample_pixel_width if set). Only done for line/scatter style charts, where dropping points doesn't
+        change what the chart looks like, otherwise returns the DataFrame as it is.
+
+        Parameters
+        ----------
+        data_frame : DataFrame
+            Data to be plotted
+        style : Style
+            Style of the chart
+        chart_type : str (list)
+            Chart type(s)
+
+        Returns
+        -------
+        DataFrame
+        """
+        resample = getattr(style, 'resample', None)
+
+        if resample is None or chart_type is None or not (isinstance(data_frame, pandas.DataFrame)):
+            return data_frame
+
+        if not (isinstance(chart_type, list)):
+            chart_type = [chart_type]
+
+        if not (set(chart_type).issubset(_downsample_chart_types)):
+            return data_frame
+
+        pixel_width = style.resample_pixel_width
+
+        if pixel_width is None:
+            pixel_width = style.width * abs(style.scale_factor)
+
+        try:
+            return self.downsample(data_frame, resample, pixel_width)
+        except Exception:
+            # eg. non-numeric columns, so plot the original
+            return data_frame
+
+    def downsample(self, data_frame, method, no_of_points):
+        """Downsamples a DataFrame, keeping the same columns (all columns share the same selected rows, so the points
+        selected for every column are kept)
+
+        Parameters
+        ----------
+        data_frame : DataFrame
+            Time series to be downsampled
+        method : str
+            'lttb', 'minmax' or a pandas frequency string for time based resampling (eg. '1min', 'D')
+        no_of_points : int
+            Target number of points per column (typically the width of the chart in pixels)
+
+        Returns
+        -------
+        DataFrame
+        """
+        no_of_points = max(int(no_of_points), 3)
+
+        if method == 'lttb':
+            if len(data_frame.index) <= no_of_points:
+                return data_frame
+
+            return data_frame.iloc[self.lttb_indices(data_frame, no_of_points)]
+
+        elif method == 'minmax':
+            if len(data_frame.index) <= no_of_points:
+                return data_frame
+
+            # each bucket gives two points (its min and max)
+            return data_frame.iloc[self.min_max_indices(data_frame, max(no_of_points // 2, 1))]
+
+        # otherwise assume a time based resample, which only makes sense for dates
+        if isinstance(data_frame.index, pandas.DatetimeIndex):
+            return data_frame.resample(method).last()
+
+        return data_frame
+
+    def lttb_indices(self, data_frame, no_of_points):
+        """Selects rows with the largest triangle three buckets algorithm. Rather than anchoring each triangle on the
+        point selected in the previous bucket (which needs a Python loop), we anchor it on the average of the previous
+        bucket, so all the buckets and columns in a chunk can be done at once in NumPy. The first and last points are
+        always kept. Buckets are processed in chunks of around _chunk_rows rows, so the temporary arrays stay small,
+        whatever the length of the time series.
+
+        Parameters
+        ----------
+        data_frame : DataFrame
+            Time series
+        no_of_points : int
+            Number of points to select per column
+
+        Returns
+        -------
+        numpy.ndarray
+            Sorted positional indices of the selected rows (union across all the columns)
+        """
+        x, y = self._get_x_y(data_frame)
+
+        n = len(x)
+
+        # exclude first and last points, which we always keep
+        starts = self._bucket_starts(1, n - 1, no_of_points - 2)
+        ends = numpy.append(starts[1:], n - 1)
+
+        x_avg = numpy.empty(len(starts))
+        y_avg = numpy.empty((len(starts), y.shape[1]))
+
+        for b0, b1 in self._bucket_chunks(starts, ends):
+            lo, hi, local_starts, sizes = self._get_chunk(starts, ends, b0, b1)
+
+            x_avg[b0:b1] = numpy.add.reduceat(self._to_float(x[lo:hi]), local_starts) / sizes
+            y_avg[b0:b1] = self._nan_mean_reduceat(y[lo:hi], local_starts, sizes)
+
+        # anchors: previous bucket (first point for the first bucket), next bucket (last point for the last bucket)
+        x_prev = numpy.concatenate((self._to_float(x[0:1]), x_avg[:-1]))
+        y_prev = numpy.concatenate((y[0:1], y_avg[:-1]))
+        x_next = numpy.concatenate((x_avg[1:], self._to_float(x[n - 1:n])))
+        y_next = numpy.concatenate((y_avg[1:], y[n - 1:n]))
+
+        indices = numpy.empty((len(starts), y.shape[1]), dtype=numpy.int64)
+
+        for b0, b1 in self._bucket_chunks(starts, ends):
+            lo, hi, local_starts, sizes = self._get_chunk(starts, ends, b0, b1)
+
+            # expand anchors to each point in the bucket
+            x_prev_chunk = numpy.repeat(x_prev[b0:b1], sizes)[:, None]
+            y_prev_chunk = numpy.repeat(y_prev[b0:b1], sizes, axis=0)
+            x_next_chunk = numpy.repeat(x_next[b0:b1], sizes)[:, None]
+            y_next_chunk = numpy.repeat(y_next[b0:b1], sizes, axis=0)
+
+            x_mid = self._to_float(x[lo:hi])[:, None]
+            y_mid = y[lo:hi]
+
+            # (twice the) area of triangle for every point in every bucket
+            area = numpy.abs((x_prev_chunk - x_next_chunk) * (y_mid - y_prev_chunk)
+                             - (x_prev_chunk - x_mid) * (y_next_chunk - y_prev_chunk))
+
+            indices[b0:b1] = self._arg_max_reduceat(area, local_starts, sizes) + lo
+
+        return numpy.unique(numpy.concatenate(([0], indices.ravel(), [n - 1])))
+
+    def min_max_indices(self, data_frame, no_of_buckets):
+        """Selects the minimum and maximum row of each bucket for every column, so peaks and troughs are always kept
+
+        Parameters
+        ----------
+        data_frame : DataFrame
+            Time series
+        no_of_buckets : int
+            Number of buckets to split the time series into
+
+        Returns
+        -------
+        numpy.ndarray
+            Sorted positional indices of the selected rows (union across all the columns)
+        """
+        x, y = self._get_x_y(data_frame)
+
+        n = len(x)
+
+        starts = self._bucket_starts(0, n, no_of_buckets)
+        ends = numpy.append(starts[1:], n)
+
+        min_indices = numpy.empty((len(starts), y.shape[1]), dtype=numpy.int64)
+        max_indices = numpy.empty((len(starts), y.shape[1]), dtype=numpy.int64)
+
+        for b0, b1 in self._bucket_chunks(starts, ends):
+            lo, hi, local_starts, sizes = self._get_chunk(starts, ends, b0, b1)
+
+            min_indices[b0:b1] = self._arg_max_reduceat(-y[lo:hi], local_starts, sizes) + lo
+            max_indices[b0:b1] = self._arg_max_reduceat(y[lo:hi], local_starts, sizes) + lo
+
+        return numpy.unique(numpy.concatenate(([0], min_indices.ravel(), max_indices.ravel(), [n - 1])))
+
+    def _get_x_y(self, data_frame):
+        # x-axis (dates as nanoseconds, converted to floats a chunk at a time by _to_float), otherwise use position
+        index = data_frame.index
+
+        if isinstance(index, pandas.DatetimeIndex):
+            x = index.asi8
+        else:
+            try:
+                x = numpy.asarray(index, dtype=numpy.float64)
+            except (TypeError, ValueError):
+                x = numpy.arange(len(index), dtype=numpy.float64)
+
+        # no copy if the DataFrame is a single float block
+        y = data_frame.to_numpy(dtype=numpy.float64, na_value=numpy.nan)
+
+        return x, y
+
+    def _to_float(self, x):
+        return x.astype(numpy.float64, copy=False)
+
+    def _bucket_chunks(self, starts, ends):
+        # (first bucket, last bucket + 1) for each chunk of whole buckets, of around _chunk_rows rows
+        b0 = 0
+
+        while b0 < len(starts):
+            b1 = max(int(numpy.searchsorted(starts, starts[b0] + _chunk_rows, side='left')), b0 + 1)
+
+            yield b0, b1
+
+            b0 = b1
+
+    def _get_chunk(self, starts, ends, b0, b1):
+        # rows of a chunk, and the starts (relative to the chunk) and sizes of its buckets
+        lo = starts[b0]
+        hi = ends[b1 - 1]
+
+        return lo, hi, starts[b0:b1] - lo, ends[b0:b1] - starts[b0:b1]
+
+    def _bucket_starts(self, start, end, no_of_buckets):
+        no_of_buckets = max(min(no_of_buckets, end - start), 1)
+
+        return numpy.unique(numpy.linspace(start, end, no_of_buckets + 1)[:-1].astype(numpy.int64))
+
+    def _nan_mean_reduceat(self, y, starts, sizes):
+        valid = ~numpy.isnan(y)
+
+        total = numpy.add.reduceat(numpy.where(valid, y, 0.0), starts, axis=0)
+        count = numpy.add.reduceat(valid, starts, axis=0)
+
+        with numpy.errstate(invalid='ignore', divide='ignore'):
+            return total / count
+
+    def _arg_max_reduceat(self, values, starts, sizes):
+        # position (within values) of the first max of each bucket, for every column at once, ignoring NaNs
+        values = numpy.where(numpy.isnan(values), -numpy.inf, values)
+
+        bucket_max = numpy.maximum.reduceat(values, starts, axis=0)
+        is_max = values == numpy.repeat(bucket_max, sizes, axis=0)
+
+        rows = numpy.arange(len(values))[:, None]
+
+        return numpy.minimum.reduceat(numpy.where(is_max, rows, len(values)), starts, axis=0)
@@ -0,0 +1,749 @@
+__author__ = 'saeedamen'  # Saeed Amen
+
+#
+# Copyright 2016 Cuemacro
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+"""
+EngineBokeh
+
+Bokeh based plots (only imported when the bokeh engine is first requested). Live charts (plot_live) run in a local
+Bokeh server, and only send the new/changed points to the browser.
+
+"""
+
+import threading
+from functools import partial
+
+import numpy
+import pandas
+
+from chartpy.style import Style
+from chartpy.chartconstants import ChartConstants
+from chartpy.engine import EngineTemplate, ColorMaster
+
+cc = ChartConstants()
+
+try:
+    from bokeh.plotting import figure, output_file, show, gridplot, save
+    from bokeh.models import Range1d, ColumnDataSource, LinearColorMapper, ColorBar
+except:
+    pass
+
+
+class EngineBokeh(EngineTemplate):
+
+    def plot_chart(self, data_frame, style, chart_type):
+
+        cm = ColorMaster()
+
+        if style.scale_factor > 0:
+            scale_factor = abs(style.scale_factor) * 2 / 3
+        else:
+            scale_factor = abs(style.scale_factor)
+
+        try:
+            if style.bokeh_plot_mode == "offline_jupyter":
+                from bokeh.io import output_notebook
+                output_notebook()
+        except:
+            pass
+
+        try:
+            style = self.generate_file_names(style, 'bokeh')
+
+            output_file(style.html_file_output)
+        except:
+            pass
+
+        data_frame_list = self.split_data_frame_to_list(data_frame, style,
+                                                        chart_type=chart_type)
+
+        plot_list = []
+
+        # With style.bokeh_shared_source, each set of series which share an index get one ColumnDataSource, which all
+        # their glyphs (and subplots) point to, so the index is only written once to the HTML
+        source = None
+        source_index = None
+        source_no = 0
+
+        plot_width = int((style.width * scale_factor))
+        plot_height = int((style.height * scale_factor) / len(data_frame_list))
+
+        for data_frame in data_frame_list:
+            bar_ind = numpy.arange(1, len(data_frame.index) + 1)
+
+            xd, bar_ind, has_bar, no_of_bars = self.get_bar_indices(data_frame,
+                                                                    style,
+                                                                    chart_type,
+                                                                    bar_ind)
+
+            separate_chart = False
+
+            if chart_type == 'heatmap':
+                p1 = self._create_heatmap(data_frame, style, plot_width, plot_height)
+
+                separate_chart = True
+
+            # if has a vertical bar than categorical x-axis
+            elif has_bar == 'barv':
+                p1 = figure(
+                    width=plot_width,
+                    height=plot_height,
+                    x_range=[str(x).replace(':', '.') for x in
+                             data_frame.index]
+                )
+
+                from math import pi
+                p1.xaxis.major_label_orientation = pi / 2
+            elif type(data_frame.index) == pandas.Timestamp or (
+                    type(xd[0]) == pandas.Timestamp and type(
+                xd[-1]) == pandas.Timestamp) \
+                    or type(data_frame.index) == pandas.DatetimeIndex:
+                p1 = figure(
+                    x_axis_type="datetime",
+                    width=plot_width,
+                    height=plot_height,
+                    # x_range=(xd[0], xd[-1])   # at present Bokeh doesn't like to set limits with datetime, hopefully will change!
+                )
+
+            # otherwise numerical axis
+            else:
+                p1 = figure(
+                    width=plot_width,
+                    height=plot_height,
+                    x_range=(xd[0], xd[-1])
+                )
+
+            # link panning/zooming of the subplots (they share the same x-axis)
+            if style.bokeh_shared_source and not (separate_chart) and plot_list != []:
+                p1.x_range = plot_list[0].x_range
+
+            # set the fonts, axes, legend etc.
+            self._apply_figure_style(p1, style)
+
+            # TODO fix label
+            # if style.display_source_label:
+            #     p1.text([30 * scale_factor, 30 * scale_factor], [0, 0], text = [style.brand_label],
+            #         text_font_size = str(10 * scale_factor) + "pt", text_align = "left",
+            #         text_font = GraphistyleConstants().bokeh_font)
+
+            # hex strings for every series (converted once, and cached between charts)
+            color_spec = cm.create_color_list_hex(style, data_frame, palette=cc.bokeh_palette)
+
+            bar_space = 0.2
+            bar_width = (1 - bar_space) / (no_of_bars)
+            bar_index = 0
+
+            has_bar = 'no-bar'
+
+            if not (separate_chart):
+                if style.bokeh_shared_source:
+                    if source is None or not (data_frame.index.equals(source_index)):
+                        source = ColumnDataSource(data={'x': xd})
+                        source_index = data_frame.index
+
+                    # the arguments for each glyph refer to columns in the source, rather than holding the data
+                    xd = 'x'
+
+
+                # plot each series in the dataframe separately
+                for i in range(0, len(data_frame.columns)):
+                    label = str(data_frame.columns[i])
+                    glyph_name = 'glpyh' + str(i)
+
+                    # set chart type which can differ for each time series
+                    if isinstance(chart_type, list):
+                        chart_type_ord = chart_type[i]
+                    else:
+                        chart_type_ord = chart_type
+
+                    yd = self._add_to_source(source, 'y' + str(source_no), data_frame.iloc[:, i].to_numpy())
+                    source_kwargs = {} if source is None else {'source': source}
+
+                    # plot each time series as appropriate line, scatter etc.
+                    if chart_type_ord == 'line':
+                        linewidth_t = self.get_linewidth(label,
+                                                         style.linewidth,
+                                                         style.linewidth_2,
+                                                         style.linewidth_2_series)
+
+                        if linewidth_t is None: linewidth_t = 1
+
+                        if style.display_legend:
+                            p1.line(xd, yd, color=color_spec[i],
+                                    line_width=linewidth_t, name=glyph_name,
+                                    legend_label=label, **source_kwargs
+                                    )
+                        else:
+                            p1.line(xd, yd,
+                                    color=color_spec[i],
+                                    line_width=linewidth_t,
+                                    name=glyph_name, **source_kwargs)
+
+                    elif (chart_type_ord == 'bar'):
+                        bar_pos = numpy.arange(1, len(bar_ind) + 1) - (1 - bar_space) / 2. + bar_index * bar_width
+                        bar_pos_right = self._add_to_source(source, 'right' + str(source_no), bar_pos + bar_width)
+                        bar_pos = self._add_to_source(source, 'left' + str(source_no), bar_pos)
+                        bar_bottom = self._add_to_source(source, 'bottom', numpy.zeros(len(bar_ind)))
+
+                        if style.display_legend:
+                            p1.quad(top=yd, bottom=bar_bottom, left=bar_pos,
+                                    right=bar_pos_right, color=color_spec[i],
+                                    legend_label=label, **source_kwargs)
+                        else:
+                            p1.quad(top=yd, bottom=bar_bottom, left=bar_pos,
+                                    right=bar_pos_right, color=color_spec[i], **source_kwargs)
+
+                        bar_index = bar_index + 1
+                        bar_ind = bar_ind + bar_width
+                    elif (chart_type_ord == 'barh'):
+                        # TODO
+                        pass
+
+                    elif chart_type_ord == 'scatter':
+                        linewidth_t = self.get_linewidth(label,
+                                                         style.linewidth,
+                                                         style.linewidth_2,
+                                                         style.linewidth_2_series)
+
+                        if linewidth_t is None: linewidth_t = 1
+
+                        if style.display_legend:
+                            p1.scatter(xd, yd, color=color_spec[i],
+                                       line_width=linewidth_t, name=glyph_name,
+                                       legend_label=label, **source_kwargs
+                                       )
+                        else:
+                            p1.scatter(xd, yd, color=color_spec[i],
+                                       line_width=linewidth_t, name=glyph_name, **source_kwargs)
+
+                    source_no = source_no + 1
+
+                p1.grid.grid_line_alpha = 0.3
+
+                # p1.min_border_left = -40
+                # p1.min_border_right = 0
+                # p1.min_border_top = 0
+                # p1.min_border_bottom = 0
+
+                p1.min_border = -50
+
+            plot_list.append(p1)
+
+        p_final = gridplot(plot_list, ncols=1)
+
+        try:
+            p_final.title.text = style.title
+        except:
+            pass
+
+        if style.silent_display:
+            save(p_final)
+        else:
+            show(p_final)  # open a browser
+
+    def plot_live(self, data_frame, style, chart_type='line', max_points=None):
+        """Plots a line chart which runs in a local Bokeh server document, and can be updated with
+        LiveChartBokeh.stream/patch (or fed from a generator or asyncio queue). Only the new or changed points are sent
+        over the websocket to the browser, rather than plotting the whole chart again.
+
+        Parameters
+        ----------
+        data_frame : DataFrame
+            Initial data
+        style : Style
+            Style of the chart
+        chart_type : str
+            Only 'line' is supported
+        max_points : int
+            Only keep the last max_points on each line (rolling window), if None keep all of them
+
+        Returns
+        -------
+        LiveChartBokeh
+        """
+        if style is None: style = Style()
+
+        if chart_type != 'line':
+            raise Exception("Live charts only support line charts, not " + str(chart_type))
+
+        live_chart = LiveChartBokeh(self, data_frame, style, max_points=max_points)
+
+        if not (style.silent_display):
+            live_chart.start(show=True)
+
+        return live_chart
+
+    def extend_chart(self, fig, data_frame, max_points=None):
+        """Streams new rows to a chart created by plot_live
+
+        Parameters
+        ----------
+        fig : LiveChartBokeh
+            Chart returned by plot_live
+        data_frame : DataFrame
+            Newly appended rows
+        max_points : int
+            Rolling window size (if None, use the one given to plot_live)
+
+        Returns
+        -------
+        LiveChartBokeh
+        """
+        if not (isinstance(fig, LiveChartBokeh)):
+            raise Exception("Can only extend charts created with plot_live")
+
+        if max_points is not None:
+            fig.max_points = max_points
+
+        fig.stream(data_frame)
+
+        return fig
+
+    def _create_live_figure(self, style, source, labels):
+        # line chart for one document of a live chart, each series is a column of source ('y0', 'y1'...)
+        if style.scale_factor > 0:
+            scale_factor = abs(style.scale_factor) * 2 / 3
+        else:
+            scale_factor = abs(style.scale_factor)
+
+        x_axis_type = 'datetime' if numpy.issubdtype(source.data['x'].dtype, numpy.datetime64) else 'linear'
+
+        p1 = figure(x_axis_type=x_axis_type, width=int(style.width * scale_factor),
+                    height=int(style.height * scale_factor))
+
+        color_spec = ColorMaster().create_color_list_hex(style, [], cols=labels, palette=cc.bokeh_palette)
+
+        for i in range(0, len(labels)):
+            linewidth_t = self.get_linewidth(labels[i], style.linewidth, style.linewidth_2, style.linewidth_2_series)
+
+            if linewidth_t is None: linewidth_t = 1
+
+            if style.display_legend:
+                p1.line('x', 'y' + str(i), source=source, color=color_spec[i], line_width=linewidth_t,
+                        legend_label=labels[i])
+            else:
+                p1.line('x', 'y' + str(i), source=source, color=color_spec[i], line_width=linewidth_t)
+
+        # after the glyphs, so there is a legend to style
+        self._apply_figure_style(p1, style)
+
+        p1.grid.grid_line_alpha = 0.3
+
+        try:
+            p1.title.text = style.title
+        except:
+            pass
+
+        return p1
+
+    def _create_heatmap(self, data_frame, style, plot_width, plot_height):
+        """Draws a heatmap as a single glyph, coloured by a LinearColorMapper (sampled from the matplotlib colormap in
+        style.color, like the other engines). Small matrices are drawn with one rect glyph over a flattened
+        ColumnDataSource, with the row/column labels as categorical axes. Larger ones (or ones with duplicate labels)
+        are drawn as a single image, so the browser only has to draw one bitmap, whatever the size of the matrix.
+        """
+        values = data_frame.to_numpy(dtype=numpy.float64, na_value=numpy.nan)
+        no_of_rows, no_of_cols = values.shape
+
+        map_name = style.color if isinstance(style.color, str) else cc.chartfactory_default_colormap
+
+        low = numpy.nanmin(values) if not (numpy.isnan(values).all()) else 0
+        high = numpy.nanmax(values) if not (numpy.isnan(values).all()) else 1
+
+        color_mapper = LinearColorMapper(palette=ColorMaster().create_colormap_hex(256, map_name),
+                                         low=low, high=high, nan_color='rgba(0, 0, 0, 0)')
+
+        x_labels = [str(x) for x in data_frame.columns]
+        y_labels = [str(x) for x in data_frame.index]
+
+        use_rect = (style.bokeh_heatmap_rect_max_cells is None or values.size <= style.bokeh_heatmap_rect_max_cells) \
+                   and len(set(x_labels)) == len(x_labels) and len(set(y_labels)) == len(y_labels)
+
+        if use_rect:
+            # first row at the top
+            p1 = figure(width=plot_width, height=plot_height, x_range=x_labels, y_range=y_labels[::-1],
+                        tooltips=[(str(style.x_title) or 'x', '@x'), (str(style.y_title) or 'y', '@y'),
+                                  (str(style.z_title) or 'value', '@z')])
+
+            # one row in the source for each cell
+            source = ColumnDataSource(data={'x': numpy.tile(numpy.array(x_labels, dtype=object), no_of_rows),
+                                            'y': numpy.repeat(numpy.array(y_labels, dtype=object), no_of_cols),
+                                            'z': values.ravel()})
+
+            p1.rect(x='x', y='y', width=1, height=1, source=source, line_color=None,
+                    fill_color={'field': 'z', 'transform': color_mapper})
+
+            from math import pi
+            p1.xaxis.major_label_orientation = pi / 2
+        else:
+            p1 = figure(width=plot_width, height=plot_height, x_range=(0, no_of_cols), y_range=(no_of_rows, 0),
+                        tooltips=[(str(style.z_title) or 'value', '@image')])
+
+            # the first row of the image is drawn at y = 0, which is at the top as the y-axis is flipped
+            p1.image(image=[values], x=0, y=0, dw=no_of_cols, dh=no_of_rows, color_mapper=color_mapper)
+
+        p1.add_layout(ColorBar(color_mapper=color_mapper), 'right')
+
+        p1.grid.grid_line_color = None
+        p1.axis.axis_line_color = None
+
+        try:
+            p1.title.text = style.title
+        except:
+            pass
+
+        return p1
+
+    def _apply_figure_style(self, p1, style):
+        # set the fonts
+        p1.axis.major_label_text_font_size = str(10) + "pt"
+        p1.axis.major_label_text_font = cc.bokeh_font
+        p1.axis.major_label_text_font_style = cc.bokeh_font_style
+
+        p1.xaxis.axis_label_text_font_size = str(10) + "pt"
+        p1.xaxis.axis_label_text_font = cc.bokeh_font
+        p1.xaxis.axis_label_text_font_style = cc.bokeh_font_style
+        p1.xaxis.axis_label = style.x_title
+        p1.xaxis.visible = style.x_axis_showgrid
+
+        p1.yaxis.axis_label_text_font_size = str(10) + "pt"
+        p1.yaxis.axis_label_text_font = cc.bokeh_font
+        p1.yaxis.axis_label_text_font_style = cc.bokeh_font_style
+        p1.yaxis.axis_label = style.y_title
+        p1.yaxis.visible = style.y_axis_showgrid
+
+        p1.legend.location = "top_left"
+        p1.legend.label_text_font_size = str(10) + "pt"
+        p1.legend.label_text_font = cc.bokeh_font
+        p1.legend.label_text_font_style = cc.bokeh_font_style
+        p1.legend.background_fill_alpha = 0.75
+        p1.legend.border_line_width = 0
+
+        # set chart outline
+        p1.outline_line_width = 0
+
+        # Plot.title.text
+        p1.title.text_font_size = str(14) + "pt"
+        p1.title.text_font = cc.bokeh_font
+
+    def _add_to_source(self, source, key, values):
+        # without a shared source, the glyph holds the values itself
+        if source is None:
+            return values
+
+        # columns which are the same for every series (eg. bottom of bars) are only added once
+        if key not in source.data:
+            source.data[key] = values
+
+        return key
+
+    def get_color_list(self, i):
+        color_palette = cc.bokeh_palette
+
+        return color_palette[i % len(color_palette)]
+
+    def generic_settings(self):
+        return
+
+
+#######################################################################################################################
+
+class LiveChartBokeh(object):
+    """Handle on a live Bokeh line chart (from EngineBokeh.plot_live), served from a local Bokeh server. Each browser
+    session gets its own document and ColumnDataSource. New rows are sent with ColumnDataSource.stream (with a rollover
+    of max_points) and changed rows with ColumnDataSource.patch, so only the deltas go over the websocket.
+
+    stream/patch can be called from any thread (eg. a thread reading a generator, see feed, or an asyncio task, see
+    consume), the updates are handed to each document with add_next_tick_callback.
+    """
+
+    def __init__(self, engine, data_frame, style, max_points=None):
+        self.engine = engine
+        self.style = style
+        self.max_points = max_points
+
+        self.labels = [str(x) for x in data_frame.columns]
+
+        # label -> column of the ColumnDataSource
+        self._keys = {}
+
+        for i in range(0, len(self.labels)):
+            self._keys.setdefault(self.labels[i], 'y' + str(i))
+
+        # latest window of the data, so new sessions start from the same data as the existing ones (copied, as
+        # patch changes it in place)
+        self._data = {k: numpy.array(v) for k, v in self._to_data(data_frame).items()}
+        self._trim()
+
+        # (document, ColumnDataSource) for each open session
+        self._sessions = []
+        self._lock = threading.RLock()
+
+        self._server = None
+        self._server_thread = None
+        self._feed_threads = []
+
+    ##### server
+    def start(self, port=cc.bokeh_server_port, show=False):
+        """Starts the Bokeh server in a background thread (or displays the chart inline, for style.bokeh_plot_mode
+        'offline_jupyter')
+
+        Parameters
+        ----------
+        port : int
+            Port of the Bokeh server (0 picks a free port)
+        show : bool
+            Open the chart in a browser?
+        """
+        if self.style.bokeh_plot_mode == 'offline_jupyter':
+            from bokeh.io import output_notebook, show as show_notebook
+
+            output_notebook()
+            show_notebook(self.make_document)
+
+            return
+
+        if self._server is not None:
+            return
+
+        started = threading.Event()
+        errors = []
+
+        self._server_thread = threading.Thread(target=self._run_server, args=(port, show, started, errors),
+                                               daemon=True)
+        self._server_thread.start()
+
+        started.wait()
+
+        if errors != []:
+            raise errors[0]
+
+    def stop(self):
+        """Stops the Bokeh server"""
+        server = self._server
+
+        if server is None:
+            return
+
+        self._server = None
+
+        def stop_server():
+            server.stop()
+            server.io_loop.stop()
+
+        server.io_loop.add_callback(stop_server)
+
+        self._server_thread.join()
+
+    @property
+    def url(self):
+        """URL of the chart on the Bokeh server (None if it isn't running)"""
+        if self._server is None:
+            return None
+
+        return 'http://localhost:' + str(self._server.port) + '/'
+
+    def make_document(self, doc):
+        """Adds the chart to a Bokeh document (called by the Bokeh server for every new session, but can also be used
+        eg. with bokeh serve or a Bokeh server embedded elsewhere)
+
+        Parameters
+        ----------
+        doc : Document
+            Bokeh document
+        """
+        with self._lock:
+            source = ColumnDataSource(data={k: v.copy() for k, v in self._data.items()})
+
+            self._sessions.append((doc, source))
+
+        doc.add_root(self.engine._create_live_figure(self.style, source, self.labels))
+        doc.title = str(self.style.title)
+
+        doc.on_session_destroyed(partial(self._remove_session, doc))
+
+    def _remove_session(self, doc, session_context):
+        with self._lock:
+            self._sessions = [s for s in self._sessions if s[0] is not doc]
+
+    def _run_server(self, port, show, started, errors):
+        import asyncio
+
+        from bokeh.server.server import Server
+        from tornado.ioloop import IOLoop
+
+        try:
+            asyncio.set_event_loop(asyncio.new_event_loop())
+
+            self._server = Server({'/': self.make_document}, io_loop=IOLoop.current(), port=port)
+            self._server.start()
+
+            if show:
+                self._server.io_loop.add_callback(self._server.show, '/')
+        except Exception as e:
+            errors.append(e)
+            started.set()
+
+            return
+
+        started.set()
+
+        self._server.io_loop.start()
+
+    ##### updates
+    def stream(self, data_frame):
+        """Appends new rows (matched to the lines by column name, other columns are ignored), keeping the last
+        max_points on each line
+
+        Parameters
+        ----------
+        data_frame : DataFrame
+            Newly appended rows
+        """
+        if len(data_frame.index) == 0:
+            return
+
+        new_data = self._to_data(data_frame)
+
+        with self._lock:
+            for k in self._data.keys():
+                self._data[k] = numpy.concatenate((self._data[k], new_data[k]))
+
+            self._trim()
+
+            for doc, source in self._sessions:
+                doc.add_next_tick_callback(partial(source.stream, new_data, self.max_points))
+
+    def patch(self, data_frame):
+        """Changes the values of rows already on the chart (matched by index and column name), eg. to revise the last
+        point. Rows which aren't on the chart (any more) are ignored.
+
+        Parameters
+        ----------
+        data_frame : DataFrame
+            Rows with new values
+        """
+        with self._lock:
+            positions = pandas.Index(self._data['x']).get_indexer(self._to_x(data_frame.index))
+            found = positions >= 0
+
+            patches = {}
+
+            for col in data_frame.columns:
+                key = self._keys.get(str(col))
+
+                if key is None:
+                    continue
+
+                values = self._to_values(data_frame[col])[found]
+
+                self._data[key][positions[found]] = values
+
+                patches[key] = list(zip(positions[found].tolist(), values.tolist()))
+
+            if patches == {} or not (found.any()):
+                return
+
+            for doc, source in self._sessions:
+                doc.add_next_tick_callback(partial(source.patch, patches))
+
+    def feed(self, generator, background=True):
+        """Streams every DataFrame yielded by a generator (eg. reading from a socket/message queue)
+
+        Parameters
+        ----------
+        generator : iterable
+            Yields DataFrames of new rows
+        background : bool
+            Read the generator in a background thread (otherwise blocks until it is exhausted)
+
+        Returns
+        -------
+        Thread
+            Background thread (or None)
+        """
+        def run():
+            for data_frame in generator:
+                self.stream(data_frame)
+
+        if not (background):
+            run()
+
+            return None
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+
+        self._feed_threads.append(thread)
+
+        return thread
+
+    async def consume(self, queue):
+        """Streams every DataFrame put on an asyncio queue, until None is put on it, eg.
+        asyncio.create_task(live_chart.consume(queue))
+
+        Parameters
+        ----------
+        queue : asyncio.Queue
+            Queue of DataFrames of new rows
+        """
+        while True:
+            data_frame = await queue.get()
+
+            try:
+                if data_frame is None:
+                    return
+
+                self.stream(data_frame)
+            finally:
+                queue.task_done()
+
+    ##### data
+    def _to_data(self, data_frame):
+        data = {'x': self._to_x(data_frame.index)}
+
+        columns = {}
+
+        for col in data_frame.columns:
+            columns.setdefault(str(col), col)
+
+        # every column of a ColumnDataSource has to be the same length, so lines which are missing get NaNs (gaps)
+        for label, key in self._keys.items():
+            if label in columns:
+                data[key] = self._to_values(data_frame[columns[label]])
+            else:
+                data[key] = numpy.full(len(data_frame.index), numpy.nan)
+
+        return data
+
+    def _to_x(self, index):
+        # Bokeh wants naive datetimes (as datetime64)
+        if isinstance(index, pandas.DatetimeIndex):
+            if index.tz is not None:
+                index = index.tz_localize(None)
+
+            return index.to_numpy(dtype='datetime64[ns]')
+
+        return index.to_numpy()
+
+    def _to_values(self, series):
+        if isinstance(series, pandas.DataFrame):
+            # duplicate column names, use the first
+            series = series.iloc[:, 0]
+
+        return series.to_numpy(dtype=numpy.float64, na_value=numpy.nan)
+
+    def _trim(self):
+        if self.max_points is not None:
+            for k in self._data.keys():
+                self._data[k] = self._data[k][-self.max_points:]
@@ -0,0 +1,47 @@
+__author__ = 'saeedamen'  # Saeed Amen
+
+#
+# Copyright 2016 Cuemacro
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+"""
+EngineBqplot
+
+bqplot based plots (only imported when the bqplot engine is first requested)
+
+"""
+
+from chartpy.chartconstants import ChartConstants
+from chartpy.engine import EngineTemplate, ColorMaster
+
+cc = ChartConstants()
+
+# TODO bqplot interface not implemented yet
+try:
+    from IPython.display import display
+    from bqplot import (
+        OrdinalScale, LinearScale, Bars, Lines, Axis, Figure
+    )
+except:
+    pass
+
+
+class EngineBqplot(EngineTemplate):
+    def plot_chart(self, data_frame, style, chart_type):
+        pass
+
+    def get_color_list(self, i):
+        color_palette = cc.bokeh_palette
+
+        return color_palette[i % len(color_palette)]
+
+    def generic_settings(self):
+        return
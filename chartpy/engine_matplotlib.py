@@ -0,0 +1,1380 @@
+__author__ = 'saeedamen'  # Saeed Amen
+
+#
+# Copyright 2016 Cuemacro
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+"""
+EngineMatplotlib
+
+Matplotlib based plots (only imported when the matplotlib engine is first requested)
+
+"""
+
+from math import floor
+from datetime import timedelta
+
+import numpy as np
+import pandas
+
+from chartpy.chartconstants import ChartConstants
+from chartpy.style import Style
+from chartpy.engine import EngineTemplate, ColorMaster
+
+cc = ChartConstants()
+
+# matplotlib_plot_mode -> image format, for the modes which return the image in memory (rather than writing a file)
+_image_plot_modes = {'offline_image_png_bytes': 'png', 'offline_image_svg_bytes': 'svg',
+                     'offline_image_png_bytesio': 'png', 'offline_image_svg_bytesio': 'svg',
+                     'offline_image_png_in_html': 'png', 'offline_image_svg_in_html': 'svg'}
+
+# matplotlib based libraries
+try:
+    import matplotlib
+    import matplotlib.pyplot as plt
+except:
+    pass
+
+try:
+    from mpl_toolkits.mplot3d import \
+        Axes3D  # need to import in order to do 3D plots (even if not called)
+except:
+    pass
+
+# Later version of Pandas will need to register converters
+try:
+    from pandas.plotting import register_matplotlib_converters
+
+    register_matplotlib_converters()
+except:
+    pass
+
+try:
+    from matplotlib.dates import YearLocator, MonthLocator, DayLocator, \
+        HourLocator, MinuteLocator
+    from matplotlib.ticker import MultipleLocator
+except:
+    pass
+
+
+class EngineMatplotlib(EngineTemplate):
+
+    def __init__(self):
+        # parsed chartpy style sheets, so we only read each .mplstyle file once (engines are cached by EngineRegistry)
+        self._style_sheet_cache = {}
+
+    def plot_chart(self, data_frame, style, chart_type):
+
+        fig, data_frame_list, movie_frame = self._create_figure(data_frame, style, chart_type)
+
+        anim = None
+
+        # Should we animate the figure?
+        if style.animate_figure:
+
+            if style.animate_titles is None:
+                titles = range(1, len(data_frame_list) + 1)
+            else:
+                titles = style.animate_titles
+
+            # Initialization function: weirdly need to plot the last one (otherwise get ghosting!)
+            def init():
+                return [movie_frame[-1]]
+
+            def update(i):
+                fig.canvas.set_window_title(str(titles[i]))
+
+                return [movie_frame[i]]
+
+            import matplotlib.animation as animation
+
+            try:
+                anim = animation.FuncAnimation(plt.gcf(), update,
+                                               interval=style.animate_frame_ms,
+                                               blit=True,
+                                               frames=len(data_frame_list),
+                                               init_func=init, repeat=True)
+
+            except Exception as e:
+                print(str(e))
+
+        # fig.autofmt_xdate()
+
+        # PNG/SVG in memory (eg. for web pages and reports), without going through a file
+        if style.matplotlib_plot_mode in _image_plot_modes:
+            try:
+                return self._publish_image(fig, style)
+            finally:
+                plt.close(fig)
+
+        try:
+            style = self.generate_file_names(style, 'matplotlib')
+
+            if style.save_fig:
+
+                # TODO get save movie file to work in GIF and MP4 (hangs currently on these)
+                # install FFMPEG with: conda install --channel https://conda.anaconda.org/conda-forge ffmpeg
+                if style.animate_figure:
+                    pass
+                    file = style.file_output.upper()
+
+                    # if '.GIF' in file:
+                    # anim.save(style.file_output, writer='imagemagick', fps=5, dpi=80)
+                    # print('GIF saved')
+
+                    # FFwriter = animation.FFMpegWriter()
+
+                    # plt.rcParams['animation.ffmpeg_path'] = 'c:\\ffmpeg\\bin\\ffmpeg.exe'
+
+                    # Writer = animation.writers['ffmpeg']
+                    # writer = Writer(fps=15, metadata=dict(artist='Me'), bitrate=1800)
+                    # anim.save('test.mp4', writer=writer)
+
+                if self._is_silent(style):
+                    # pyplot's savefig redraws the whole figure again afterwards (only needed if it's displayed)
+                    fig.savefig(style.file_output, transparent=False)
+                else:
+                    plt.savefig(style.file_output, transparent=False)
+        except Exception as e:
+            print(str(e))
+
+        ####### various matplotlib converters are unstable
+        # convert to D3 format with mpld3
+        try:
+            # output matplotlib charts externally to D3 based libraries
+            import mpld3
+
+            if style.display_mpld3 == True:
+                mpld3.save_d3_html(fig, style.html_file_output)
+                mpld3.show(fig)
+        except:
+            pass
+
+        # FRAGILE! convert to Bokeh format
+        # better to use direct Bokeh renderer
+        try:
+            if (style.convert_matplotlib_to_bokeh == True):
+                from bokeh.plotting import output_file, show
+                from bokeh import mpl
+
+                output_file(style.html_file_output)
+                show(mpl.to_bokeh())
+        except:
+            pass
+
+        # FRAGILE! convert matplotlib chart to Plotly format
+        # recommend using AdapterCufflinks instead to directly plot to Plotly
+        try:
+            import plotly.plotly as py
+            import plotly
+            import plotly.tools as tls
+
+            if style.convert_matplotlib_to_plotly == True:
+                plotly.tools.set_credentials_file(
+                    username=style.plotly_username,
+                    api_key=style.plotly_api_key)
+
+                py_fig = tls.mpl_to_plotly(fig, strip_style=True)
+                plot_url = py.plot_mpl(py_fig, filename=style.plotly_url)
+        except:
+            pass
+
+        # display in matplotlib window (or clear from pyplot)
+        try:
+            if cc.chartfactory_silent_display == True or cc.chartfactory_headless == True:
+                plt.close(fig)
+
+                return fig
+            elif style.silent_display == False:
+                if not (style.block_new_plots):
+                    # TODO
+                    pass
+
+                plt.show()
+            else:
+                plt.close(fig)
+
+                return fig
+        except:
+            pass
+
+    def plot_live(self, data_frame, style, chart_type='line', max_points=None):
+        """Plots a line chart which can be updated in place with LiveChartMatplotlib.update as new rows arrive. Only
+        the lines are redrawn on each update (on top of a cached background of the axes, labels and legend), so it
+        can be refreshed many times a second, even with long histories.
+
+        Parameters
+        ----------
+        data_frame : DataFrame
+            Initial data
+        style : Style
+            Style of the chart
+        chart_type : str
+            Only 'line' is supported
+        max_points : int
+            Only keep the last max_points on each line (rolling window), if None keep all of them
+
+        Returns
+        -------
+        LiveChartMatplotlib
+        """
+        if style is None: style = Style()
+
+        if chart_type != 'line':
+            raise Exception("Live charts only support line charts, not " + str(chart_type))
+
+        fig, data_frame_list, movie_frame = self._create_figure(data_frame, style, chart_type)
+
+        live_chart = LiveChartMatplotlib(fig, max_points=max_points)
+
+        if not (self._is_silent(style)):
+            live_chart.show()
+
+        return live_chart
+
+    def extend_chart(self, fig, data_frame, max_points=None):
+        """Appends new rows to a chart created by plot_live (redrawing only the lines)
+
+        Parameters
+        ----------
+        fig : LiveChartMatplotlib
+            Chart returned by plot_live
+        data_frame : DataFrame
+            Newly appended rows
+        max_points : int
+            Rolling window size (if None, use the one given to plot_live)
+
+        Returns
+        -------
+        LiveChartMatplotlib
+        """
+        if not (isinstance(fig, LiveChartMatplotlib)):
+            raise Exception("Can only extend charts created with plot_live")
+
+        if max_points is not None:
+            fig.max_points = max_points
+
+        fig.update(data_frame)
+
+        return fig
+
+    def _create_figure(self, data_frame, style, chart_type):
+        # creates the figure with all the subplots, series, axes and legends (but doesn't save/display it)
+
+        self.apply_style_sheet(style)
+
+        if style.xkcd:
+            plt.xkcd()
+
+        # create figure & add a subplot
+        fig = plt.figure(
+            figsize=((style.width * abs(style.scale_factor)) / style.dpi,
+                     (style.height * abs(style.scale_factor)) / style.dpi),
+            dpi=style.dpi)
+
+        # matplotlib 1.5
+        try:
+            cyc = matplotlib.rcParams['axes.prop_cycle']
+            color_cycle = [x['color'] for x in cyc]
+        except KeyError:
+            # pre 1.5
+            pass
+            # color_cycle =  matplotlib.rcParams['axes.color_cycle']
+
+        cm = ColorMaster()
+
+        data_frame_list = self.split_data_frame_to_list(data_frame, style,
+                                                        chart_type=chart_type)
+
+        subplot_no = 1
+
+        first_ax = None
+
+        movie_frame = []
+
+        ordinal = 0
+
+        minz, maxz = self.get_max_min_dataframes(
+            data_frame_list=data_frame_list)
+
+        for data_frame in data_frame_list:
+            bar_ind = np.arange(0, len(data_frame.index))
+
+            # for bar charts, create a proxy x-axis (then relabel)
+            xd, bar_ind, has_bar, no_of_bars = self.get_bar_indices(data_frame,
+                                                                    style,
+                                                                    chart_type,
+                                                                    bar_ind)
+
+            try:
+                xd = xd.to_pydatetime()
+            except:
+                pass
+
+            ax, ax2, subplot_no, ordinal = self._create_subplot(fig,
+                                                                chart_type,
+                                                                style,
+                                                                subplot_no,
+                                                                first_ax,
+                                                                ordinal)
+
+            # for bar chart
+            bar_space = 0.2
+            bar_width = (1 - bar_space) / (no_of_bars)
+
+            try:
+                has_matrix = 'no'
+
+                if not isinstance(chart_type, list):
+
+                    ax_temp = ax
+
+                    # get all the correct colors (and construct gradients if necessary eg. from 'blues')
+                    color = style.color
+
+                    if style.color == []:
+                        color = cc.chartfactory_default_colormap
+                    else:
+                        if isinstance(style.color, list):
+                            color = style.color[subplot_no - 1]
+
+                    if chart_type == 'heatmap':
+                        ax_temp.set_frame_on(False)
+
+                        # weird hack, otherwise comes out all inverted!
+                        data_frame = data_frame.iloc[::-1]
+
+                        # pcolormesh draws the whole grid as a single mesh (much quicker than pcolor for large
+                        # matrices), with the same cell coordinates
+                        if style.normalize_colormap:
+                            movie_frame.append(
+                                ax_temp.pcolormesh(data_frame.values, cmap=color,
+                                                   alpha=0.8, vmax=maxz,
+                                                   vmin=minz))
+                        else:
+                            movie_frame.append(
+                                ax_temp.pcolormesh(data_frame.values, cmap=color,
+                                                   alpha=0.8))
+
+                        has_matrix = '2d-matrix'
+                    elif chart_type == 'surface':
+
+                        # TODO still very early alpha
+                        X, Y = np.meshgrid(range(0, len(data_frame.columns)),
+                                           range(0, len(data_frame.index)))
+                        Z = data_frame.values
+
+                        if style.normalize_colormap:
+                            movie_frame.append(
+                                ax_temp.plot_surface(X, Y, Z, cmap=color,
+                                                     rstride=1, cstride=1,
+                                                     vmax=maxz, vmin=minz))
+                        else:
+                            movie_frame.append(
+                                ax_temp.plot_surface(X, Y, Z, cmap=color,
+                                                     rstride=1, cstride=1))
+
+                        has_matrix = '3d-matrix'
+
+                if has_matrix == 'no':
+                    # Plot the lines (using custom palettes as appropriate)
+                    color_spec = cm.create_color_list(style, data_frame)
+
+                    # positions and stack bottoms of every bar in the chart (if there are any)
+                    bar_pos, bar_bottom, bar_height = self._get_bar_layout(data_frame, chart_type, bar_space,
+                                                                           bar_width)
+
+                    columns_to_plot = range(0, len(data_frame.columns.values))
+
+                    # lots of line series are drawn together as one LineCollection (much quicker than a Line2D each)
+                    if self._use_line_collection(data_frame, chart_type, style):
+                        movie_frame.append(
+                            self._draw_line_collection(ax, data_frame, style, color_spec, color_cycle))
+
+                        columns_to_plot = []
+
+                    # Some lines we should exclude from the color and use the default palette
+                    for i in columns_to_plot:
+
+                        if isinstance(chart_type, list):
+                            chart_type_ord = chart_type[i]
+                        else:
+                            chart_type_ord = chart_type
+
+                        label = str(data_frame.columns[i])
+
+                        ax_temp = self.get_axis(ax, ax2, label,
+                                                style.y_axis_2_series)
+
+                        yd = data_frame.iloc[:, i]
+
+                        if color_spec[i] is None:
+                            color_spec[i] = color_cycle[i % len(color_cycle)]
+
+                        if chart_type_ord == 'line':
+                            linewidth_t = self.get_linewidth(label,
+                                                             style.linewidth,
+                                                             style.linewidth_2,
+                                                             style.linewidth_2_series)
+
+                            if linewidth_t is None: linewidth_t = \
+                            matplotlib.rcParams['axes.linewidth']
+
+                            movie_frame.append(
+                                ax_temp.plot(xd, yd, label=label,
+                                             color=color_spec[i],
+                                             linewidth=linewidth_t), )
+
+                        elif chart_type_ord == 'bar':
+                            movie_frame.append(
+                                self._draw_bars(ax_temp, bar_pos[:, i], bar_height[:, i], bar_width,
+                                                bar_bottom[:, i], label, color_spec[i], style))
+
+                        elif chart_type_ord == 'barh':
+                            movie_frame.append(
+                                self._draw_bars(ax_temp, bar_pos[:, i], bar_height[:, i], bar_width,
+                                                bar_bottom[:, i], label, color_spec[i], style,
+                                                horizontal=True))
+
+                        elif chart_type_ord == 'stacked':
+                            # stacked bars take up the whole width of each category
+                            movie_frame.append(
+                                self._draw_bars(ax_temp, bar_pos[:, i], bar_height[:, i], 1 - bar_space,
+                                                bar_bottom[:, i], label, color_spec[i], style))
+
+                        elif chart_type_ord == 'scatter':
+                            movie_frame.append(
+                                ax_temp.scatter(xd, yd, label=label,
+                                                color=color_spec[i]))
+
+                            if style.line_of_best_fit is True:
+                                self.trendline(ax_temp, xd.values, yd.values,
+                                               order=1, color=color_spec[i],
+                                               alpha=1,
+                                               scale_factor=abs(
+                                                   style.scale_factor))
+
+                # format X axis
+                self.format_x_axis(ax_temp, data_frame, style, has_bar,
+                                   bar_ind, bar_width, has_matrix)
+
+            except Exception as e:
+                pass
+                # print(str(e))
+
+            self._create_legend(ax, ax2, style)
+
+        try:
+            ax_temp.set_zlim(minz, maxz)
+        except:
+            pass
+
+        return fig, data_frame_list, movie_frame
+
+    def _publish_image(self, fig, style):
+        """Renders a figure to PNG/SVG in memory, returned as bytes, a BytesIO or an HTML <img> (with the image in
+        base64) depending on style.matplotlib_plot_mode
+        """
+        import io
+
+        image_format = _image_plot_modes[style.matplotlib_plot_mode]
+
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=image_format, transparent=False)
+
+        if style.matplotlib_plot_mode.endswith('_bytesio'):
+            buffer.seek(0)
+
+            return buffer
+
+        image = buffer.getvalue()
+
+        if style.matplotlib_plot_mode.endswith('_in_html'):
+            import base64
+
+            mime_type = 'image/svg+xml' if image_format == 'svg' else 'image/png'
+
+            # can display in HTML as <img src="data:image/png;base64,[ENCODED STRING GOES HERE]">
+            return '<img src="data:' + mime_type + ';base64,' + base64.b64encode(image).decode('utf8') + '">'
+
+        return image
+
+    def _is_silent(self, style):
+        # is the chart only being saved/returned, rather than displayed in a window?
+        return style.silent_display == True or cc.chartfactory_silent_display == True \
+               or cc.chartfactory_headless == True
+
+    def apply_style_sheet(self, style):
+        # set the matplotlib style sheet & defaults
+        matplotlib.rcdefaults()
+
+        # first search ChartPy styles, then try matplotlib
+        try:
+            plt.style.use(self._get_style_sheet(style.style_sheet))
+        except:
+            plt.style.use(style.style_sheet)
+
+        # adjust font size for scale factor
+        matplotlib.rcParams.update({'font.size': matplotlib.rcParams[
+                                                     'font.size'] * abs(
+            style.scale_factor)})
+
+        # do not use offsets/scientific notation
+        matplotlib.rcParams.update({'axes.formatter.useoffset': False})
+
+    def _get_style_sheet(self, style_sheet):
+        """Gets the rc parameters of a chartpy style sheet, parsing the .mplstyle file only on first use
+
+        Parameters
+        ----------
+        style_sheet : str
+            Name of the chartpy style sheet (eg. 'chartpy')
+
+        Returns
+        -------
+        dict
+        """
+        if style_sheet not in self._style_sheet_cache:
+            rc = matplotlib.rc_params_from_file(cc.chartfactory_style_sheet[style_sheet],
+                                                use_default_template=False)
+
+            self._style_sheet_cache[style_sheet] = dict(rc)
+
+        return self._style_sheet_cache[style_sheet]
+
+    def _use_line_collection(self, data_frame, chart_type, style):
+        # only for plain line charts, on a single y-axis, with at least style.line_collection_threshold series
+        if chart_type != 'line' or style.line_collection_threshold is None:
+            return False
+
+        if len(data_frame.columns) < style.line_collection_threshold:
+            return False
+
+        return not (any(str(c) in style.y_axis_2_series for c in data_frame.columns))
+
+    def _draw_line_collection(self, ax, data_frame, style, color_spec, color_cycle):
+        """Draws every column of a DataFrame as a single LineCollection, with the colours from ColorMaster and the
+        linewidths from the Style. The legend only lists the first style.legend_max_series series, followed by a
+        summary of how many more there are.
+        """
+        from matplotlib.collections import LineCollection
+        from matplotlib.lines import Line2D
+
+        labels = [str(c) for c in data_frame.columns]
+
+        colors = [color_cycle[i % len(color_cycle)] if color_spec[i] is None else color_spec[i]
+                  for i in range(0, len(labels))]
+
+        linewidths = []
+
+        for label in labels:
+            linewidth_t = self.get_linewidth(label, style.linewidth, style.linewidth_2, style.linewidth_2_series)
+
+            if linewidth_t is None: linewidth_t = matplotlib.rcParams['axes.linewidth']
+
+            linewidths.append(linewidth_t)
+
+        index = data_frame.index
+        is_date = isinstance(index, pandas.DatetimeIndex)
+
+        if is_date:
+            from matplotlib.dates import date2num
+
+            x = date2num(index.to_pydatetime() if index.tz is not None else index.values)
+        else:
+            x = np.asarray(index, dtype=np.float64)
+
+        # (series, points, 2), NaNs leave gaps in the lines, as with Line2D
+        segments = np.empty((len(labels), len(index), 2))
+        segments[:, :, 0] = x
+        segments[:, :, 1] = data_frame.to_numpy(dtype=np.float64, na_value=np.nan).T
+
+        collection = LineCollection(segments, colors=colors, linewidths=linewidths)
+
+        ax.add_collection(collection)
+
+        if is_date:
+            ax.xaxis_date(tz=index.tz)
+
+        ax.autoscale_view()
+
+        # invisible proxy lines, so the legend picks up (a capped number of) series
+        max_series = style.legend_max_series
+
+        if max_series is None:
+            max_series = len(labels)
+
+        for i in range(0, min(max_series, len(labels))):
+            ax.add_line(Line2D([], [], color=colors[i], linewidth=linewidths[i], label=labels[i]))
+
+        if len(labels) > max_series:
+            ax.add_line(Line2D([], [], color='none', label='+ ' + str(len(labels) - max_series) + ' more'))
+
+        return collection
+
+    def _get_bar_layout(self, data_frame, chart_type, bar_space, bar_width):
+        """Lays out every bar in a DataFrame in one go, as (rows, columns) arrays of the bar positions, the bottom of
+        each bar (non-zero only for stacked bars, where positive and negative values are stacked separately) and the
+        bar heights (NaNs are treated as 0 when stacking). Returns None for each if there are no bars.
+        """
+        no_of_columns = len(data_frame.columns)
+
+        if isinstance(chart_type, list):
+            chart_type_list = chart_type
+        else:
+            chart_type_list = [chart_type] * no_of_columns
+
+        is_bar = np.array([c in ('bar', 'barh') for c in chart_type_list], dtype=bool)
+        is_stacked = np.array([c == 'stacked' for c in chart_type_list], dtype=bool)
+
+        if not (is_bar.any() or is_stacked.any()):
+            return None, None, None
+
+        heights = data_frame.to_numpy(dtype=np.float64, na_value=np.nan)
+
+        # each grouped bar series is shifted along by one bar_width, stacked bars sit at the current shift
+        bar_index = np.cumsum(is_bar) - is_bar
+
+        positions = np.arange(0, len(data_frame.index), dtype=np.float64)[:, None] \
+                    - (1 - bar_space) / 2. + bar_index[None, :] * bar_width
+
+        # cumulative sums of the positive and negative parts of the stacked series, excluding the series itself
+        stacked = np.where(is_stacked[None, :], np.nan_to_num(heights), 0)
+
+        positive = np.maximum(stacked, 0)
+        negative = np.minimum(stacked, 0)
+
+        bottoms = np.where(heights > 0, np.cumsum(positive, axis=1) - positive, np.cumsum(negative, axis=1) - negative)
+        bottoms[:, ~is_stacked] = 0
+
+        return positions, bottoms, heights
+
+    def _draw_bars(self, ax, positions, heights, width, bottoms, label, color, style, horizontal=False):
+        """Draws a bar series, either with ax.bar/ax.barh (a Rectangle per bar) or if style.bar_collection is set, as a
+        single PolyCollection, which is much quicker to create and draw for thousands of bars.
+        """
+        if not (style.bar_collection):
+            if horizontal:
+                return ax.barh(positions, heights, width, left=bottoms, label=label, color=color)
+
+            return ax.bar(positions, heights, width, bottom=bottoms, label=label, color=color)
+
+        from matplotlib.collections import PolyCollection
+
+        valid = ~np.isnan(heights)
+
+        lower = positions[valid] - width / 2.
+        upper = positions[valid] + width / 2.
+        base = bottoms[valid]
+        top = base + heights[valid]
+
+        # corners of each bar, as (bars, 4, 2)
+        verts = np.empty((len(lower), 4, 2))
+        verts[:, :, 0] = np.column_stack([lower, lower, upper, upper])
+        verts[:, :, 1] = np.column_stack([base, top, top, base])
+
+        if horizontal:
+            verts = verts[:, :, ::-1]
+
+        collection = PolyCollection(verts, facecolors=color, edgecolors='none', label=label)
+
+        ax.add_collection(collection)
+        ax.autoscale_view()
+
+        return collection
+
+    def format_x_axis(self, ax, data_frame, style, has_bar, bar_ind, bar_width,
+                      has_matrix):
+
+        if has_matrix == '2d-matrix' or has_matrix == '3d-matrix':
+            x_bar_ind = np.arange(0, len(data_frame.columns))
+            y_bar_ind = np.arange(0, len(data_frame.index))
+
+            offset = 0.5
+            ax.set_xticks(x_bar_ind + offset)
+            ax.set_xlim([0, len(x_bar_ind)])
+            ax.set_yticks(y_bar_ind + offset)
+            ax.set_ylim([0, len(y_bar_ind)])
+
+            plt.setp(plt.yticks()[1], rotation=90)
+
+            ax.set_xticklabels(data_frame.columns, minor=False)
+            ax.set_yticklabels(data_frame.index, minor=False)
+
+            ax.plot([], [])
+
+            if has_matrix == '2d-matrix':
+                self._label_heatmap_cells(ax, data_frame, style, offset)
+
+            return
+
+        if has_bar == 'barv':
+            if matplotlib.__version__ > '1.9':
+                offset = bar_width / 2.0  # for matplotlib 2
+            else:
+                offset = 0
+
+            ax.set_xticks(bar_ind - offset)
+            ax.set_xticklabels(data_frame.index)
+            ax.set_xlim([-1, len(bar_ind)])
+
+            # if lots of labels make text smaller and rotate
+            if len(bar_ind) > 6:
+                plt.setp(plt.xticks()[1], rotation=90)
+                # plt.gca().tight_layout()
+                # matplotlib.rcParams.update({'figure.autolayout': True})
+                # plt.gcf().subplots_adjust(bottom=5)
+                import matplotlib.dates as mdates
+
+                if style.date_formatter is not None:
+                    myFmt = mdates.DateFormatter(style.date_formatter)
+
+                plt.tight_layout()
+                # ax.tick_params(axis='x', labelsize=matplotlib.rcParams['font.size'] * 0.5)
+            return
+        elif has_bar == 'barh':
+            ax.set_yticks(bar_ind)
+            ax.set_yticklabels(data_frame.index)
+            ax.set_ylim([-1, len(bar_ind)])
+
+            # if lots of labels make text smaller and rotate
+            if len(bar_ind) > 6:
+                # plt.setp(plt.yticks()[1])
+                # plt.gca().tight_layout()
+                # matplotlib.rcParams.update({'figure.autolayout': True})
+                # plt.gcf().subplots_adjust(bottom=5)
+                import matplotlib.dates as mdates
+
+                if style.date_formatter is not None:
+                    ax.format_ydata = mdates.DateFormatter(
+                        style.date_formatter)
+
+                plt.tight_layout()
+                # ax.tick_params(axis='x', labelsize=matplotlib.rcParams['font.size'] * 0.5)
+            return
+
+        # format X axis
+        dates = data_frame.index
+
+        # scaling for time series plots with hours and minutes only (and no dates)
+        if hasattr(data_frame.index[0], 'hour') and not (
+        hasattr(data_frame.index[0], 'month')):
+            ax.xaxis.set_major_locator(MultipleLocator(86400. / 3.))
+            ax.xaxis.set_minor_locator(MultipleLocator(86400. / 24.))
+            ax.grid(b=style.x_axis_showgrid, which='minor', color='w',
+                    linewidth=0.5)
+
+        # TODO have more refined way of formating time series x-axis!
+
+        # scaling for time series plots with dates too
+        else:
+            # to handle dates
+            try:
+                dates = dates.to_pydatetime()
+                diff = data_frame.index[-1] - data_frame.index[0]
+
+                import matplotlib.dates as md
+
+                if style.date_formatter is not None:
+                    # from matplotlib.ticker import Formatter
+                    #
+                    # class MyFormatter(Formatter):
+                    #     def __init__(self, dates, fmt='%H:%M'):
+                    #         self.dates = dates
+                    #         self.fmt = fmt
+                    #
+                    #     def __call__(self, x, pos=0):
+                    #         'Return the label for time x at position pos'
+                    #         ind = int(round(x))
+                    #         if ind >= len(self.dates) or ind < 0: return ''
+                    #
+                    #         return self.dates[ind].strftime(self.fmt)
+                    #
+                    # formatter = MyFormatter(dates)
+                    # ax.xaxis.set_major_formatter(formatter)
+
+                    ax.xaxis.set_major_formatter(
+                        md.DateFormatter(style.date_formatter))
+                elif diff < timedelta(days=4):
+
+                    date_formatter = '%H:%M'
+                    xfmt = md.DateFormatter(date_formatter)
+                    ax.xaxis.set_major_formatter(xfmt)
+
+                    if diff < timedelta(minutes=20):
+                        ax.xaxis.set_major_locator(
+                            MinuteLocator(byminute=range(60), interval=2))
+                        ax.xaxis.set_minor_locator(MinuteLocator(interval=1))
+                    elif diff < timedelta(hours=1):
+                        ax.xaxis.set_major_locator(
+                            MinuteLocator(byminute=range(60), interval=5))
+                        ax.xaxis.set_minor_locator(MinuteLocator(interval=2))
+                    elif diff < timedelta(hours=6):
+                        locator = HourLocator(interval=1)
+                        ax.xaxis.set_major_locator(locator)
+                        ax.xaxis.set_minor_locator(MinuteLocator(interval=30))
+                    elif diff < timedelta(days=3):
+                        ax.xaxis.set_major_locator(HourLocator(interval=6))
+                        ax.xaxis.set_minor_locator(HourLocator(interval=1))
+
+                elif diff < timedelta(days=10):
+                    locator = DayLocator(interval=2)
+                    ax.xaxis.set_major_locator(locator)
+                    ax.xaxis.set_major_formatter(md.DateFormatter('%d %b %y'))
+
+                    day_locator = DayLocator(interval=1)
+                    ax.xaxis.set_minor_locator(day_locator)
+
+                elif diff < timedelta(days=40):
+                    locator = DayLocator(interval=10)
+                    ax.xaxis.set_major_locator(locator)
+                    ax.xaxis.set_major_formatter(md.DateFormatter('%d %b %y'))
+
+                    day_locator = DayLocator(interval=1)
+                    ax.xaxis.set_minor_locator(day_locator)
+
+                elif diff < timedelta(days=365 * 0.5):
+                    locator = MonthLocator(bymonthday=1, interval=2)
+                    ax.xaxis.set_major_locator(locator)
+                    ax.xaxis.set_major_formatter(md.DateFormatter('%b %y'))
+
+                    months_locator = MonthLocator(interval=1)
+                    ax.xaxis.set_minor_locator(months_locator)
+
+                elif diff < timedelta(days=365 * 2):
+                    locator = MonthLocator(bymonthday=1, interval=3)
+                    ax.xaxis.set_major_locator(locator)
+                    ax.xaxis.set_major_formatter(md.DateFormatter('%b %y'))
+
+                    months_locator = MonthLocator(interval=1)
+                    ax.xaxis.set_minor_locator(months_locator)
+
+                elif diff < timedelta(days=365 * 5):
+                    locator = YearLocator()
+                    ax.xaxis.set_major_locator(locator)
+                    ax.xaxis.set_major_formatter(md.DateFormatter('%Y'))
+                else:
+                    years = floor(diff.days / 365.0 / 5.0)
+                    locator = YearLocator(years)
+                    ax.xaxis.set_major_locator(locator)
+                    ax.xaxis.set_major_formatter(md.DateFormatter('%Y'))
+
+                if matplotlib.__version__ > '1.9':
+                    max = dates.max()
+                    min = dates.min()
+
+                    plt.xlim(min, max)
+
+            except:
+                try:
+                    # otherwise we have integers, rather than dates
+                    # TODO needs smarter more generalised mapping of dates
+                    max = dates.max()
+                    min = dates.min()
+
+                    big_step = self.round_to_1((max - min) / 10)
+
+                    small_step = big_step / 5
+
+                    ax.xaxis.set_major_locator(MultipleLocator(big_step))
+                    ax.xaxis.set_minor_locator(MultipleLocator(small_step))
+
+                    plt.xlim(min, max)
+                except:
+                    pass
+
+    def _label_heatmap_cells(self, ax, data_frame, style, offset):
+        """Writes the value of each cell on a heatmap, formatting all the values in one go with NumPy. All the labels
+        are drawn by a single PathCollection (with one TextPath per distinct label, positioned at each cell), rather
+        than one Text artist per cell. Skipped for matrices larger than style.heatmap_label_max_cells, where labels
+        would be unreadable.
+        """
+        if style.heatmap_label_max_cells is not None and \
+                data_frame.size > style.heatmap_label_max_cells:
+            return
+
+        from matplotlib.collections import PathCollection
+        from matplotlib.path import Path
+        from matplotlib.textpath import TextPath
+        from matplotlib.transforms import Affine2D
+
+        values = data_frame.to_numpy(dtype=np.float64, na_value=np.nan)
+
+        labels = np.char.mod('%.0f', values)
+
+        # cell (row i, column j) is drawn at x = j, y = i
+        rows, cols = np.indices(values.shape)
+
+        valid = ~np.isnan(values)
+
+        if not (valid.any()):
+            return
+
+        offsets = np.column_stack([cols[valid] + offset, rows[valid] + offset])
+
+        # only lay out the text of each distinct label once, centred on (0, 0) and sized in points
+        unique_labels, label_index = np.unique(labels[valid], return_inverse=True)
+
+        font_size = matplotlib.rcParams['font.size']
+        unique_paths = []
+
+        for label in unique_labels:
+            path = TextPath((0, 0), str(label), size=font_size)
+            extents = path.get_extents()
+
+            unique_paths.append(Path(path.vertices - [(extents.x0 + extents.x1) / 2., (extents.y0 + extents.y1) / 2.],
+                                     path.codes))
+
+        # paths are in points, scaled to pixels with the figure dpi, offsets are in data coordinates
+        collection = PathCollection([unique_paths[i] for i in label_index.ravel()], offsets=offsets,
+                                    offset_transform=ax.transData,
+                                    transform=Affine2D().scale(1 / 72.) + ax.figure.dpi_scale_trans,
+                                    facecolors=matplotlib.rcParams['text.color'], edgecolors='none')
+
+        ax.add_collection(collection, autolim=False)
+
+    def get_axis(self, ax, ax2, label, y_axis_2_series):
+
+        if label in y_axis_2_series: return ax2
+
+        return ax
+
+    def trendline(self, ax, xd, yd, order=1, color='red', alpha=1, Rval=False,
+                  scale_factor=1):
+        """ Make a line of best fit """
+
+        # Calculate trendline
+        xd[np.isnan(xd)] = 0
+        yd[np.isnan(yd)] = 0
+
+        coeffs = np.polyfit(xd, yd, order)
+
+        intercept = coeffs[-1]
+        slope = coeffs[-2]
+        if order == 2:
+            power = coeffs[0]
+        else:
+            power = 0
+
+        minxd = np.min(xd)
+        maxxd = np.max(xd)
+
+        xl = np.array([minxd, maxxd])
+        yl = power * xl ** 2 + slope * xl + intercept
+
+        # plot trendline
+        ax.plot(xl, yl, color=color, alpha=alpha)
+
+        # calculate R squared
+        p = np.poly1d(coeffs)
+
+        ybar = np.sum(yd) / len(yd)
+        ssreg = np.sum((p(xd) - ybar) ** 2)
+        sstot = np.sum((yd - ybar) ** 2)
+        Rsqr = ssreg / sstot
+
+        if Rval == False:
+            text = 'R^2 = %0.2f, m = %0.4f, c = %0.4f' % (
+            Rsqr, slope, intercept)
+
+            ax.annotate(text, xy=(1, 1), xycoords='axes fraction',
+                        fontsize=8 * abs(scale_factor),
+                        xytext=(
+                        -5 * abs(scale_factor), 10 * abs(scale_factor)),
+                        textcoords='offset points',
+                        ha='right', va='top')
+
+            # Plot R^2 value
+            # ax.text(0.65, 0.95, text, fontsize = 10 * scale_factor,
+            #            ha= 'left',
+            #            va = 'top', transform = ax.transAxes)
+            pass
+        else:
+            # return the R^2 value:
+            return Rsqr
+
+    def _create_brand_label(self, ax, anno, scale_factor):
+        ax.annotate(anno, xy=(1, 1), xycoords='axes fraction',
+                    fontsize=10 * abs(scale_factor), color='white',
+                    xytext=(0 * abs(scale_factor), 15 * abs(scale_factor)),
+                    textcoords='offset points',
+                    va="center", ha="center",
+                    bbox=dict(boxstyle="round,pad=0.0",
+                              facecolor=cc.chartfactory_brand_color))
+
+    def _create_subplot(self, fig, chart_type, style, subplot_no, first_ax,
+                        ordinal):
+
+        if style.title is not None:
+            fig.suptitle(style.title, fontsize=14 * abs(style.scale_factor))
+
+        chart_projection = '2d'
+
+        if not (isinstance(chart_type, list)):
+            if chart_type == 'surface': chart_projection = '3d'
+
+        if style.subplots == False and first_ax is None:
+            if chart_projection == '3d':
+                ax = fig.add_subplot(111, projection=chart_projection)
+            else:
+                ax = fig.add_subplot(111)
+        else:
+            if first_ax is None:
+                if chart_projection == '3d':
+                    ax = fig.add_subplot(2, 1, subplot_no,
+                                         projection=chart_projection)
+                else:
+                    ax = fig.add_subplot(2, 1, subplot_no)
+
+                first_ax = ax
+
+            if style.share_subplot_x:
+                if chart_projection == '3d':
+                    ax = fig.add_subplot(2, 1, subplot_no, sharex=first_ax,
+                                         projection=chart_projection)
+                else:
+                    ax = fig.add_subplot(2, 1, subplot_no, sharex=first_ax)
+            else:
+                if chart_projection == '3d':
+                    ax = fig.add_subplot(2, 1, subplot_no,
+                                         projection=chart_projection)
+                else:
+                    ax = fig.add_subplot(2, 1, subplot_no)
+
+        subplot_no = subplot_no + 1
+
+        if style.x_title != '': ax.set_xlabel(style.x_title)
+        if style.y_title != '': ax.set_ylabel(style.y_title)
+
+        plt.xlabel(style.x_title)
+        plt.ylabel(style.y_title)
+
+        # format Y axis
+        y_formatter = matplotlib.ticker.ScalarFormatter(useOffset=False)
+        ax.yaxis.set_major_formatter(y_formatter)
+
+        # create a second y axis if necessary
+        ax2 = []
+
+        ax.xaxis.grid(style.x_axis_showgrid)
+        ax.yaxis.grid(style.y_axis_showgrid)
+
+        if style.y_axis_2_series != []:
+            ax2 = ax.twinx()
+
+            # set grid for second y axis
+            ax2.yaxis.grid(style.y_axis_2_showgrid)
+
+        return ax, ax2, subplot_no, ordinal + 1
+
+    def _create_legend(self, ax, ax2, style):
+        if style.display_source_label == True and style.source is not None:
+            ax.annotate('Source: ' + style.source, xy=(1, 0),
+                        xycoords='axes fraction',
+                        fontsize=7 * abs(style.scale_factor),
+                        xytext=(-5 * abs(style.scale_factor),
+                                10 * abs(style.scale_factor)),
+                        textcoords='offset points',
+                        ha='right', va='top', color=style.source_color)
+
+        if style.display_brand_label == True:
+            self._create_brand_label(ax, anno=style.brand_label,
+                                     scale_factor=abs(style.scale_factor))
+
+        leg = []
+        leg2 = []
+
+        loc = 'best'
+
+        # if we have two y-axis then make sure legends are in opposite corners
+        if ax2 != []: loc = 2
+
+        try:
+            leg = ax.legend(loc=loc,
+                            prop={'size': 10 * abs(style.scale_factor)})
+            leg.get_frame().set_linewidth(0.0)
+            leg.get_frame().set_alpha(0)
+
+            if ax2 != []:
+                leg2 = ax2.legend(loc=1,
+                                  prop={'size': 10 * abs(style.scale_factor)})
+                leg2.get_frame().set_linewidth(0.0)
+                leg2.get_frame().set_alpha(0)
+        except:
+            pass
+
+        try:
+            if style.display_legend is False:
+                if leg != []: leg.remove()
+                if leg2 != []: leg.remove()
+        except:
+            pass
+
+
+#######################################################################################################################
+
+class LiveChartMatplotlib(object):
+    """Handle on a matplotlib line chart (from EngineMatplotlib.plot_live), which is updated in place as new rows
+    arrive. The whole figure (axes, labels, legend and the lines so far) is only drawn when the new points fall outside
+    the axes limits (we leave some headroom, so this is rare). Otherwise, each update only draws the new part of each
+    line on top of what is already on the canvas and blits it, so the work done depends on the number of new rows,
+    not the length of the history.
+
+    With max_points, points which drop out of the rolling window stay on screen until the next full redraw.
+    """
+
+    def __init__(self, fig, max_points=None, x_headroom=0.25, y_headroom=0.1):
+        import matplotlib.lines
+
+        self.fig = fig
+        self.max_points = max_points
+
+        # when we rescale, leave some space for new points, so we don't have to redraw the whole figure every update
+        self.x_headroom = x_headroom
+        self.y_headroom = y_headroom
+
+        self.full_redraws = 0
+
+        # ax -> [x_min, x_max, y_min, y_max] of the points on its lines, updated from the new points only (so might be
+        # too wide once points drop out of the rolling window, in which case the ax is in _stale_extents)
+        self._extents = {}
+        self._stale_extents = set()
+
+        # label -> dict of the line, the line used to draw new points (tail), data buffers and number of points
+        self._lines = {}
+
+        for ax in fig.axes:
+            for line in ax.get_lines():
+                label = str(line.get_label())
+
+                # skip matplotlib's internal lines (eg. _child0) and trendlines
+                if label.startswith('_') or label in self._lines:
+                    continue
+
+                xy = line.get_xydata()
+
+                # spare space at the end of the buffers, so appending is amortised O(number of new points)
+                x = np.empty(len(xy) * 2 + 1024)
+                y = np.empty(len(xy) * 2 + 1024)
+
+                x[:len(xy)] = xy[:, 0]
+                y[:len(xy)] = xy[:, 1]
+
+                tail = matplotlib.lines.Line2D([], [])
+                tail.update_from(line)
+                tail.set_label('_live_tail')
+
+                # animated artists are left out of canvas.draw, we draw them ourselves
+                line.set_animated(True)
+                tail.set_animated(True)
+                ax.add_line(tail)
+
+                self._lines[label] = {'line': line, 'tail': tail, 'x': x, 'y': y, 'n': len(xy), 'drawn': 0}
+
+        self.fig.canvas.mpl_connect('draw_event', self._on_draw)
+
+        self._drawn_once = False
+
+    def show(self):
+        """Displays the figure (without blocking)"""
+        plt.show(block=False)
+        plt.pause(0.001)
+
+    def close(self):
+        """Closes the figure"""
+        plt.close(self.fig)
+
+    def update(self, data_frame):
+        """Appends new rows to the lines (matched by column name) and draws them
+
+        Parameters
+        ----------
+        data_frame : DataFrame
+            Newly appended rows
+        """
+        x_new = self._convert_x(data_frame.index)
+
+        # ax -> extent of only the new points
+        new_extents = {}
+
+        for col in data_frame.columns:
+            entry = self._lines.get(str(col))
+
+            # columns which aren't on the chart are ignored
+            if entry is None:
+                continue
+
+            y_new = data_frame[col].to_numpy(dtype=np.float64, na_value=np.nan)
+
+            self._append(entry, x_new, y_new)
+
+            ax = entry['line'].axes
+
+            new_extents[ax] = self._merge_extents(new_extents.get(ax), self._get_extent(x_new, y_new))
+
+            if self.max_points is not None and entry['n'] > self.max_points:
+                self._stale_extents.add(ax)
+
+        rescaled = [self._rescale(ax, extent) for ax, extent in new_extents.items()]
+
+        if any(rescaled) or not (self._drawn_once):
+            # full redraw of everything (see _on_draw for the lines)
+            self.full_redraws = self.full_redraws + 1
+            self.fig.canvas.draw()
+        else:
+            self._draw_tails()
+
+        self.fig.canvas.flush_events()
+
+    def _append(self, entry, x_new, y_new):
+        x = entry['x']
+        y = entry['y']
+        n = entry['n']
+
+        k = len(x_new)
+
+        if n + k > len(x):
+            # first drop the points which have fallen out of the rolling window
+            if self.max_points is not None and n > self.max_points:
+                shift = n - self.max_points
+
+                x[:self.max_points] = x[shift:n]
+                y[:self.max_points] = y[shift:n]
+                n = self.max_points
+
+                entry['drawn'] = max(entry['drawn'] - shift, 0)
+
+            # then grow the buffers if that wasn't enough
+            if n + k > len(x):
+                x = np.concatenate((x[:n], np.empty(n + 2 * k)))
+                y = np.concatenate((y[:n], np.empty(n + 2 * k)))
+
+        x[n:n + k] = x_new
+        y[n:n + k] = y_new
+
+        entry['x'] = x
+        entry['y'] = y
+        entry['n'] = n + k
+
+    def _convert_x(self, index):
+        if isinstance(index, pandas.DatetimeIndex):
+            import matplotlib.dates
+
+            # matplotlib plots tz-aware dates in UTC
+            if index.tz is not None:
+                index = index.tz_convert(None)
+
+            return matplotlib.dates.date2num(index.to_numpy())
+
+        return np.asarray(index, dtype=np.float64)
+
+    def _get_window(self, entry):
+        n = entry['n']
+
+        start = 0 if self.max_points is None else max(n - self.max_points, 0)
+
+        return entry['x'][start:n], entry['y'][start:n]
+
+    def _get_extent(self, x, y):
+        # [x_min, x_max, y_min, y_max] of some points (inf/-inf if there aren't any)
+        x_min = np.inf
+        x_max = -np.inf
+        y_min = np.inf
+        y_max = -np.inf
+
+        if len(x) > 0:
+            x_min = np.nanmin(x)
+            x_max = np.nanmax(x)
+
+            if not (np.isnan(y).all()):
+                y_min = np.nanmin(y)
+                y_max = np.nanmax(y)
+
+        return [x_min, x_max, y_min, y_max]
+
+    def _merge_extents(self, extent_1, extent_2):
+        if extent_1 is None:
+            return extent_2
+
+        return [min(extent_1[0], extent_2[0]), max(extent_1[1], extent_2[1]),
+                min(extent_1[2], extent_2[2]), max(extent_1[3], extent_2[3])]
+
+    def _get_full_extent(self, ax):
+        # goes through the whole window of every line on the ax (only when we rescale)
+        extent = None
+
+        for entry in self._lines.values():
+            if entry['line'].axes is ax:
+                extent = self._merge_extents(extent, self._get_extent(*self._get_window(entry)))
+
+        return extent
+
+    def _rescale(self, ax, new_extent):
+        # True if the axes limits had to change (so the whole figure has to be redrawn). The points already on the
+        # chart were inside the limits when they were last set, so only the new points need checking.
+        if ax in self._extents:
+            self._extents[ax] = self._merge_extents(self._extents[ax], new_extent)
+
+        x_min, x_max, y_min, y_max = new_extent
+
+        if not (np.isfinite(x_min)):
+            return False
+
+        x_lim = ax.get_xlim()
+        y_lim = ax.get_ylim()
+
+        rescale = x_max > x_lim[1] or x_min < x_lim[0]
+
+        if np.isfinite(y_min):
+            rescale = rescale or y_max > y_lim[1] or y_min < y_lim[0]
+
+        if not (rescale):
+            return False
+
+        # only now do we need the extent of everything in the window
+        if ax not in self._extents or ax in self._stale_extents:
+            self._extents[ax] = self._get_full_extent(ax)
+            self._stale_extents.discard(ax)
+
+        x_min, x_max, y_min, y_max = self._extents[ax]
+
+        x_range = max(x_max - x_min, 1e-12)
+        ax.set_xlim(x_min, x_max + x_range * self.x_headroom)
+
+        if np.isfinite(y_min):
+            y_range = max(y_max - y_min, 1e-12)
+            ax.set_ylim(y_min - y_range * self.y_headroom, y_max + y_range * self.y_headroom)
+
+        return True
+
+    def _on_draw(self, event):
+        # after any full draw (including resizing the window), draw the whole of each line on top
+        self._drawn_once = True
+
+        for entry in self._lines.values():
+            # only set the whole line here, as matplotlib copies the data (otherwise only the new points are drawn)
+            entry['line'].set_data(*self._get_window(entry))
+
+            self.fig.draw_artist(entry['line'])
+            entry['drawn'] = entry['n']
+
+    def _draw_tails(self):
+        # only draw the new points (joined to the last point already drawn)
+        for entry in self._lines.values():
+            if entry['n'] > entry['drawn']:
+                start = max(entry['drawn'] - 1, 0)
+
+                entry['tail'].set_data(entry['x'][start:entry['n']], entry['y'][start:entry['n']])
+                self.fig.draw_artist(entry['tail'])
+
+                entry['drawn'] = entry['n']
+
+        self.fig.canvas.blit(self.fig.bbox)
@@ -0,0 +1,1592 @@
+__author__ = 'saeedamen'  # Saeed Amen
+
+#
+# Copyright 2016 Cuemacro
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+"""
+EnginePlotly
+
+Plotly based plots (only imported when the plotly engine is first requested)
+
+"""
+
+import copy
+import os
+
+import numpy
+import pandas
+
+from chartpy.style import Style
+from chartpy.chartconstants import ChartConstants
+from chartpy.engine import EngineTemplate, ColorMaster
+
+cc = ChartConstants()
+
+try:
+    import matplotlib
+except:
+    pass
+
+cf = None
+
+try:
+    import plotly  # JavaScript based plotting library with Python connector
+    import plotly.offline as py_offline
+
+    # import cufflinks as cf
+
+    plotly.tools.set_config_file(plotly_domain='https://type-here.com',
+                                 world_readable=cc.plotly_world_readable,
+                                 sharing=cc.plotly_sharing)
+except:
+    pass
+
+# Requires plotly 4
+try:
+    from plotly.graph_objects import Figure
+    import plotly.graph_objects as go
+    import plotly.express as px
+except:
+    pass
+
+# For online plotting (optional)
+try:
+    import chart_studio.plotly as py_online
+except:
+    pass
+
+try:
+    import base64
+    # plotly.utils.memoize = memoize
+except:
+    pass
+
+
+# Plot modes which return their output, so can be stored in RenderCache
+_cacheable_plot_modes = {'dash', 'dash_binary', 'offline_div', 'offline_embed_js_div', 'offline_div_binary',
+                         'offline_embed_js_div_binary', 'offline_image_png_bytes', 'offline_image_png_in_html',
+                         'offline_image_svg_in_html'}
+
+# Plot modes which create static images (and the image format for each)
+_image_plot_modes = {'offline_png': 'png', 'offline_image_png_bytes': 'png', 'offline_image_png_in_html': 'png',
+                     'offline_image_svg_in_html': 'svg'}
+
+
+class EnginePlotly(EngineTemplate):
+
+    def start_orca(self, path=None):
+        # orca is a seperate plotly application for converting Plotly figures to PNG format
+        # Note, now recommended to use kaleido https://github.com/plotly/Kaleido, which is
+        # much easier to install
+        if path is not None:
+            plotly.io.orca.config.executable = path
+
+        # Use the orca server for all image exports from now on
+        self._get_image_exporter().start(engine='orca')
+
+    def start_image_exporter(self, engine=None, workers=None):
+        """Starts the long lived image server process(es) used for static image plot modes (eg. 'offline_png'), so
+        the start up cost isn't paid by the first chart
+
+        Parameters
+        ----------
+        engine : str
+            'kaleido', 'orca' or 'auto' (default from ChartConstants)
+        workers : int
+            Number of Kaleido processes (default from ChartConstants)
+        """
+        self._get_image_exporter().start(engine=engine, workers=workers)
+
+    def plot_chart(self, data_frame, style, chart_type):
+
+        # Special case if we have a pre-created Plotly object
+        if isinstance(data_frame, Figure):
+            return self.publish_plot(data_frame, style)
+
+        mode = 'lines'
+
+        if style is None: style = Style()
+
+        # If we've rendered an identical chart before, skip the whole engine
+        render_cache, cache_key = self._get_render_cache_key(data_frame, style, chart_type)
+
+        if cache_key is not None:
+            fig = render_cache.get(cache_key)
+
+            if fig is not None:
+                return fig
+
+        marker_size = 1
+
+        #x = '';
+        #y = '';
+        #z = ''
+
+        scale = 1
+
+        # try:
+        #     # Adjust sizing if offline_html format
+        #     if (
+        #             style.plotly_plot_mode == 'offline_html' and style.scale_factor > 0):
+        #         scale = float(2.0 / 3.0)
+        # except:
+        #     pass
+
+        # Check other plots implemented by Cufflinks
+        cm = ColorMaster()
+
+        # Create figure
+        data_frame_list = self.split_data_frame_to_list(data_frame, style,
+                                                        chart_type=chart_type)
+
+        # Draw lines/scatters with WebGL (scattergl) traces if asked or if there are lots of points, set per figure
+        # rather than by patching plotly.graph_objs, so it doesn't leak into other charts
+        render_mode = self._get_render_mode(style, data_frame_list, chart_type)
+
+        fig_list = []
+        cols = []
+
+        # If we provide a list of Figures this will get ignored
+        try:
+            for data_frame in data_frame_list:
+                cols.append(data_frame.columns)
+
+            cols = list(numpy.array(cols).flat)
+
+            # Get all the correct colors (and construct gradients if necessary eg. from 'Blues')
+            # need to change to strings for cufflinks
+            color_list = cm.create_color_list(style, [], cols=cols)
+
+            # If no colors are specified then just use our default color set from chart constants (as hex strings,
+            # which are converted once and cached between charts)
+            if all(color is None for color in color_list):
+                color_spec = [cm.to_hex(self.get_color_list(i)) for i in range(0, len(color_list))]
+
+            else:
+                # Otherwise assume all the colors are rgba
+                color_spec = [cm.to_rgba_string(color) for color in color_list]
+        except Exception as e:
+            pass
+
+        start = 0
+
+        title_list = style.title
+
+        if not (isinstance(title_list, list)):
+            title_list = [style.title] * len(data_frame_list)
+
+        if style.auto_scale:
+            width = None
+            height = None
+        else:
+            width = style.width * abs(style.scale_factor) * scale
+            height = style.height * abs(style.scale_factor) * scale
+
+        # Go through each data_frame in the list and plot
+        for i in range(0, len(data_frame_list)):
+            data_frame = data_frame_list[i]
+            title = title_list[i]
+
+            if isinstance(data_frame, Figure):
+                fig = data_frame
+            else:
+
+                # dropna always copies, so only call it if there is something to drop
+                if style.drop_na and data_frame.isna().to_numpy().any():
+                    data_frame = data_frame.dropna()
+
+                if isinstance(chart_type, list):
+                    chart_type_ord = chart_type[i]
+                else:
+                    chart_type_ord = chart_type
+
+                end = start + len(data_frame.columns)
+
+                try:
+                    color_spec1 = color_spec[start:start + end]
+                except:
+                    color_spec1 = None
+
+                start = end
+
+                # Special call for choropleth (uses Plotly API directly)
+                # Special case for map/choropleth which has yet to be implemented in Cufflinks
+                # will likely remove this in the future
+                if chart_type_ord == 'choropleth':
+
+                    for col in data_frame.columns:
+                        try:
+                            data_frame[col] = data_frame[col].astype(str)
+                        except:
+                            pass
+
+                    if style.color != []:
+                        color = style.color
+                    else:
+                        color = [[0.0, 'rgb(242,240,247)'],
+                                 [0.2, 'rgb(218,218,235)'],
+                                 [0.4, 'rgb(188,189,220)'],
+                                 [0.6, 'rgb(158,154,200)'],
+                                 [0.8, 'rgb(117,107,177)'],
+                                 [1.0, 'rgb(84,39,143)']]
+
+                    text = ''
+
+                    if 'text' in data_frame.columns:
+                        text = data_frame['Text']
+
+                    data = [dict(
+                        type='choropleth',
+                        colorscale=color,
+                        autocolorscale=False,
+                        locations=data_frame['Code'],
+                        z=data_frame[style.plotly_choropleth_field].astype(
+                            float),
+                        locationmode=style.plotly_location_mode,
+                        text=text,
+                        marker=dict(
+                            line=dict(
+                                color='rgb(255,255,255)',
+                                width=1
+                            )
+                        ),
+                        colorbar=dict(
+                            title=style.units
+                        )
+                    )]
+
+                    layout = dict(
+                        title=title,
+                        geo=dict(
+                            scope=style.plotly_scope,
+                            projection=dict(type=style.plotly_projection),
+                            showlakes=True,
+                            lakecolor='rgb(255, 255, 255)',
+                        ),
+                    )
+
+                    fig = dict(data=data, layout=layout)
+
+                # Otherwise underlying Plotly Express library underneath
+                elif style.plotly_helper == 'plotly_express':
+
+                    # NOTE: we use cufflinks library, which simplifies plotting DataFrames in plotly
+                    if chart_type_ord == 'surface':
+                        # Create a surface plot using graph_objects instead of px
+                        fig = go.Figure(data=[go.Surface(
+                            z=data_frame.values,
+                            x=data_frame.index,
+                            y=data_frame.columns,
+                            colorscale=style.color if style.color else None
+                        )])
+
+                        fig.update_layout(
+                            title=title,
+                            width=width,
+                            height=height,
+                            scene=dict(
+                                xaxis_title=style.x_title,
+                                yaxis_title=style.y_title,
+                                zaxis_title=style.z_title
+                            )
+                        )
+
+                        # Setting axis is different with a surface
+                        if style.x_axis_range is not None:
+                            fig.update_layout(scene=dict(
+                                xaxis=dict(range=style.x_axis_range)))
+
+                        if style.y_axis_range is not None:
+                            fig.update_layout(scene=dict(
+                                xaxis=dict(range=style.y_axis_range)))
+
+                        if style.z_axis_range is not None:
+                            fig.update_layout(scene=dict(
+                                xaxis=dict(range=style.z_axis_range)))
+
+                    elif chart_type_ord in ['bar', 'barh']:
+                        fig = px.bar(
+                            data_frame,
+                            x=data_frame.columns.tolist()
+                                if chart_type_ord == 'barh' else data_frame.index,
+                            y=data_frame.index
+                                if chart_type_ord == 'barh' else data_frame.columns.tolist(),
+                            title=title,
+                            labels={"x": style.x_title, "y": style.y_title},
+                            width=width,
+                            height=height,
+                            color_discrete_sequence=color_spec1,
+                            orientation='h' if chart_type_ord == 'barh' else 'v'
+                        )
+
+                    elif 'heatmap' in chart_type_ord:
+                        fig = px.imshow(
+                            data_frame,
+                            title=title,
+                            labels={"x": style.x_title, "y": style.y_title,
+                                    "color": style.z_title},
+                            width=width,
+                            height=height,
+                            color_continuous_scale=style.color if style.color else None
+                        )
+
+                        # Label the cells on the heatmap trace itself (formatted by plotly.js from z), rather than
+                        # one layout annotation per cell, which the browser struggles with for large matrices
+                        if style.heatmap_label_max_cells is None or \
+                                data_frame.size <= style.heatmap_label_max_cells:
+                            fig.update_traces(texttemplate='%{z}',
+                                              textfont=dict(color="white"))
+
+                    # Otherwise we have a line plot (or similar such as a scatter plot, or bar chart etc)
+                    else:
+
+                        full_line = style.connect_line_gaps
+
+                        if chart_type_ord == "line":
+                            full_line = True
+                            mode = "lines"
+                        elif chart_type_ord in ["dash", "dashdot", "dot"]:
+                            mode = "lines"
+                        elif chart_type_ord == 'line+markers':
+                            full_line = True
+
+                            chart_type_ord = 'line'
+                            mode = "lines+markers"
+
+                            marker_size = style.marker_size
+                        elif chart_type_ord == "scatter":
+                            mode = 'markers'
+                            marker_size = style.marker_size
+                        elif chart_type_ord == 'bubble':
+                            chart_type_ord = 'scatter'
+
+                            mode = 'markers'
+
+                        vspan = None
+
+                        if style.x_shade_dates is not None:
+                            vspan = {
+                                'x0': data_frame.index[0].strftime("%Y-%m-%d"),
+                                'x1': data_frame.index[-1].strftime(
+                                    "%Y-%m-%d"), 'color': 'rgba(30,30,30,0.3)',
+                                'fill': True, 'opacity': .4}
+
+
+                        if chart_type_ord == 'scatter':
+                            # marker size is set on the traces below (px.scatter's size expects a column)
+                            fig = px.scatter(
+                                data_frame,
+                                x=data_frame.index,
+                                y=data_frame.columns.tolist(),
+                                title=title,
+                                labels={"x": style.x_title,
+                                        "y": style.y_title},
+                                width=width,
+                                height=height,
+                                color_discrete_sequence=color_spec1,
+                                render_mode=render_mode
+                            )
+                        else:
+                            # Otherwise it's a line chart
+                            fig = px.line(
+                                data_frame,
+                                x=data_frame.index,
+                                y=data_frame.columns.tolist(),
+                                title=title,
+                                labels={"x": style.x_title,
+                                        "y": style.y_title},
+                                width=width,
+                                height=height,
+                                color_discrete_sequence=color_spec1,
+                                line_shape='linear' if style.line_shape is None else style.line_shape,
+                                render_mode=render_mode
+                            )
+
+                            dash = chart_type_ord
+
+                            if chart_type_ord == 'line':
+                                dash = "solid"
+
+                            fig.update_traces(line=dict(dash=dash))
+
+                        # For lines set the property of connectgaps (cannot specify directly in cufflinks)
+                        if full_line:
+                            for z in range(0, len(fig['data'])):
+                                fig['data'][
+                                    z].connectgaps = style.connect_line_gaps
+
+                                for k in range(0, len(fig['data'])):
+                                    if full_line:
+                                        fig['data'][
+                                            k].connectgaps = style.connect_line_gaps
+
+                        if style.line_shape != None:
+                            if isinstance(style.line_shape, str):
+                                line_shape = [style.line_shape] * len(
+                                    fig['data'])
+                            else:
+                                line_shape = style.line_shape
+
+                            for k in range(0, len(fig['data'])):
+                                fig['data'][k].line.shape = line_shape[k]
+
+                        if style.stackgroup is not None:
+
+                            if isinstance(style.stackgroup, list):
+                                stackgroup = style.stackgroup
+                            else:
+                                stackgroup = ['A'] * len(fig['data'])
+
+                            for k in range(0, len(fig['data'])):
+                                fig['data'][k].stackgroup = stackgroup[k]
+
+                        if vspan is not None:
+                            # Add the vertical shaded region
+                            fig.add_shape(
+                                type="rect",
+                                x0=vspan['x0'],
+                                x1=vspan['x1'],
+                                y0=0,
+                                y1=1,
+                                yref="paper",
+                                fillcolor=vspan['color'],
+                                opacity=vspan['opacity'],
+                                layer="below",
+                                line_width=0,
+                            )
+
+                        # Lines/markers
+                        if hasattr(style,
+                                   'mode') and style.mode and mode is None:
+                            mode = style.mode
+
+                        if mode is not None:
+                            fig.update_traces(mode=mode, marker=dict(
+                                size=style.marker_size or marker_size))
+
+            # Common properties
+            # Override other properties, which cannot be set directly by plotly express/or you want to reset later
+            if style.title is not None:
+                try:
+                    fig.update_layout(title=style.title)
+                except:
+                    pass
+
+
+            # For Plotly Express, we need to explicitly update traces for secondary y-axis
+            for trace in fig.select_traces():
+                if trace.name in style.y_axis_2_series:
+                    trace.update(yaxis="y2")
+
+            # Make sure y2 axis is configured
+            fig.update_layout(
+                yaxis2=dict(
+                    title=style.y_2_title,
+                    overlaying="y",
+                    side="right",
+                    showgrid=style.y_axis_2_showgrid if hasattr(
+                        style, 'y_axis_2_showgrid') else True
+                )
+            )
+
+            # Add second y axis title
+            if style.y_2_title is not None:
+                if style.y_2_title != '':
+                    try:
+                        fig['layout'].update(
+                            yaxis2=dict(title=style.y_2_title))
+                    except:
+                        pass
+
+            if style.x_axis_range is not None:
+                try:
+                    fig['layout'].update(
+                        xaxis=dict(range=style.x_axis_range, autorange=False))
+                except:
+                    pass
+
+            if style.y_axis_range is not None:
+
+                try:
+                    fig['layout'].update(
+                        yaxis=dict(range=style.y_axis_range, autorange=False))
+                except:
+                    pass
+
+            if style.y_axis_2_range is not None:
+                try:
+                    fig['layout'].update(
+                        yaxis2=dict(range=style.y_axis_2_range,
+                                    autorange=False))
+                except:
+                    pass
+
+            if style.z_axis_range is not None:
+                try:
+                    fig['layout'].update(
+                        zaxis=dict(range=style.z_axis_range, autorange=False))
+                except:
+                    pass
+
+            if style.font_family is not None:
+                try:
+                    fig.update_layout(font_family=style.font_family)
+                except:
+                    pass
+
+            if style.x_axis_type is not None:
+                try:
+                    fig.update_xaxes(type=style.x_axis_type)
+                except:
+                    pass
+
+            if style.y_axis_type is not None:
+                try:
+                    fig.update_yaxes(type=style.y_axis_type)
+                except:
+                    pass
+
+            if style.x_dtick is not None:
+                try:
+                    fig.update_layout(
+                        xaxis=dict(tickmode='linear', dtick=style.x_dtick))
+                except:
+                    pass
+
+            if style.y_dtick is not None:
+                try:
+                    fig.update_layout(
+                        yaxis=dict(tickmode='linear', dtick=style.y_dtick))
+                except:
+                    pass
+
+            # Add shaded regions
+            fig = self._multi_shade(fig, style)
+
+            if style.display_legend is not None:
+                fig.update_layout(showlegend=style.display_legend)
+
+            # Legend Properties
+            if style.legend_x_anchor is not None:
+                try:
+                    fig.update_layout(
+                        legend=dict(xanchor=style.legend_x_anchor))
+                except:
+                    pass
+
+            if style.legend_y_anchor is not None:
+                try:
+                    fig.update_layout(
+                        legend=dict(yanchor=style.legend_y_anchor))
+                except:
+                    pass
+
+            if style.legend_x_pos is not None:
+                try:
+                    fig.update_layout(legend=dict(x=style.legend_x_pos))
+                except:
+                    pass
+
+            if style.legend_y_pos is not None:
+                try:
+                    fig.update_layout(legend=dict(y=style.legend_y_pos))
+                except:
+                    pass
+
+            if style.legend_bgcolor is not None:
+                try:
+                    fig.update_layout(
+                        legend=dict(bgcolor=style.legend_bgcolor))
+                except:
+                    pass
+
+            if style.legend_orientation is not None:
+                try:
+                    fig.update_layout(
+                        legend=dict(orientation=style.legend_orientation))
+                except:
+                    pass
+
+            if style.barmode is not None:
+                try:
+                    fig.update_layout(barmode=style.barmode)
+                except:
+                    pass
+
+            fig_list.append(fig)
+
+        #### Plotted all the lines
+
+        # Create subplots if more than one figure
+        if len(fig_list) > 1 and style.animate_figure == False \
+                and style.subplots == True:
+            from plotly.subplots import make_subplots
+
+            if style.subplot_titles:
+                fig = make_subplots(rows=len(fig_list), cols=1,
+                                    subplot_titles=style.subplot_titles)
+            else:
+                fig = make_subplots(rows=len(fig_list), cols=1)
+
+            # layout = fig_list[0]['layout']
+
+            # fig.layout = fig_list[0].layout
+
+            # for k, v in list(layout.items()):
+            #     if 'xaxis' not in k and 'yaxis' not in k:
+            #         fig['layout'].update({k: v})
+
+            for i, f in enumerate(fig_list):
+                f = f.data[0]
+                f.update(legendgroup=i)
+                fig.add_trace(f, row=i + 1, col=1)
+
+            # fig = cf.subplots(fig_list, base_layout=fig_list[0].to_dict()['layout'], shape=(len(fig_list), 1),
+            #                  shared_xaxes=False, shared_yaxes=False)
+
+            if not (isinstance(style.title, list)):
+                fig['layout'].update(title=style.title)
+
+            fig.update_layout(
+                height=style.height * abs(style.scale_factor),
+                width=style.width * abs(style.scale_factor),
+                showlegend=style.display_legend
+            )
+
+        elif style.animate_figure:
+
+            fig = fig_list[0]
+
+            # Add buttons to play/pause
+            fig["layout"]["updatemenus"] = [
+                {
+                    "buttons": [
+                        {
+                            "args": [None, {
+                                "frame": {"duration": style.animate_frame_ms,
+                                          "redraw": True},
+                                "fromcurrent": True, "transition": {
+                                    "duration": style.animate_frame_ms,
+                                    "easing": "quadratic-in-out"}}],
+                            "label": "Play",
+                            "method": "animate"
+                        },
+                        {
+                            "args": [[None],
+                                     {"frame": {"duration": 0, "redraw": True},
+                                      "mode": "immediate",
+                                      "transition": {"duration": 0}}],
+                            "label": "Pause",
+                            "method": "animate"
+                        }
+                    ],
+                    "direction": "left",
+                    "pad": {"r": 10, "t": 87},
+                    "showactive": False,
+                    "type": "buttons",
+                    "x": 0.1,
+                    "xanchor": "right",
+                    "y": 0,
+                    "yanchor": "top"
+                }
+            ]
+
+            if style.animate_titles is not None:
+                animate_titles = style.animate_titles
+            else:
+                animate_titles = list(range(0, len(fig_list)))
+
+            # Add an animation frame for each data frame
+            frames = []
+
+            for fig_temp, title_temp in zip(fig_list, animate_titles):
+                frames.append(go.Frame(data=fig_temp['data'],
+                                       name=str(title_temp),
+                                       layout=go.Layout(
+                                           title=str(title_temp))))
+
+            fig.update(frames=frames)
+
+            # Add a slider, with the frame labels
+            sliders_dict = {
+                "active": 0,
+                "yanchor": "top",
+                "xanchor": "left",
+                "currentvalue": {
+                    "visible": True,
+                    "xanchor": "right"
+                },
+                "transition": {"duration": style.animate_frame_ms,
+                               "easing": "cubic-in-out"},
+                "pad": {"b": 10, "t": 50},
+                "len": 0.9,
+                "x": 0.1,
+                "y": 0,
+                "steps": []
+            }
+
+            for i in range(0, len(fig_list)):
+                slider_step = {"args": [
+                    [animate_titles[i]],
+                    {"frame": {"duration": style.animate_frame_ms,
+                               "redraw": True},
+                     "mode": "immediate",
+                     "transition": {"duration": style.animate_frame_ms}}
+                ],
+                    "label": str(animate_titles[i]),
+                    "method": "animate"}
+
+                sliders_dict["steps"].append(slider_step)
+
+            fig["layout"]["sliders"] = [sliders_dict]
+
+            # else:
+            # Add an animation frame for each data frame
+            #    fig.update(frames=[go.Frame(data=fig_temp['data']) for fig_temp in fig_list])
+
+        else:
+            fig = fig_list[0]
+
+        fig.update(dict(layout=dict(legend=dict(
+            x=0.05,
+            y=1
+        ))))
+
+        # Adjust margins
+        if style.thin_margin:
+            fig.update(dict(layout=dict(margin=go.layout.Margin(
+                l=20,
+                r=20,
+                b=40,
+                t=40,
+                pad=0
+            ))))
+
+        # Change background color
+        fig.update(dict(layout=dict(paper_bgcolor='rgba(0,0,0,0)')))
+        fig.update(dict(layout=dict(plot_bgcolor='rgba(0,0,0,0)')))
+
+        # Deal with grids
+        if not (style.x_axis_showgrid): fig.update(
+            dict(layout=dict(xaxis=dict(showgrid=style.x_axis_showgrid))))
+        if not (style.y_axis_showgrid): fig.update(
+            dict(layout=dict(yaxis=dict(showgrid=style.y_axis_showgrid))))
+        if not (style.y_axis_2_showgrid): fig.update(
+            dict(layout=dict(yaxis2=dict(showgrid=style.y_axis_2_showgrid))))
+
+        # Override properties, which cannot be set directly by cufflinks
+
+        # For the type of line (ie. line or scatter)
+        # For making the lined dashed, dotted etc.
+        if style.subplots == False and isinstance(chart_type, list):
+            for j in range(0, len(fig['data'])):
+                mode = None;
+                dash = None;
+                line_shape = None;
+
+                if chart_type[j] == 'line':
+                    mode = 'lines'
+                elif chart_type[j] == 'line+markers':
+                    mode = 'lines+markers'
+                elif chart_type[j] == 'scatter':
+                    mode = 'markers'
+                elif chart_type[j] in ['dash', 'dashdot', 'dot']:
+                    dash = chart_type[j]
+                    mode = 'lines'
+                elif chart_type[j] in ['hv', 'vh', 'vhv', 'spline', 'linear']:
+                    line_shape = chart_type[j]
+                    mode = 'lines'
+                elif chart_type[j] == 'bubble':
+                    mode = 'markers'
+
+                    bubble_series = style.bubble_series[cols[j]]
+                    bubble_series = bubble_series.fillna(0)
+
+                    # dash = chart_type[j]
+                    # data_frame[bubble_series.name] = bubble_series
+                    scale = float(bubble_series.max())
+
+                    fig['data'][j].marker.size = \
+                        (style.bubble_size_scalar * (
+                                    bubble_series.values / scale)).tolist()
+
+                # Will fail if not line
+                try:
+                    if mode is not None:
+                        fig['data'][j].mode = mode
+
+                    if dash is not None:
+                        fig['data'][j].line.dash = dash
+
+                    if line_shape is not None:
+                        fig['data'][j].line.shape = line_shape
+                except:
+                    pass
+
+        # If candlestick specified add that (needed to be appended on top of the Plotly figure's data
+        if style.candlestick_series is not None:
+
+            # self.logger.debug("About to create candlesticks")
+
+            if isinstance(style.candlestick_series, Figure):
+                fig_candle = style.candlestick_series
+            elif style.candlestick_trace in ('candlestick', 'ohlc'):
+                fig_candle = create_candlestick_native(
+                    style.candlestick_series['open'],
+                    style.candlestick_series['high'],
+                    style.candlestick_series['low'],
+                    style.candlestick_series['close'],
+                    dates=style.candlestick_series['close'].index,
+                    chart_type=style.candlestick_trace
+                    )
+            else:
+                # from plotly.tools import FigureFactory as FF
+                fig_candle = create_candlestick(
+                    style.candlestick_series['open'],
+                    style.candlestick_series['high'],
+                    style.candlestick_series['low'],
+                    style.candlestick_series['close'],
+                    dates=style.candlestick_series['close'].index
+                    )
+
+            native_candle = fig_candle['data'][0].type in ('candlestick', 'ohlc')
+
+            if native_candle:
+                # one trace, with separate increasing/decreasing properties
+                self._set_native_candle_colors(fig_candle['data'][0].increasing,
+                                               style.candlestick_increasing_color,
+                                               style.candlestick_increasing_line_color, cm)
+                self._set_native_candle_colors(fig_candle['data'][0].decreasing,
+                                               style.candlestick_decreasing_color,
+                                               style.candlestick_decreasing_line_color, cm)
+            else:
+                if style.candlestick_increasing_color is not None:
+                    # Increasing
+                    fig_candle['data'][0].fillcolor = cm.get_color_code(
+                        style.candlestick_increasing_color)
+                    fig_candle['data'][0].line.color = cm.get_color_code(
+                        style.candlestick_increasing_line_color)
+
+                if style.candlestick_decreasing_color is not None:
+                    # Decreasing
+                    fig_candle['data'][1].fillcolor = cm.get_color_code(
+                        style.candlestick_decreasing_color)
+                    fig_candle['data'][1].line.color = cm.get_color_code(
+                        style.candlestick_decreasing_line_color)
+
+            # Append the data to the existing Plotly figure, plotted earlier
+            for trace in fig_candle.data:
+                fig.add_trace(trace)
+
+            # native candlesticks come with a range slider, which the box version never had
+            if native_candle:
+                fig.update_xaxes(rangeslider_visible=False)
+
+        # Overlay other Plotly figures on top of
+        if style.overlay_fig is not None:
+
+            for d in style.overlay_fig.data:
+                fig.add_trace(d)
+
+        x_y_line_list = []
+
+        # fig.layout.yrange
+        # add x-line:
+        for x_y_line in style.x_y_line:
+            start = x_y_line[0]
+            finish = x_y_line[1]
+
+            x_y_line_list.append(
+                {
+                    'type': 'line',
+                    'x0': start[0],
+                    'y0': start[1],
+                    'x1': finish[0],
+                    'y1': finish[1],
+                    'line': {
+                        'color': 'black',
+                        'width': 0.5,
+                        'dash': 'dot',
+                    },
+                }
+            )
+
+        # x_y_line_list =  [{
+        #     'type': 'line',
+        #     'x0': 1,
+        #     'y0': 0,
+        #     'x1': 1,
+        #     'y1': 2,
+        #     'line': {
+        #         'color': 'rgb(55, 128, 191)',
+        #         'width': 3,
+        #     },
+        # }]
+
+        if len(x_y_line_list) > 0:
+            fig.layout.shapes = x_y_line_list
+
+        if style.plotly_theme is not None:
+            fig.update_layout(template=style.plotly_theme)
+
+        # publish the plot (depending on the output mode eg. to HTML file/Jupyter notebook)
+        # also return as a Figure object for plotting by a web server app (eg. Flask/Dash)
+        fig = self.publish_plot(fig, style)
+
+        if cache_key is not None:
+            render_cache.put(cache_key, fig)
+
+        return fig
+
+    def extend_chart(self, fig, data_frame, max_points=None):
+        """Creates the update for a live Plotly chart when new rows are appended to its data, in the form used by
+        plotly.js extendTraces (and Dash's dcc.Graph extendData, as [delta['data'], delta['trace_indices'],
+        delta['max_points']]), so only the new points are sent to the browser, rather than rebuilding the whole figure.
+        Each column is matched to the trace with the same name.
+
+        fig itself is left untouched: the delta is meant to be applied on the client, since updating a Figure on the
+        server means Plotly copying and validating the full history of each trace on every update.
+
+        Parameters
+        ----------
+        fig : Figure or dict
+            Figure previously returned by plot_chart
+        data_frame : DataFrame
+            Newly appended rows
+        max_points : int
+            Only keep the last max_points on each trace (rolling window), if None keep all of them
+
+        Returns
+        -------
+        dict
+            'data' (dict of 'x' and 'y' lists, one array per trace), 'trace_indices' and 'max_points'
+        """
+        trace_indices = {}
+
+        for i, trace in enumerate(fig['data']):
+            trace_indices.setdefault(str(trace['name']), i)
+
+        x = data_frame.index.to_numpy()
+
+        x_list = []
+        y_list = []
+        indices = []
+
+        for col in data_frame.columns:
+            i = trace_indices.get(str(col))
+
+            # columns which aren't on the chart are ignored
+            if i is None:
+                continue
+
+            x_list.append(x)
+            y_list.append(data_frame[col].to_numpy())
+            indices.append(i)
+
+        return {'data': {'x': x_list, 'y': y_list}, 'trace_indices': indices, 'max_points': max_points}
+
+    def _get_render_cache_key(self, data_frame, style, chart_type):
+        """Gets the process wide RenderCache and the key for this chart, if style.render_cache is set and the
+        plot mode returns its output (rather than eg. writing an HTML file or opening a browser)
+
+        Returns
+        -------
+        RenderCache, str
+        """
+        if not (style.render_cache) or style.plotly_plot_mode not in _cacheable_plot_modes:
+            return None, None
+
+        from chartpy.rendercache import RenderCache
+
+        render_cache = RenderCache.get_render_cache()
+
+        try:
+            return render_cache, render_cache.create_key(data_frame, style, chart_type, 'plotly')
+        except Exception:
+            return None, None
+
+    def _get_render_mode(self, style, data_frame_list, chart_type):
+        """Gets the Plotly Express render_mode for line/scatter charts. Uses WebGL if style.plotly_webgl is set, or if
+        the total number of points across all the (sub)plots is above style.plotly_webgl_threshold, so very large
+        charts stay interactive in the browser.
+
+        Returns
+        -------
+        str
+            'webgl' or 'svg'
+        """
+        chart_type_list = chart_type if isinstance(chart_type, list) else [chart_type]
+        line_shape_list = style.line_shape if isinstance(style.line_shape, list) else [style.line_shape]
+
+        # WebGL traces can't draw splines or stacked areas
+        if 'spline' in chart_type_list or 'spline' in line_shape_list or style.stackgroup is not None:
+            return 'svg'
+
+        if style.plotly_webgl:
+            return 'webgl'
+
+        if style.plotly_webgl_threshold is not None:
+            no_of_points = sum([d.size for d in data_frame_list if isinstance(d, pandas.DataFrame)])
+
+            if no_of_points > style.plotly_webgl_threshold:
+                return 'webgl'
+
+        return 'svg'
+
+    def _multi_shade(self, fig, style):
+        """ Adds shaded areas for specified dates in a plotly plot.
+            The lines of the areas are set to transparent using rgba(0,0,0,0)
+        """
+        import copy
+
+        if style.x_shade_dates is None:
+            return fig
+
+        if isinstance(style.x_shade_dates, list):
+            x0 = style.x_shade_dates[0]
+            x1 = style.x_shade_dates[1]
+        else:
+            x0 = list(style.x_shade_dates.keys())
+            x1 = list(style.x_shade_dates.values())
+
+        # Get dict from tuple made by vspan()
+        x_elem = fig['layout']['shapes'][0]
+
+        # Container (list) for dicts / shapes
+        shp_lst = []
+
+        # Make dicts according to x0 and X1
+        # and edit elements of those dicts
+        for i in range(0, len(x0)):
+            shp_lst.append(copy.deepcopy(x_elem))
+            shp_lst[i]['x0'] = x0[i]
+            shp_lst[i]['x1'] = x1[i]
+            shp_lst[i]['line']['color'] = 'rgba(0,0,0,0)'
+
+        # Replace shape in fig with multiple new shapes
+        fig['layout']['shapes'] = tuple(shp_lst)
+
+
+        return fig
+
+    def publish_plot(self, fig, style):
+        # change background color
+        fig.update(dict(layout=dict(paper_bgcolor='rgba(0,0,0,0)')))
+        fig.update(dict(layout=dict(plot_bgcolor='rgba(0,0,0,0)')))
+
+        if style is None: style = Style()
+
+        style = self.generate_file_names(style, 'plotly')
+
+        if style.plotly_plot_mode == 'dash':
+            pass
+
+        elif style.plotly_plot_mode == 'online':
+            plotly.tools.set_credentials_file(username=style.plotly_username,
+                                              api_key=style.plotly_api_key)
+
+            py_online.plot(fig, filename=style.plotly_url,
+                           world_readable=style.plotly_world_readable,
+                           auto_open=not (style.silent_display),
+                           asImage=style.plotly_as_image)
+
+        elif style.plotly_plot_mode == 'offline_html':
+            py_offline.plot(fig, filename=style.html_file_output,
+                            auto_open=not (style.silent_display))
+        elif style.plotly_plot_mode == 'offline_html_exc_embed_js':
+            py_offline.plot(fig, filename=style.html_file_output,
+                            include_plotlyjs="cdn",
+                            auto_open=not(style.silent_display))
+        elif style.plotly_plot_mode == 'offline_png':
+            # Needs kaleido (or orca), which is kept running between charts
+            self._publish_image(self._get_image_exporter().to_image(fig, format=self._get_image_format(style)),
+                                style)
+
+        elif style.plotly_plot_mode == 'offline_embed_js_div':
+            return py_offline.plot(fig, include_plotlyjs=True,
+                                   output_type='div')  # HTML string
+
+        elif style.plotly_plot_mode == 'offline_div':
+            return py_offline.plot(fig, include_plotlyjs=False,
+                                   output_type='div')  # HTML string
+
+        # Numeric arrays as base64 typed arrays rather than JSON text (much smaller, and quicker for the browser to
+        # parse), needs plotly.js 2.28 or later
+        elif style.plotly_plot_mode == 'dash_binary':
+            from chartpy.figureencoder import FigureEncoder
+
+            return FigureEncoder().encode_figure(fig)  # dict for dcc.Graph
+
+        elif style.plotly_plot_mode == 'offline_div_binary':
+            from chartpy.figureencoder import FigureEncoder
+
+            return FigureEncoder().to_div(fig, include_plotlyjs=False)  # HTML string
+
+        elif style.plotly_plot_mode == 'offline_embed_js_div_binary':
+            from chartpy.figureencoder import FigureEncoder
+
+            return FigureEncoder().to_div(fig, include_plotlyjs=True)  # HTML string
+
+        elif style.plotly_plot_mode in _image_plot_modes:
+            # PNG as bytes, or PNG/SVG as bytes in HTML image
+            return self._publish_image(
+                self._get_image_exporter().to_image(fig, format=self._get_image_format(style)), style)
+
+        elif style.plotly_plot_mode == 'offline_jupyter':
+
+            # plot in IPython notebook
+            py_offline.init_notebook_mode()
+            py_offline.iplot(fig)
+
+        elif style.plotly_plot_mode == 'offline_jupyter_connected':
+
+            # plot in IPython notebook
+            py_offline.init_notebook_mode(connected=True)
+            py_offline.iplot(fig)
+
+        # plotly.offline.plot(fig, filename=style.file_output, format='png',
+        #         width=style.width * style.scale_factor, height=style.height * style.scale_factor)
+        elif style.plotly_plot_mode != 'dash':
+            try:
+                py_online.image.save_as(fig, filename=style.file_output,
+                                        format='png',
+                                        width=style.width * abs(
+                                            style.scale_factor),
+                                        height=style.height * abs(
+                                            style.scale_factor))
+            except:
+                pass
+
+        return fig
+
+    def publish_many(self, fig_list, style_list=None):
+        """Publishes many Plotly figures (as publish_plot), with all the static images (eg. 'offline_png',
+        'offline_image_png_bytes') exported in one batch, shared out over the image exporter's worker processes
+
+        Parameters
+        ----------
+        fig_list : Figure (list)
+            Plotly figures
+        style_list : Style (list)
+            Style for each figure (or a single Style for all of them)
+
+        Returns
+        -------
+        list
+            Output of each figure, as publish_plot would return it
+        """
+        fig_list = list(fig_list)
+
+        if not (isinstance(style_list, list)):
+            style_list = [style_list] * len(fig_list)
+
+        # each figure gets its own copy of its Style, as we change the file names below
+        style_list = [Style() if style is None else copy.copy(style) for style in style_list]
+
+        output_list = [None] * len(fig_list)
+        image_index = []
+
+        for i, (fig, style) in enumerate(zip(fig_list, style_list)):
+            if style.plotly_plot_mode in _image_plot_modes:
+                image_index.append(i)
+            else:
+                output_list[i] = self.publish_plot(fig, style)
+
+        if len(image_index) > 0:
+            image_fig_list = []
+            file_output_set = set()
+
+            for i in image_index:
+                # each figure in the batch might be written to a file, so needs its own file name (if several have
+                # the same one, eg. they were given the same Style, add the figure's number to it)
+                style_list[i] = self.generate_file_names(style_list[i], 'plotly')
+
+                if style_list[i].plotly_plot_mode == 'offline_png':
+                    if style_list[i].file_output in file_output_set:
+                        root, extension = os.path.splitext(style_list[i].file_output)
+                        style_list[i].file_output = root + '-' + str(i) + extension
+
+                    file_output_set.add(style_list[i].file_output)
+
+                fig_list[i].update(dict(layout=dict(paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')))
+                image_fig_list.append(fig_list[i])
+
+            image_list = self._get_image_exporter().to_image_many(
+                image_fig_list, format=[self._get_image_format(style_list[i]) for i in image_index])
+
+            for i, image in zip(image_index, image_list):
+                output = self._publish_image(image, style_list[i])
+
+                output_list[i] = fig_list[i] if output is None else output
+
+        return output_list
+
+    def _get_image_exporter(self):
+        from chartpy.imageexporter import ImageExporter
+
+        return ImageExporter.get_image_exporter()
+
+    def _get_image_format(self, style):
+        # for files, take the format from the extension (as write_image does)
+        if style.plotly_plot_mode == 'offline_png':
+            extension = os.path.splitext(style.file_output)[1]
+
+            if extension != '':
+                return extension[1:].lower()
+
+        return _image_plot_modes[style.plotly_plot_mode]
+
+    def _publish_image(self, image, style):
+        if style.plotly_plot_mode == 'offline_png':
+            with open(style.file_output, 'wb') as f:
+                f.write(image)
+
+            return None
+
+        elif style.plotly_plot_mode == 'offline_image_png_in_html':
+            # can display in HTML as <img src="data:image/png;base64,[ENCODED STRING GOES HERE]">
+            return '<img src="data:image/png;base64,' + base64.b64encode(image).decode('utf8') + '">'
+
+        elif style.plotly_plot_mode == 'offline_image_svg_in_html':
+            return '<img src="data:image/svg+xml;base64,' + base64.b64encode(image).decode('utf8') + '">'
+
+        return image
+
+    def _set_native_candle_colors(self, direction, color, line_color, cm):
+        # direction is the increasing/decreasing property of a go.Candlestick/go.Ohlc trace (go.Ohlc has no fill)
+        if color is None:
+            return
+
+        try:
+            direction.fillcolor = cm.get_color_code(color)
+        except ValueError:
+            # so draw OHLC bars in the fill color, unless they have a line color
+            if line_color is None: line_color = color
+
+        if line_color is not None:
+            direction.line.color = cm.get_color_code(line_color)
+
+    def get_color_list(self, i):
+        color_palette = cc.plotly_palette
+
+        return color_palette[i % len(color_palette)]
+
+
+########################################################################################################################
+
+## faster version of Plotly's candlestick drawing module (assumes NumPy) ###############################################
+
+from plotly.figure_factory._ohlc import (_DEFAULT_INCREASING_COLOR,
+                                         _DEFAULT_DECREASING_COLOR)
+
+
+def make_increasing_candle(open, high, low, close, dates, **kwargs):
+    """
+    Makes boxplot trace for increasing candlesticks
+
+    _make_increasing_candle() and _make_decreasing_candle separate the
+    increasing traces from the decreasing traces so kwargs (such as
+    color) can be passed separately to increasing or decreasing traces
+    when direction is set to 'increasing' or 'decreasing' in
+    FigureFactory.create_candlestick()
+
+    :param (list) open: opening values
+    :param (list) high: high values
+    :param (list) low: low values
+    :param (list) close: closing values
+    :param (list) dates: list of datetime objects. Default: None
+    :param kwargs: kwargs to be passed to increasing trace via
+        plotly.graph_objs.Scatter.
+
+    :rtype (list) candle_incr_data: list of the box trace for
+        increasing candlesticks.
+    """
+    increase_x, increase_y = _Candlestick(
+        open, high, low, close, dates, **kwargs).get_candle_increase()
+
+    if 'line' in kwargs:
+        kwargs.setdefault('fillcolor', kwargs['line']['color'])
+    else:
+        kwargs.setdefault('fillcolor', _DEFAULT_INCREASING_COLOR)
+    if 'name' in kwargs:
+        kwargs.setdefault('showlegend', True)
+    else:
+        kwargs.setdefault('showlegend', False)
+    kwargs.setdefault('name', 'Increasing')
+    kwargs.setdefault('line', dict(color=_DEFAULT_INCREASING_COLOR))
+
+    candle_incr_data = dict(type='box',
+                            x=increase_x,
+                            y=increase_y,
+                            whiskerwidth=0,
+                            boxpoints=False,
+                            **kwargs)
+
+    return [candle_incr_data]
+
+
+def make_decreasing_candle(open, high, low, close, dates, **kwargs):
+    """
+    Makes boxplot trace for decreasing candlesticks
+
+    :param (list) open: opening values
+    :param (list) high: high values
+    :param (list) low: low values
+    :param (list) close: closing values
+    :param (list) dates: list of datetime objects. Default: None
+    :param kwargs: kwargs to be passed to decreasing trace via
+        plotly.graph_objs.Scatter.
+
+    :rtype (list) candle_decr_data: list of the box trace for
+        decreasing candlesticks.
+    """
+
+    decrease_x, decrease_y = _Candlestick(
+        open, high, low, close, dates, **kwargs).get_candle_decrease()
+
+    if 'line' in kwargs:
+        kwargs.setdefault('fillcolor', kwargs['line']['color'])
+    else:
+        kwargs.setdefault('fillcolor', _DEFAULT_DECREASING_COLOR)
+    kwargs.setdefault('showlegend', False)
+    kwargs.setdefault('line', dict(color=_DEFAULT_DECREASING_COLOR))
+    kwargs.setdefault('name', 'Decreasing')
+
+    candle_decr_data = dict(type='box',
+                            x=decrease_x,
+                            y=decrease_y,
+                            whiskerwidth=0,
+                            boxpoints=False,
+                            **kwargs)
+
+    return [candle_decr_data]
+
+
+def create_candlestick(open, high, low, close, dates=None, direction='both',
+                       **kwargs):
+    """
+    BETA function that creates a candlestick chart
+
+    :param (list) open: opening values
+    :param (list) high: high values
+    :param (list) low: low values
+    :param (list) close: closing values
+    :param (list) dates: list of datetime objects. Default: None
+    :param (string) direction: direction can be 'increasing', 'decreasing',
+        or 'both'. When the direction is 'increasing', the returned figure
+        consists of all candlesticks where the close value is greater than
+        the corresponding open value, and when the direction is
+        'decreasing', the returned figure consists of all candlesticks
+        where the close value is less than or equal to the corresponding
+        open value. When the direction is 'both', both increasing and
+        decreasing candlesticks are returned. Default: 'both'
+    :param kwargs: kwargs passed through plotly.graph_objs.Scatter.
+        These kwargs describe other attributes about the ohlc Scatter trace
+        such as the color or the legend name. For more information on valid
+        kwargs call help(plotly.graph_objs.Scatter)
+
+    :rtype (dict): returns a representation of candlestick chart figure.
+
+    Example 1: Simple candlestick chart from a Pandas DataFrame
+    ```
+    import plotly.plotly as py
+    from plotly.figure_factory import create_candlestick
+    from datetime import datetime
+
+    import pandas.io.data as web
+
+    df = web.DataReader("aapl", 'yahoo', datetime(2007, 10, 1), datetime(2009, 4, 1))
+    fig = create_candlestick(df.Open, df.High, df.Low, df.Close, dates=df.index)
+    py.plot(fig, filename='finance/aapl-candlestick', validate=False)
+    ```
+
+    Example 2: Add text and annotations to the candlestick chart
+    ```
+    fig = create_candlestick(df.Open, df.High, df.Low, df.Close, dates=df.index)
+    # Update the fig - all options here: https://plot.ly/python/reference/#Layout
+    fig['layout'].update({
+        'title': 'The Great Recession',
+        'yaxis': {'title': 'AAPL Stock'},
+        'shapes': [{
+            'x0': '2007-12-01', 'x1': '2007-12-01',
+            'y0': 0, 'y1': 1, 'xref': 'x', 'yref': 'paper',
+            'line': {'color': 'rgb(30,30,30)', 'width': 1}
+        }],
+        'annotations': [{
+            'x': '2007-12-01', 'y': 0.05, 'xref': 'x', 'yref': 'paper',
+            'showarrow': False, 'xanchor': 'left',
+            'text': 'Official start of the recession'
+        }]
+    })
+    py.plot(fig, filename='finance/aapl-recession-candlestick', validate=False)
+    ```
+
+    Example 3: Customize the candlestick colors
+    ```
+    import plotly.plotly as py
+    from plotly.figure_factory import create_candlestick
+    from plotly.graph_objs import Line, Marker
+    from datetime import datetime
+
+    import pandas.io.data as web
+
+    df = web.DataReader("aapl", 'yahoo', datetime(2008, 1, 1), datetime(2009, 4, 1))
+
+    # Make increasing candlesticks and customize their color and name
+    fig_increasing = create_candlestick(df.Open, df.High, df.Low, df.Close, dates=df.index,
+        direction='increasing', name='AAPL',
+        marker=Marker(color='rgb(150, 200, 250)'),
+        line=Line(color='rgb(150, 200, 250)'))
+
+    # Make decreasing candlesticks and customize their color and name
+    fig_decreasing = create_candlestick(df.Open, df.High, df.Low, df.Close, dates=df.index,
+        direction='decreasing',
+        marker=Marker(color='rgb(128, 128, 128)'),
+        line=Line(color='rgb(128, 128, 128)'))
+
+    # Initialize the figure
+    fig = fig_increasing
+
+    # Add decreasing data with .extend()
+    fig['data'].extend(fig_decreasing['data'])
+
+    py.iplot(fig, filename='finance/aapl-candlestick-custom', validate=False)
+    ```
+
+    Example 4: Candlestick chart with datetime objects
+    ```
+    import plotly.plotly as py
+    from plotly.figure_factory import create_candlestick
+
+    from datetime import datetime
+
+    # Add data
+    open_data = [33.0, 33.3, 33.5, 33.0, 34.1]
+    high_data = [33.1, 33.3, 33.6, 33.2, 34.8]
+    low_data = [32.7, 32.7, 32.8, 32.6, 32.8]
+    close_data = [33.0, 32.9, 33.3, 33.1, 33.1]
+    dates = [datetime(year=2013, month=10, day=10),
+             datetime(year=2013, month=11, day=10),
+             datetime(year=2013, month=12, day=10),
+             datetime(year=2014, month=1, day=10),
+             datetime(year=2014, month=2, day=10)]
+
+    # Create ohlc
+    fig = create_candlestick(open_data, high_data,
+        low_data, close_data, dates=dates)
+
+    py.iplot(fig, filename='finance/simple-candlestick', validate=False)
+    ```
+    """
+
+    if direction == 'increasing':
+        candle_incr_data = make_increasing_candle(open, high, low, close,
+                                                  dates, **kwargs)
+        data = candle_incr_data
+    elif direction == 'decreasing':
+        candle_decr_data = make_decreasing_candle(open, high, low, close,
+                                                  dates, **kwargs)
+        data = candle_decr_data
+    else:
+        candle_incr_data = make_increasing_candle(open, high, low, close,
+                                                  dates, **kwargs)
+        candle_decr_data = make_decreasing_candle(open, high, low, close,
+                                                  dates, **kwargs)
+        data = candle_incr_data + candle_decr_data
+
+    layout = go.Layout()
+    return go.Figure(data=data, layout=layout)
+
+
+def create_candlestick_native(open, high, low, close, dates=None, chart_type='candlestick', **kwargs):
+    """Creates a candlestick (or OHLC) chart as a single native go.Candlestick (or go.Ohlc) trace, which plotly.js
+    draws itself, rather than as box traces with 6 points per candle. The columns are passed straight through as NumPy
+    arrays (so are quick to validate and can be sent as typed arrays, eg. with FigureEncoder), and the OHLC values
+    aren't checked (eg. that high >= low), as they normally come from a trusted source. Works with WebGL charts.
+
+    Parameters
+    ----------
+    open : Series or array-like
+        Opening values
+    high : Series or array-like
+        High values
+    low : Series or array-like
+        Low values
+    close : Series or array-like
+        Closing values
+    dates : DatetimeIndex or array-like
+        x-axis values (if None, uses 0, 1, 2...)
+    chart_type : str
+        'candlestick' or 'ohlc'
+    kwargs : dict
+        Other properties of the trace (eg. name)
+
+    Returns
+    -------
+    Figure
+    """
+    open, high, low, close = [numpy.asarray(x, dtype=numpy.float64) for x in (open, high, low, close)]
+
+    if dates is None:
+        dates = numpy.arange(0, len(open))
+    elif isinstance(dates, pandas.DatetimeIndex) and dates.tz is None:
+        # datetime64 rather than an object array of Timestamps (much quicker for Plotly to validate)
+        dates = dates.values
+
+    if chart_type == 'ohlc':
+        trace = go.Ohlc(x=dates, open=open, high=high, low=low, close=close, **kwargs)
+    else:
+        trace = go.Candlestick(x=dates, open=open, high=high, low=low, close=close, **kwargs)
+
+    return go.Figure(data=[trace], layout=go.Layout(xaxis=dict(rangeslider=dict(visible=False))))
+
+
+class _Candlestick(object):
+    """
+    Refer to FigureFactory.create_candlestick() for docstring.
+    """
+
+    def __init__(self, open, high, low, close, dates, **kwargs):
+        # assume we can get NumPy arrays (much quicker than ordinary arrays)
+        self.open = numpy.asarray(open)
+        self.high = numpy.asarray(high)
+        self.low = numpy.asarray(low)
+        self.close = numpy.asarray(close)
+        if dates is not None:
+            self.x = numpy.asarray(dates)
+        else:
+            self.x = numpy.arange(0, len(self.open))
+
+    def get_candle_increase(self):
+        """
+        Separate increasing data from decreasing data.
+
+        The data is increasing when close value > open value
+        and decreasing when the close value <= open value.
+        """
+        return self._get_candles(self.close > self.open)
+
+    def get_candle_decrease(self):
+        """
+        Separate increasing data from decreasing data.
+
+        The data is increasing when close value > open value
+        and decreasing when the close value <= open value.
+        """
+        return self._get_candles(self.close <= self.open)
+
+    def _get_candles(self, selected):
+        # each candle is a box of 6 points (low, open, close, close, close, high), all at the same x, built for every
+        # selected candle at once, rather than candle by candle
+        y = numpy.column_stack([self.low, self.open, self.close, self.close, self.close, self.high])[selected]
+
+        return numpy.repeat(self.x[selected], 6), y.ravel()
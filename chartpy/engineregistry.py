@@ -0,0 +1,142 @@
+__author__ = 'saeedamen'  # Saeed Amen
+
+#
+# Copyright 2016 Cuemacro
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+"""
+EngineRegistry
+
+Process wide registry of chart engines, so each engine (and its setup, such as parsed style sheets) is only built once
+per process, rather than once per chart. Third party engines can also be registered by name.
+
+"""
+
+import importlib
+import threading
+
+
+class EngineRegistry(object):
+
+    # name -> engine definition, which can be a "module:ClassName" string (imported on first use), an engine class
+    # or a callable returning an engine - the built in engines are strings, so their plotting libraries are only
+    # imported when first needed
+    _engine_definitions = {'matplotlib': 'chartpy.engine_matplotlib:EngineMatplotlib',
+                           'bokeh': 'chartpy.engine_bokeh:EngineBokeh',
+                           'bqplot': 'chartpy.engine_bqplot:EngineBqplot',
+                           'vispy': 'chartpy.engine_vispy:EngineVisPy',
+                           'plotly': 'chartpy.engine_plotly:EnginePlotly'}
+
+    # name -> engine instance (shared across all Chart objects in this process)
+    _engine_instances = {}
+
+    _lock = threading.RLock()
+
+    def register_engine(self, name, engine, replace=True):
+        """Registers a chart engine under a name, so it can be selected with Chart(engine=name)
+
+        Parameters
+        ----------
+        name : str
+            Name of the engine eg. 'matplotlib'
+        engine : str or class or callable or EngineTemplate
+            Either a "module:ClassName" string (imported lazily on first use), an EngineTemplate subclass, a factory
+            callable which returns an engine or an already constructed engine instance
+        replace : bool
+            Should we replace an engine already registered with this name?
+        """
+        with EngineRegistry._lock:
+            if name in EngineRegistry._engine_definitions and not (replace):
+                raise Exception("Engine " + str(name) + " is already registered")
+
+            EngineRegistry._engine_definitions[name] = engine
+            EngineRegistry._engine_instances.pop(name, None)
+
+            # Already constructed engines can be used directly
+            if not (isinstance(engine, str)) and not (callable(engine)):
+                EngineRegistry._engine_instances[name] = engine
+
+    def unregister_engine(self, name):
+        """Removes a chart engine (and any cached instance of it) from the registry
+
+        Parameters
+        ----------
+        name : str
+            Name of the engine
+        """
+        with EngineRegistry._lock:
+            EngineRegistry._engine_definitions.pop(name, None)
+            EngineRegistry._engine_instances.pop(name, None)
+
+    def get_engine(self, name):
+        """Gets the engine instance for a name, constructing it only the first time it is requested in this process
+
+        Parameters
+        ----------
+        name : str
+            Name of the engine eg. 'plotly'
+
+        Returns
+        -------
+        EngineTemplate
+            Engine instance (or None if no engine is registered with this name)
+        """
+        engine = EngineRegistry._engine_instances.get(name)
+
+        if engine is not None:
+            return engine
+
+        with EngineRegistry._lock:
+            # Another thread might have created it while we waited for the lock
+            if name in EngineRegistry._engine_instances:
+                return EngineRegistry._engine_instances[name]
+
+            if name not in EngineRegistry._engine_definitions:
+                return None
+
+            engine = self._create_engine(EngineRegistry._engine_definitions[name])
+            EngineRegistry._engine_instances[name] = engine
+
+        return engine
+
+    def list_engines(self):
+        """Lists the names of all the registered engines
+
+        Returns
+        -------
+        str (list)
+        """
+        return list(EngineRegistry._engine_definitions.keys())
+
+    def clear_cache(self, name=None):
+        """Drops cached engine instances, so they will be constructed again on the next request
+
+        Parameters
+        ----------
+        name : str
+            Engine to drop, if None drops all of them
+        """
+        with EngineRegistry._lock:
+            if name is None:
+                EngineRegistry._engine_instances.clear()
+            else:
+                EngineRegistry._engine_instances.pop(name, None)
+
+    def _create_engine(self, definition):
+        if isinstance(definition, str):
+            module_name, class_name = definition.split(':')
+            definition = getattr(importlib.import_module(module_name), class_name)
+
+        # Engines registered as instances are their own definition, so they are reused after clear_cache
+        if not (callable(definition)):
+            return definition
+
+        return definition()
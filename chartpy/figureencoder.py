@@ -0,0 +1,244 @@
+__author__ = 'saeedamen'  # Saeed Amen
+
+#
+# Copyright 2016 Cuemacro
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+"""
+FigureEncoder
+
+Encodes the numeric arrays in Plotly figures as base64 typed arrays ({'dtype': 'f8', 'bdata': ...}), which plotly.js
+(2.28 onwards) decodes directly into JavaScript typed arrays. This is much smaller than writing every float out as JSON
+text and much quicker for the browser to parse, without changing what the chart looks like. Dates on the x/y axes
+are sent as milliseconds since epoch (with the axis set to 'date'), rather than as ISO strings. Strings etc. are left
+as they are.
+
+"""
+
+import base64
+import datetime
+
+import numpy
+import pandas
+
+# NumPy dtype -> plotly.js typed array name
+_plotly_js_dtypes = {'int8': 'i1', 'uint8': 'u1', 'int16': 'i2', 'uint16': 'u2', 'int32': 'i4', 'uint32': 'u4',
+                     'float32': 'f4', 'float64': 'f8'}
+
+# Trace properties which hold text/categories, even if they look numeric
+_skip_keys = {'text', 'hovertext', 'customdata', 'ids', 'name', 'legendgroup', 'hovertemplate', 'texttemplate',
+              'meta', 'uid', 'type'}
+
+
+class FigureEncoder(object):
+
+    def __init__(self, min_length=1):
+        # Arrays shorter than this are left as JSON lists (not worth encoding)
+        self.min_length = min_length
+
+    def encode_figure(self, fig):
+        """Converts a Plotly figure to a dict, with the numeric arrays in its traces (and animation frames) stored as
+        base64 typed arrays. The dict can be given directly to eg. dcc.Graph(figure=...) or plotly.io.to_html(...,
+        validate=False).
+
+        Parameters
+        ----------
+        fig : Figure or dict
+            Plotly figure
+
+        Returns
+        -------
+        dict
+        """
+        if isinstance(fig, dict):
+            fig_dict = dict(fig)
+        else:
+            # public API (includes any animation frames), so we don't depend on Plotly's internals
+            fig_dict = fig.to_plotly_json()
+
+        fig_dict['layout'] = dict(fig_dict.get('layout', {}))
+        fig_dict['data'] = [self._encode_trace(t, fig_dict['layout']) for t in fig_dict.get('data', [])]
+
+        if 'frames' in fig_dict:
+            fig_dict['frames'] = [self._encode_frame(f, fig_dict['layout']) for f in fig_dict['frames']]
+
+        return fig_dict
+
+    def to_json(self, fig):
+        """Serialises a Plotly figure to JSON, with its numeric arrays as base64 typed arrays
+
+        Parameters
+        ----------
+        fig : Figure or dict
+            Plotly figure
+
+        Returns
+        -------
+        str
+        """
+        import plotly.io
+
+        return plotly.io.to_json(self.encode_figure(fig), validate=False)
+
+    def to_div(self, fig, include_plotlyjs=False):
+        """Creates an HTML div for a Plotly figure, with its numeric arrays as base64 typed arrays
+
+        Parameters
+        ----------
+        fig : Figure or dict
+            Plotly figure
+        include_plotlyjs : bool or str
+            Should plotly.js be embedded in the div (must be version 2.28 or later to read typed arrays)
+
+        Returns
+        -------
+        str
+        """
+        import plotly.io
+
+        return plotly.io.to_html(self.encode_figure(fig), include_plotlyjs=include_plotlyjs, full_html=False,
+                                 validate=False)
+
+    def encode_array(self, values):
+        """Encodes a numeric array as a plotly.js typed array spec. 64 bit integers are stored as 32 bit integers
+        if they fit (plotly.js has no 64 bit integer arrays), otherwise as floats.
+
+        Parameters
+        ----------
+        values : numpy.ndarray or list
+            Array to encode
+
+        Returns
+        -------
+        dict
+            {'dtype': ..., 'bdata': ...} (and 'shape' for 2D arrays) or None if the array isn't numeric
+        """
+        if not (isinstance(values, numpy.ndarray)):
+            try:
+                values = numpy.asarray(values)
+            except Exception:
+                return None
+
+        if values.ndim not in (1, 2) or values.dtype.kind not in 'iuf' or values.shape[0] < self.min_length:
+            return None
+
+        if values.dtype.kind in 'iu' and values.dtype.itemsize == 8:
+            if values.size == 0:
+                values = values.astype(numpy.int32)
+            elif values.min() >= numpy.iinfo(numpy.int32).min and values.max() <= numpy.iinfo(numpy.int32).max:
+                values = values.astype(numpy.int32)
+            elif values.min() >= 0 and values.max() <= numpy.iinfo(numpy.uint32).max:
+                values = values.astype(numpy.uint32)
+            else:
+                values = values.astype(numpy.float64)
+        elif values.dtype.kind == 'f' and values.dtype.name not in _plotly_js_dtypes:
+            values = values.astype(numpy.float64)
+
+        # plotly.js reads typed arrays as little endian
+        values = numpy.ascontiguousarray(values, dtype=values.dtype.newbyteorder('<'))
+
+        spec = {'dtype': _plotly_js_dtypes[values.dtype.name],
+                'bdata': base64.b64encode(values.data).decode('ascii')}
+
+        if values.ndim == 2:
+            spec['shape'] = str(values.shape[0]) + ', ' + str(values.shape[1])
+
+        return spec
+
+    def decode_array(self, spec):
+        """Decodes a typed array spec (from encode_array) back into a NumPy array
+
+        Parameters
+        ----------
+        spec : dict
+            {'dtype': ..., 'bdata': ...}
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+        dtype = {v: k for k, v in _plotly_js_dtypes.items()}[spec['dtype']]
+
+        values = numpy.frombuffer(base64.b64decode(spec['bdata']), dtype=numpy.dtype(dtype).newbyteorder('<'))
+
+        if 'shape' in spec:
+            values = values.reshape([int(x) for x in spec['shape'].split(',')])
+
+        return values
+
+    def _encode_frame(self, frame, layout):
+        frame = dict(frame)
+
+        if 'data' in frame:
+            frame['data'] = [self._encode_trace(t, layout) for t in frame['data']]
+
+        return frame
+
+    def _encode_trace(self, trace, layout):
+        trace = dict(trace)
+
+        for axis in ('x', 'y'):
+            values = self._get_dates(trace.get(axis))
+
+            if values is not None:
+
+                # plotly.js reads numbers on a date axis as milliseconds since epoch (without any time zone, the
+                # same as it treats date strings)
+                trace[axis] = values.astype('datetime64[ms]').astype(numpy.int64).astype(numpy.float64)
+
+                axis_name = self._get_layout_axis_name(trace.get(axis + 'axis', axis))
+                layout[axis_name] = dict(layout.get(axis_name, {}))
+
+                if layout[axis_name].get('type') in (None, '-'):
+                    layout[axis_name]['type'] = 'date'
+
+        return self._encode_object(trace)
+
+    def _get_dates(self, values):
+        # time zone naive dates as datetime64 (Plotly gives us object arrays of datetimes), otherwise None
+        if not (isinstance(values, numpy.ndarray)) or values.ndim != 1 or len(values) == 0:
+            return None
+
+        if values.dtype.kind == 'O':
+            if not (isinstance(values[0], datetime.datetime)) or values[0].tzinfo is not None:
+                return None
+
+            try:
+                values = pandas.DatetimeIndex(values).values
+            except Exception:
+                return None
+
+        if values.dtype.kind != 'M' or numpy.isnat(values).any():
+            return None
+
+        return values
+
+    def _get_layout_axis_name(self, axis_ref):
+        # eg. 'x2' -> 'xaxis2'
+        return axis_ref[0] + 'axis' + axis_ref[1:]
+
+    def _encode_object(self, obj):
+        # obj is a trace (or nested property like marker) as a dict
+        encoded = {}
+
+        for k, v in obj.items():
+            if isinstance(v, dict):
+                v = self._encode_object(v)
+            elif k not in _skip_keys and isinstance(v, (numpy.ndarray, list, tuple)) and len(v) > 0 \
+                    and not (isinstance(v[0], (str, dict))):
+                spec = self.encode_array(v)
+
+                if spec is not None:
+                    v = spec
+
+            encoded[k] = v
+
+        return encoded
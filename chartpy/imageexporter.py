@@ -0,0 +1,315 @@
+__author__ = 'saeedamen'  # Saeed Amen
+
+#
+# Copyright 2016 Cuemacro
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+"""
+ImageExporter
+
+Converts Plotly figures to static images (eg. PNG, SVG) with long lived Kaleido (or Orca) processes, which are started
+once and reused, rather than paying the start up cost of the image server for every chart. With more than one worker,
+each worker has its own Kaleido process, so batches of figures can be exported in parallel. Processes which have died
+are restarted automatically.
+
+Managing the Kaleido processes relies on Plotly internals (Plotly 5 with Kaleido 0.x). If they aren't there (eg. Kaleido
+1.x or Plotly 6), or Orca is asked for but has been removed, we fall back to the public plotly.io.to_image.
+
+"""
+
+import queue
+import threading
+
+from chartpy.chartconstants import ChartConstants
+
+cc = ChartConstants()
+
+
+class ImageExporter(object):
+
+    _image_exporter = None
+    _image_exporter_lock = threading.Lock()
+
+    def __init__(self, engine=cc.plotly_image_engine, workers=cc.plotly_image_export_workers):
+        self.engine = engine
+        self.workers = max(int(workers), 1)
+
+        self.restarts = 0
+
+        self._scopes = []
+        self._scope_queue = None
+        self._started_engine = None
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def get_image_exporter():
+        """Gets the process wide ImageExporter (created on first use, with the settings in ChartConstants)
+
+        Returns
+        -------
+        ImageExporter
+        """
+        with ImageExporter._image_exporter_lock:
+            if ImageExporter._image_exporter is None:
+                ImageExporter._image_exporter = ImageExporter()
+
+        return ImageExporter._image_exporter
+
+    ##### lifecycle
+    def start(self, engine=None, workers=None):
+        """Starts the image server process(es), if they aren't already running. Called automatically by to_image, but
+        can be called earlier, so the start up cost isn't part of the first export.
+
+        Parameters
+        ----------
+        engine : str
+            'kaleido', 'orca' or 'auto' (Kaleido if it is installed, otherwise Orca), if None uses self.engine
+        workers : int
+            Number of Kaleido processes, if None uses self.workers
+        """
+        with self._lock:
+            if engine is not None and engine != self.engine:
+                self.engine = engine
+                self.shutdown()
+
+            if workers is not None and max(int(workers), 1) != self.workers:
+                self.workers = max(int(workers), 1)
+                self.shutdown()
+
+            if self._started_engine is not None:
+                return
+
+            engine = self._resolve_engine()
+
+            if engine == 'kaleido' and self._has_kaleido_internals():
+                self._start_kaleido()
+            elif engine == 'orca' and self._has_orca():
+                import plotly.io
+
+                plotly.io.orca.ensure_server()
+            else:
+                # let Plotly manage the image server itself
+                engine = 'public'
+
+            self._started_engine = engine
+
+    def shutdown(self):
+        """Stops the image server process(es)"""
+        with self._lock:
+            if self._started_engine == 'kaleido':
+                for scope in self._scopes:
+                    try:
+                        scope._shutdown_kaleido()
+                    except Exception:
+                        pass
+
+            elif self._started_engine == 'orca':
+                try:
+                    import plotly.io
+
+                    plotly.io.orca.shutdown_server()
+                except Exception:
+                    pass
+
+            self._scopes = []
+            self._scope_queue = None
+            self._started_engine = None
+
+    def restart(self):
+        """Stops and starts the image server process(es) again"""
+        with self._lock:
+            self.shutdown()
+            self.start()
+
+            self.restarts = self.restarts + 1
+
+    def is_healthy(self):
+        """Checks whether the image server process(es) are running
+
+        Returns
+        -------
+        bool
+        """
+        with self._lock:
+            if self._started_engine == 'kaleido':
+                for scope in self._scopes:
+                    proc = getattr(scope, '_proc', None)
+
+                    # Kaleido only starts its process on the first export, so None is fine
+                    if proc is not None and proc.poll() is not None:
+                        return False
+
+                return True
+
+            elif self._started_engine == 'orca':
+                import plotly.io
+
+                return plotly.io.orca.status.state == 'running'
+
+            elif self._started_engine == 'public':
+                return True
+
+        return False
+
+    ##### exporting
+    def to_image(self, fig, format='png', width=None, height=None, scale=None):
+        """Converts a Plotly figure to a static image. If the export fails because the image server has died, it is
+        restarted and the export is tried once more.
+
+        Parameters
+        ----------
+        fig : Figure or dict
+            Plotly figure
+        format : str
+            'png', 'jpg', 'webp', 'svg' or 'pdf'
+        width : int
+            Width in pixels (if None, uses the figure's width)
+        height : int
+            Height in pixels (if None, uses the figure's height)
+        scale : float
+            Scale factor for the image
+
+        Returns
+        -------
+        bytes
+        """
+        self.start()
+
+        try:
+            return self._to_image(fig, format, width, height, scale)
+        except Exception:
+            if self.is_healthy():
+                raise
+
+        with self._lock:
+            # another thread might have already restarted it
+            if not (self.is_healthy()):
+                self.restart()
+
+        return self._to_image(fig, format, width, height, scale)
+
+    def to_image_many(self, fig_list, format='png', width=None, height=None, scale=None):
+        """Converts many Plotly figures to static images, sharing them out over the worker processes
+
+        Parameters
+        ----------
+        fig_list : Figure (list)
+            Plotly figures
+        format : str or str (list)
+            Image format, either one for all figures, or one per figure
+        width : int
+            Width in pixels (if None, uses each figure's width)
+        height : int
+            Height in pixels (if None, uses each figure's height)
+        scale : float
+            Scale factor for the images
+
+        Returns
+        -------
+        bytes (list)
+            Images in the same order as fig_list
+        """
+        fig_list = list(fig_list)
+
+        if not (isinstance(format, list)):
+            format = [format] * len(fig_list)
+
+        self.start()
+
+        # without our own Kaleido processes, there is nothing to run in parallel
+        if self.workers == 1 or len(fig_list) <= 1 or self._started_engine != 'kaleido':
+            return [self.to_image(f, format=fo, width=width, height=height, scale=scale)
+                    for f, fo in zip(fig_list, format)]
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        # Each thread borrows a Kaleido process, so the actual rendering happens in parallel
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(self.to_image, f, fo, width, height, scale) for f, fo in zip(fig_list, format)]
+
+            return [f.result() for f in futures]
+
+    def _to_image(self, fig, format, width, height, scale):
+        import plotly.io
+
+        if self._started_engine == 'public':
+            return plotly.io.to_image(fig, format=format, width=width, height=height, scale=scale)
+
+        if self._started_engine != 'kaleido':
+            return plotly.io.to_image(fig, format=format, width=width, height=height, scale=scale,
+                                      engine=self._started_engine)
+
+        from plotly.io._utils import validate_coerce_fig_to_dict
+
+        fig_dict = validate_coerce_fig_to_dict(fig, True)
+
+        scope_queue = self._scope_queue
+        scope = scope_queue.get()
+
+        try:
+            return scope.transform(fig_dict, format=format, width=width, height=height, scale=scale)
+        finally:
+            scope_queue.put(scope)
+
+    def _resolve_engine(self):
+        if self.engine != 'auto':
+            return self.engine
+
+        try:
+            import kaleido
+
+            return 'kaleido'
+        except ImportError:
+            return 'orca'
+
+    def _has_kaleido_internals(self):
+        # the Plotly internals used to run our own Kaleido processes (only in Plotly 5 with Kaleido 0.x)
+        try:
+            import plotly.io._kaleido
+            from plotly.io._utils import validate_coerce_fig_to_dict
+        except ImportError:
+            return False
+
+        scope = getattr(plotly.io._kaleido, 'scope', None)
+
+        return scope is not None and hasattr(plotly.io._kaleido, 'PlotlyScope') \
+               and all(hasattr(scope, m) for m in ('transform', '_ensure_kaleido', '_shutdown_kaleido'))
+
+    def _has_orca(self):
+        try:
+            import plotly.io
+
+            return hasattr(plotly.io, 'orca')
+        except ImportError:
+            return False
+
+    def _start_kaleido(self):
+        import plotly.io._kaleido
+
+        # Use the scope Plotly has already set up (with its own plotly.js), and copy its settings for the others
+        first_scope = plotly.io._kaleido.scope
+
+        self._scopes = [first_scope]
+
+        for i in range(1, self.workers):
+            self._scopes.append(plotly.io._kaleido.PlotlyScope(plotlyjs=first_scope.plotlyjs,
+                                                               mathjax=first_scope.mathjax))
+
+        self._scope_queue = queue.Queue()
+
+        for scope in self._scopes:
+            self._scope_queue.put(scope)
+
+            # Start the process now, rather than on the first export
+            try:
+                scope._ensure_kaleido()
+            except Exception:
+                pass
@@ -0,0 +1,392 @@
+__author__ = 'saeedamen'  # Saeed Amen
+
+#
+# Copyright 2016 Cuemacro
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+"""
+RenderCache
+
+Content addressed cache of rendered charts (eg. Plotly figure JSON, PNG bytes or HTML divs), keyed on a hash of the
+DataFrame's underlying arrays, the Style properties, the chart type and the engine. Has an in memory LRU and an
+optional on disk tier, both of which are evicted by size.
+
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+from collections import OrderedDict
+
+import numpy
+import pandas
+
+from chartpy.chartconstants import ChartConstants
+
+cc = ChartConstants()
+
+# Style fields which change between otherwise identical charts (eg. auto generated timestamps)
+_volatile_style_fields = {'plotly_url', 'file_output', 'html_file_output', 'auto_generate_filename',
+                          'auto_generate_html_filename', 'silent_display', 'render_cache'}
+
+# Kinds of entry, each stored on disk as a header line with the kind, then the raw payload (never pickled, so reading a
+# cache file, which other users might be able to write, can't run code)
+_entry_kinds = {'bytes', 'str', 'json', 'plotly_json'}
+_disk_header = b'chartpy-render-cache-1 '
+
+
+class RenderCache(object):
+
+    _render_cache = None
+    _render_cache_lock = threading.Lock()
+
+    def __init__(self, memory_bytes=cc.chartfactory_render_cache_memory_bytes,
+                 disk_folder=cc.chartfactory_render_cache_disk_folder,
+                 disk_bytes=cc.chartfactory_render_cache_disk_bytes):
+
+        self.memory_bytes = memory_bytes
+        self.disk_folder = disk_folder
+        self.disk_bytes = disk_bytes
+
+        self._memory = OrderedDict()
+        self._memory_size = 0
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+        if self.disk_folder is not None and not (os.path.exists(self.disk_folder)):
+            os.makedirs(self.disk_folder)
+
+    @staticmethod
+    def get_render_cache():
+        """Gets the process wide RenderCache (created on first use, with the settings in ChartConstants)
+
+        Returns
+        -------
+        RenderCache
+        """
+        with RenderCache._render_cache_lock:
+            if RenderCache._render_cache is None:
+                RenderCache._render_cache = RenderCache()
+
+        return RenderCache._render_cache
+
+    ##### keys
+    def create_key(self, data_frame, style, chart_type, engine):
+        """Creates the key for a chart, from a hash of the DataFrame(s) arrays and a canonical serialisation of the
+        Style properties
+
+        Parameters
+        ----------
+        data_frame : DataFrame (list)
+            Data to be plotted
+        style : Style
+            Style of the chart
+        chart_type : str (list)
+            Chart type(s)
+        engine : str
+            Name of the engine (eg. 'plotly')
+
+        Returns
+        -------
+        str
+        """
+        h = hashlib.blake2b(digest_size=20)
+
+        h.update(str(engine).encode('utf8'))
+        h.update(json.dumps(chart_type, default=str).encode('utf8'))
+
+        self._hash_object(h, data_frame)
+
+        h.update(self._serialise_style(style).encode('utf8'))
+
+        return h.hexdigest()
+
+    def _hash_object(self, h, obj):
+        if isinstance(obj, (list, tuple)):
+            h.update(b'list' + str(len(obj)).encode('utf8'))
+
+            for o in obj:
+                self._hash_object(h, o)
+
+        elif isinstance(obj, pandas.Series):
+            self._hash_object(h, obj.to_frame())
+
+        elif isinstance(obj, pandas.DataFrame):
+            h.update(b'frame' + str(obj.shape).encode('utf8'))
+            h.update(repr(obj.columns.tolist()).encode('utf8'))
+            self._hash_array(h, obj.index)
+
+            for i in range(0, len(obj.columns)):
+                self._hash_array(h, obj.iloc[:, i])
+
+        elif obj is None:
+            h.update(b'none')
+
+        else:
+            # eg. pre created Plotly figures
+            try:
+                h.update(obj.to_json().encode('utf8'))
+            except Exception:
+                h.update(repr(obj).encode('utf8'))
+
+    def _hash_array(self, h, values):
+        h.update(str(values.dtype).encode('utf8'))
+
+        arr = values.to_numpy() if hasattr(values, 'to_numpy') else numpy.asarray(values)
+
+        if arr.dtype.kind in 'biufcmM':
+            # hash the raw memory directly (no copy unless it isn't contiguous)
+            h.update(numpy.ascontiguousarray(arr).view(numpy.uint8).data)
+        else:
+            h.update(pandas.util.hash_pandas_object(pandas.Series(arr), index=False).values.tobytes())
+
+    def _serialise_style(self, style):
+        if style is None:
+            return 'None'
+
+        fields = {}
+
+        for k, v in vars(style).items():
+            # properties are stored as eg. _Style__title
+            k = k.split('__')[-1]
+
+            if k not in _volatile_style_fields:
+                fields[k] = v
+
+        return json.dumps(fields, sort_keys=True, default=self._serialise_value)
+
+    def _serialise_value(self, v):
+        if isinstance(v, (pandas.DataFrame, pandas.Series)):
+            h = hashlib.blake2b(digest_size=20)
+            self._hash_object(h, v)
+
+            return h.hexdigest()
+
+        try:
+            return v.to_json()
+        except Exception:
+            return repr(v)
+
+    ##### lookups
+    def get(self, key):
+        """Gets a rendered chart from the cache (memory first, then disk)
+
+        Parameters
+        ----------
+        key : str
+            Key from create_key
+
+        Returns
+        -------
+        obj
+            Rendered chart (or None if it isn't in the cache)
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits = self.hits + 1
+                self.memory_hits = self.memory_hits + 1
+
+                return self._decode(self._memory[key])
+
+        entry = self._read_disk(key)
+
+        with self._lock:
+            if entry is None:
+                self.misses = self.misses + 1
+
+                return None
+
+            self.hits = self.hits + 1
+            self.disk_hits = self.disk_hits + 1
+
+            self._put_memory(key, entry)
+
+        return self._decode(entry)
+
+    def put(self, key, rendered):
+        """Stores a rendered chart in the cache. Plotly figures (and figure dicts) are stored as JSON, HTML as strings
+        and images as bytes.
+
+        Parameters
+        ----------
+        key : str
+            Key from create_key
+        rendered : obj
+            Plotly Figure, dict, str or bytes
+        """
+        entry = self._encode(rendered)
+
+        if entry is None:
+            return
+
+        with self._lock:
+            self._put_memory(key, entry)
+
+        self._write_disk(key, entry)
+
+    def clear(self):
+        """Empties the memory and disk tiers (and resets the counters)"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_size = 0
+            self.hits = 0
+            self.misses = 0
+            self.memory_hits = 0
+            self.disk_hits = 0
+            self.evictions = 0
+
+            for f in self._list_disk():
+                try:
+                    os.remove(f)
+                except OSError:
+                    pass
+
+    def stats(self):
+        """Gets hit/miss counters and the size of each tier
+
+        Returns
+        -------
+        dict
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'memory_hits': self.memory_hits,
+                    'disk_hits': self.disk_hits, 'evictions': self.evictions, 'memory_entries': len(self._memory),
+                    'memory_bytes': self._memory_size,
+                    'disk_bytes': sum(os.path.getsize(f) for f in self._list_disk())}
+
+    ##### encoding
+    def _encode(self, rendered):
+        if isinstance(rendered, bytes):
+            return ('bytes', rendered)
+        elif isinstance(rendered, str):
+            return ('str', rendered.encode('utf8'))
+        elif isinstance(rendered, dict):
+            try:
+                return ('json', json.dumps(rendered).encode('utf8'))
+            except Exception:
+                return None
+
+        try:
+            return ('plotly_json', rendered.to_json().encode('utf8'))
+        except Exception:
+            return None
+
+    def _decode(self, entry):
+        kind, payload = entry
+
+        if kind == 'bytes':
+            return payload
+        elif kind == 'str':
+            return payload.decode('utf8')
+        elif kind == 'json':
+            return json.loads(payload.decode('utf8'))
+
+        # new Figure each time, so callers can't change what is in the cache (we created the JSON, so no need to
+        # validate it again, which is slow for large figures)
+        import plotly.graph_objects as go
+
+        return go.Figure(json.loads(payload.decode('utf8')), _validate=False)
+
+    ##### memory tier
+    def _put_memory(self, key, entry):
+        size = len(entry[1])
+
+        if size > self.memory_bytes:
+            return
+
+        if key in self._memory:
+            self._memory_size = self._memory_size - len(self._memory.pop(key)[1])
+
+        self._memory[key] = entry
+        self._memory_size = self._memory_size + size
+
+        while self._memory_size > self.memory_bytes:
+            _, old_entry = self._memory.popitem(last=False)
+            self._memory_size = self._memory_size - len(old_entry[1])
+            self.evictions = self.evictions + 1
+
+    ##### disk tier
+    def _disk_path(self, key):
+        return os.path.join(self.disk_folder, key + '.chartcache')
+
+    def _list_disk(self):
+        if self.disk_folder is None or not (os.path.exists(self.disk_folder)):
+            return []
+
+        return [os.path.join(self.disk_folder, f) for f in os.listdir(self.disk_folder)
+                if f.endswith('.chartcache')]
+
+    def _read_disk(self, key):
+        if self.disk_folder is None:
+            return None
+
+        try:
+            with open(self._disk_path(key), 'rb') as f:
+                header = f.readline(len(_disk_header) + 64)
+
+                if not (header.startswith(_disk_header)) or not (header.endswith(b'\n')):
+                    return None
+
+                kind = header[len(_disk_header):-1].decode('ascii')
+
+                # unknown (or old pickled) files are just treated as misses
+                if kind not in _entry_kinds:
+                    return None
+
+                payload = f.read()
+
+            # touch, so eviction is least recently used
+            os.utime(self._disk_path(key), None)
+
+            return (kind, payload)
+        except Exception:
+            return None
+
+    def _write_disk(self, key, entry):
+        if self.disk_folder is None or len(entry[1]) > self.disk_bytes:
+            return
+
+        path = self._disk_path(key)
+        temp_path = path + '.' + str(os.getpid()) + '.tmp'
+
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(_disk_header + entry[0].encode('ascii') + b'\n')
+                f.write(entry[1])
+
+            # atomic, so other processes never see half written entries
+            os.replace(temp_path, path)
+        except Exception:
+            return
+
+        files = [(os.path.getmtime(f), os.path.getsize(f), f) for f in self._list_disk()]
+        total = sum(x[1] for x in files)
+
+        for _, size, f in sorted(files):
+            if total <= self.disk_bytes:
+                break
+
+            try:
+                os.remove(f)
+                total = total - size
+
+                with self._lock:
+                    self.evictions = self.evictions + 1
+            except OSError:
+                pass
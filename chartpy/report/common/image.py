@@ -1,4 +1,5 @@
 import abc
+import io
 import os
 import uuid
 from typing import Any, AnyStr
@@ -33,12 +34,15 @@ class ImageComponent:
         The filename of the saved image
     file_location : AnyStr
         The file location of the saved image
+    image_bytes : bytes
+        The image as a PNG, rendered in memory
     """
 
     image: Image
     chart: plt.figure
     width: float = None
     height: float
+    image_bytes: bytes = None
 
     temp_directory = constants.TEMP_DIRECTORY
 
@@ -59,7 +63,7 @@ class ImageComponent:
 
     def set_size(self) -> None:
         """Sets the size of the image given"""
-        img = utils.ImageReader(self.file_location)
+        img = utils.ImageReader(io.BytesIO(self.image_bytes))
         iw, ih = img.getSize()
         aspect = ih / float(iw)
 
@@ -71,6 +75,13 @@ class ImageComponent:
         """Saves the image in file location"""
         self.chart.savefig(self.file_name, bbox_inches="tight", dpi=300)
 
+    def render_bytes(self) -> None:
+        """Renders the image as a PNG in memory (rather than to a file, which would only be read back again)"""
+        buffer = io.BytesIO()
+        self.chart.savefig(buffer, format="png", bbox_inches="tight", dpi=300)
+
+        self.image_bytes = buffer.getvalue()
+
     def create_temp_directory(self) -> None:
         """Checks the temporary directory exists"""
         check_folder(self.temp_directory)
@@ -90,11 +101,10 @@ class ImageComponent:
         Image
             Image object for reportlab to consume
         """
-        self.create_temp_directory()
         self.chart = self.generate_chart(*args, **kwargs)
-        self.write()
+        self.render_bytes()
         self.set_size()
-        return Image(self.file_location, self.width, self.height)
+        return Image(io.BytesIO(self.image_bytes), self.width, self.height)
 
     @abc.abstractmethod
     def generate_chart(self, *args: Any, **kwargs: Any) -> plt.figure:
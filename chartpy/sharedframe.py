@@ -0,0 +1,198 @@
+__author__ = 'saeedamen'  # Saeed Amen
+
+#
+# Copyright 2016 Cuemacro
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+"""
+SharedDataFrame
+
+Hands large DataFrames to other processes without pickling their data. The NumPy blocks of the DataFrame (and its
+index) are written once to memory mapped .npy files, by default in /dev/shm (ie. shared memory) where available. Only
+the file names and a little metadata are pickled, and each process which reads the frame maps the same files, getting
+a read only DataFrame which points straight at the shared pages, rather than its own copy.
+
+Columns which can't be memory mapped (eg. strings) are pickled as usual.
+
+"""
+
+import os
+import shutil
+import tempfile
+import uuid
+
+import numpy
+import pandas
+
+from chartpy.chartconstants import ChartConstants
+
+cc = ChartConstants()
+
+
+class SharedDataFrame(object):
+
+    def __init__(self, data_frame, folder=cc.chartfactory_shared_memory_folder):
+        """Writes a DataFrame's blocks to memory mapped files, so it can be read by other processes without copying
+
+        Parameters
+        ----------
+        data_frame : DataFrame
+            DataFrame to share
+        folder : str
+            Folder for the memory mapped files (if None, uses /dev/shm if it exists, otherwise the temp folder)
+        """
+        if folder is None:
+            folder = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+
+        self.folder = os.path.join(folder, 'chartpy-' + uuid.uuid4().hex)
+        self.nbytes = 0
+
+        os.makedirs(self.folder)
+
+        self._owner = True
+        self._data_frame = None
+
+        try:
+            self._columns = data_frame.columns
+            self._index = self._share_index(data_frame.index)
+            self._blocks = []
+            self._pickled_columns = {}
+
+            # group columns by dtype, so each group is one 2D block (which pandas can use without copying)
+            dtypes = data_frame.dtypes
+
+            for dtype in dtypes.unique():
+                positions = numpy.flatnonzero((dtypes == dtype).to_numpy())
+
+                if isinstance(dtype, numpy.dtype) and dtype.kind in 'biufcmM':
+                    # pandas stores blocks as (columns, rows)
+                    values = numpy.ascontiguousarray(data_frame.iloc[:, positions].to_numpy(dtype=dtype).T)
+
+                    self._blocks.append((positions, self._write(values)))
+                else:
+                    # only the values (which keep their dtype, eg. categorical), without another copy of the index
+                    for p in positions:
+                        self._pickled_columns[p] = data_frame.iloc[:, p].array
+        except Exception:
+            self.release()
+            raise
+
+    def to_data_frame(self):
+        """Gets the DataFrame, mapped read only onto the shared files (in the process which created it, the same
+        DataFrame is rebuilt from the files)
+
+        Returns
+        -------
+        DataFrame
+        """
+        if self._data_frame is not None:
+            return self._data_frame
+
+        index = self._read_index()
+
+        parts = []
+        positions = []
+
+        for block_positions, file_name in self._blocks:
+            values = self._read(file_name)
+
+            parts.append(pandas.DataFrame(values.T, index=index, columns=self._columns[block_positions], copy=False))
+            positions.extend(block_positions)
+
+        for p, values in self._pickled_columns.items():
+            parts.append(pandas.DataFrame({self._columns[p]: values}, index=index))
+            positions.append(p)
+
+        if len(parts) == 0:
+            data_frame = pandas.DataFrame(index=index, columns=self._columns)
+        else:
+            data_frame = pandas.concat(parts, axis=1, copy=False) if len(parts) > 1 else parts[0]
+
+            # back to the original column order (by position, in case of duplicate column names)
+            order = numpy.argsort(numpy.asarray(positions))
+
+            if not (numpy.array_equal(order, numpy.arange(len(order)))):
+                data_frame = data_frame.iloc[:, order]
+
+        self._data_frame = data_frame
+
+        return data_frame
+
+    def release(self):
+        """Deletes the shared files (only in the process which created them). DataFrames already mapped onto them
+        can still be used on Linux, but no new processes can read them.
+        """
+        self._data_frame = None
+
+        if self._owner:
+            shutil.rmtree(self.folder, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.release()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+
+        # only the owner deletes the files, and other processes map their own DataFrame
+        state['_owner'] = False
+        state['_data_frame'] = None
+
+        return state
+
+    ##### files
+    def _write(self, values):
+        file_name = uuid.uuid4().hex + '.npy'
+
+        numpy.save(os.path.join(self.folder, file_name), values, allow_pickle=False)
+
+        self.nbytes = self.nbytes + values.nbytes
+
+        return file_name
+
+    def _read(self, file_name):
+        return numpy.load(os.path.join(self.folder, file_name), mmap_mode='r', allow_pickle=False)
+
+    def _share_index(self, index):
+        if isinstance(index, pandas.DatetimeIndex):
+            return ('datetime', self._write(index.as_unit('ns').asi8), index.tz, index.name)
+
+        if isinstance(index, pandas.RangeIndex):
+            # only needs start/stop/step
+            return ('pickled', index)
+
+        if not (isinstance(index, pandas.MultiIndex)) and isinstance(index.dtype, numpy.dtype) \
+                and index.dtype.kind in 'biuf':
+            return ('numeric', self._write(index.to_numpy()), None, index.name)
+
+        return ('pickled', index)
+
+    def _read_index(self):
+        kind = self._index[0]
+
+        if kind == 'pickled':
+            return self._index[1]
+
+        kind, file_name, tz, name = self._index
+
+        values = self._read(file_name)
+
+        if kind == 'datetime':
+            index = pandas.DatetimeIndex(values.view('datetime64[ns]'), copy=False, name=name)
+
+            if tz is not None:
+                index = index.tz_localize('UTC').tz_convert(tz)
+
+            return index
+
+        return pandas.Index(values, copy=False, name=name)
@@ -57,6 +57,12 @@ class Style(object):
                  exclude_from_color=[],
                  normalize_colormap=True,
 
+                 # Heatmaps
+                 heatmap_label_max_cells=cc.chartfactory_heatmap_label_max_cells,
+
+                 # Bar charts
+                 bar_collection=cc.chartfactory_bar_collection,
+
                  # Bubble charts
                  bubble_series=None,
                  bubble_size_scalar=cc.chartfactory_bubble_size_scalar,
@@ -67,6 +73,7 @@ class Style(object):
                  candlestick_increasing_line_color=None,
                  candlestick_decreasing_color=None,
                  candlestick_decreasing_line_color=None,
+                 candlestick_trace=cc.plotly_candlestick_trace,
                  
                  # Overlay figures
                  overlay_fig=None,
@@ -82,6 +89,7 @@ class Style(object):
                  width=cc.chartfactory_width,
                  height=cc.chartfactory_height,
                  resample=None,
+                 resample_pixel_width=None,
                  thin_margin=False,
                  auto_scale=cc.auto_scale,
 
@@ -101,6 +109,8 @@ class Style(object):
                  marker_size=1,
                  line_of_best_fit=False,
                  line_shape=None,
+                 line_collection_threshold=cc.chartfactory_line_collection_threshold,
+                 legend_max_series=cc.chartfactory_legend_max_series,
 
                  # Shaded regions
                  x_shade_dates=None,
@@ -158,6 +168,7 @@ class Style(object):
                  auto_generate_filename=False,
                  auto_generate_html_filename=False,
                  save_fig=True,
+                 render_cache=cc.chartfactory_render_cache,
 
                  # plotly only
                  plotly_url=None,
@@ -169,17 +180,21 @@ class Style(object):
                  plotly_theme=cc.plotly_theme,
                  plotly_plot_mode=cc.plotly_plot_mode,
                  plotly_webgl=cc.plotly_webgl,
+                 plotly_webgl_threshold=cc.plotly_webgl_threshold,
                  plotly_helper=cc.plotly_helper,
 
                  # Bokeh
                  bokeh_plot_mode=cc.bokeh_plot_mode,
+                 bokeh_shared_source=cc.bokeh_shared_source,
+                 bokeh_heatmap_rect_max_cells=cc.bokeh_heatmap_rect_max_cells,
 
                  # plotly choropleth fields
 
 
                  # Matplotlib only
                  style_sheet=cc.chartfactory_default_stylesheet,
-                 convert_matplotlib_to_plotly=False
+                 convert_matplotlib_to_plotly=False,
+                 matplotlib_plot_mode=cc.matplotlib_plot_mode
                  ):
 
         self.engine = engine
@@ -211,6 +226,12 @@ class Style(object):
         self.exclude_from_color = exclude_from_color
         self.normalize_colormap = normalize_colormap
 
+        # Heatmaps
+        self.heatmap_label_max_cells = heatmap_label_max_cells
+
+        # Bar charts
+        self.bar_collection = bar_collection
+
         # Bubble specific fields
         self.bubble_series = bubble_series
         self.bubble_size_scalar = bubble_size_scalar
@@ -221,6 +242,7 @@ class Style(object):
         self.candlestick_increasing_line_color = candlestick_increasing_line_color
         self.candlestick_decreasing_color = candlestick_decreasing_color
         self.candlestick_decreasing_line_color = candlestick_decreasing_line_color
+        self.candlestick_trace = candlestick_trace
         
         # Overlay plots
         self.overlay_fig = overlay_fig
@@ -235,7 +257,8 @@ class Style(object):
         self.dpi = dpi
         self.width = width
         self.height = height
-        self.resample = resample
+        self.resample = resample  # None, 'lttb', 'minmax' or pandas frequency eg. '1min'
+        self.resample_pixel_width = resample_pixel_width
         self.thin_margin = thin_margin
         self.auto_scale = auto_scale
 
@@ -255,6 +278,8 @@ class Style(object):
         self.marker_size = marker_size
         self.line_of_best_fit = line_of_best_fit
         self.line_shape = line_shape
+        self.line_collection_threshold = line_collection_threshold
+        self.legend_max_series = legend_max_series
 
         # Shaded regions
         self.x_shade_dates = x_shade_dates
@@ -313,9 +338,12 @@ class Style(object):
         self.display_mpld3 = display_mpld3
         self.auto_generate_filename = auto_generate_filename
         self.auto_generate_html_filename = auto_generate_html_filename
+        self.render_cache = render_cache
 
         # bokeh only
         self.bokeh_plot_mode = bokeh_plot_mode  # 'online', 'offline_html', 'offline_jupyter'
+        self.bokeh_shared_source = bokeh_shared_source  # one ColumnDataSource per index, shared by glyphs/subplots
+        self.bokeh_heatmap_rect_max_cells = bokeh_heatmap_rect_max_cells  # larger heatmaps are drawn as an image
 
         # plotly only
         if plotly_url is None:
@@ -330,6 +358,7 @@ class Style(object):
         self.plotly_as_image = plotly_as_image
         self.plotly_username = plotly_username
         self.plotly_webgl = plotly_webgl
+        self.plotly_webgl_threshold = plotly_webgl_threshold
         self.plotly_helper = plotly_helper
 
         # try to get API key from GraphicsConstants file
@@ -347,6 +376,7 @@ class Style(object):
         # matplotlib only
         self.style_sheet = style_sheet
         self.convert_matplotlib_to_plotly = convert_matplotlib_to_plotly
+        self.matplotlib_plot_mode = matplotlib_plot_mode  # 'offline_file', 'offline_image_png_bytes', 'offline_image_png_in_html'...
 
     def str_list(self, original):
 
@@ -503,6 +533,24 @@ class Style(object):
     def normalize_colormap(self, normalize_colormap):
         self.__normalize_colormap = self.str_list(normalize_colormap)
 
+    ###### heatmaps
+    @property
+    def heatmap_label_max_cells(self):
+        return self.__heatmap_label_max_cells
+
+    @heatmap_label_max_cells.setter
+    def heatmap_label_max_cells(self, heatmap_label_max_cells):
+        self.__heatmap_label_max_cells = heatmap_label_max_cells
+
+    ###### bar charts
+    @property
+    def bar_collection(self):
+        return self.__bar_collection
+
+    @bar_collection.setter
+    def bar_collection(self, bar_collection):
+        self.__bar_collection = bar_collection
+
     ###### bubble specific series
 
     @property
@@ -561,6 +609,14 @@ class Style(object):
     @candlestick_decreasing_line_color.setter
     def candlestick_decreasing_line_color(self, candlestick_decreasing_line_color):
         self.__candlestick_decreasing_line_color = candlestick_decreasing_line_color
+
+    @property
+    def candlestick_trace(self):
+        return self.__candlestick_trace
+
+    @candlestick_trace.setter
+    def candlestick_trace(self, candlestick_trace):
+        self.__candlestick_trace = candlestick_trace
     
     ###### Overlay figures
     @property
@@ -688,6 +744,14 @@ class Style(object):
     def resample(self, resample):
         self.__resample = resample
 
+    @property
+    def resample_pixel_width(self):
+        return self.__resample_pixel_width
+
+    @resample_pixel_width.setter
+    def resample_pixel_width(self, resample_pixel_width):
+        self.__resample_pixel_width = resample_pixel_width
+
     ###### line properties and second y-axis
     @property
     def y_axis_2_series(self):
@@ -744,6 +808,22 @@ class Style(object):
     @line_shape.setter
     def line_shape(self, line_shape):
         self.__line_shape = line_shape
+
+    @property
+    def line_collection_threshold(self):
+        return self.__line_collection_threshold
+
+    @line_collection_threshold.setter
+    def line_collection_threshold(self, line_collection_threshold):
+        self.__line_collection_threshold = line_collection_threshold
+
+    @property
+    def legend_max_series(self):
+        return self.__legend_max_series
+
+    @legend_max_series.setter
+    def legend_max_series(self, legend_max_series):
+        self.__legend_max_series = legend_max_series
         
     
     ###### Shaded regions
@@ -1049,6 +1129,14 @@ class Style(object):
     def auto_generate_html_filename(self, auto_generate_html_filename):
         self.__auto_generate_html_filename = auto_generate_html_filename
 
+    @property
+    def render_cache(self):
+        return self.__render_cache
+
+    @render_cache.setter
+    def render_cache(self, render_cache):
+        self.__render_cache = render_cache
+
     ###### Plotly specific settings
     @property
     def plotly_url(self):
@@ -1125,6 +1213,14 @@ class Style(object):
     @plotly_webgl.setter
     def plotly_webgl(self, plotly_webgl):
         self.__plotly_webgl = plotly_webgl
+
+    @property
+    def plotly_webgl_threshold(self):
+        return self.__plotly_webgl_threshold
+
+    @plotly_webgl_threshold.setter
+    def plotly_webgl_threshold(self, plotly_webgl_threshold):
+        self.__plotly_webgl_threshold = plotly_webgl_threshold
         
     @property
     def plotly_helper(self):
@@ -1143,6 +1239,22 @@ class Style(object):
     def bokeh_plot_mode(self, bokeh_plot_mode):
         self.__bokeh_plot_mode = bokeh_plot_mode
 
+    @property
+    def bokeh_shared_source(self):
+        return self.__bokeh_shared_source
+
+    @bokeh_shared_source.setter
+    def bokeh_shared_source(self, bokeh_shared_source):
+        self.__bokeh_shared_source = bokeh_shared_source
+
+    @property
+    def bokeh_heatmap_rect_max_cells(self):
+        return self.__bokeh_heatmap_rect_max_cells
+
+    @bokeh_heatmap_rect_max_cells.setter
+    def bokeh_heatmap_rect_max_cells(self, bokeh_heatmap_rect_max_cells):
+        self.__bokeh_heatmap_rect_max_cells = bokeh_heatmap_rect_max_cells
+
     ###### matplotlib specific settings
     @property
     def style_sheet(self):
@@ -1158,4 +1270,12 @@ class Style(object):
 
     @convert_matplotlib_to_plotly.setter
     def convert_matplotlib_to_plotly(self, convert_matplotlib_to_plotly):
-        self.__convert_matplotlib_to_plotly = convert_matplotlib_to_plotly
\ No newline at end of file
+        self.__convert_matplotlib_to_plotly = convert_matplotlib_to_plotly
+
+    @property
+    def matplotlib_plot_mode(self):
+        return self.__matplotlib_plot_mode
+
+    @matplotlib_plot_mode.setter
+    def matplotlib_plot_mode(self, matplotlib_plot_mode):
+        self.__matplotlib_plot_mode = matplotlib_plot_mode
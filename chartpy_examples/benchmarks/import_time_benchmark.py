@@ -0,0 +1,74 @@
+__author__ = 'saeedamen'  # Saeed Amen
+
+#
+# Copyright 2016 Cuemacro
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+"""
+Checks that "import chartpy" stays cheap, ie. that it doesn't import any of the plotting libraries (these should only
+be imported when an engine is first used) and that the import time is below a threshold. Each run uses a fresh Python
+process, so nothing is cached between runs. Exits with a non-zero code if the checks fail, so can be used in CI.
+
+python chartpy_examples/benchmarks/import_time_benchmark.py
+
+"""
+
+import subprocess
+import sys
+import time
+
+# Plotting libraries which should NOT be imported by "import chartpy"
+heavy_modules = ['matplotlib', 'mpl_toolkits', 'plotly', 'bokeh', 'bqplot', 'vispy']
+
+no_of_runs = 5
+max_import_time_secs = 1.5
+
+check_code = "import sys; import chartpy; " \
+             "print(','.join(m for m in " + str(heavy_modules) + " if m in sys.modules))"
+
+timings = []
+loaded = ''
+
+for i in range(0, no_of_runs):
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, '-c', check_code], capture_output=True, text=True, check=True)
+    timings.append(time.perf_counter() - start)
+
+    loaded = output.stdout.strip()
+
+# Baseline of an empty interpreter, so we only measure chartpy (and its dependencies)
+start = time.perf_counter()
+subprocess.run([sys.executable, '-c', 'pass'], check=True)
+interpreter_time = time.perf_counter() - start
+
+median_time = sorted(timings)[len(timings) // 2] - interpreter_time
+
+print("import chartpy: median " + "{:.3f}".format(median_time) + "s over " + str(no_of_runs) + " runs")
+
+failed = False
+
+if loaded != '':
+    print("FAIL: import chartpy also imported " + loaded)
+    failed = True
+
+if median_time > max_import_time_secs:
+    print("FAIL: import chartpy took longer than " + str(max_import_time_secs) + "s")
+    failed = True
+
+# Also show the breakdown of the slowest imports
+output = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import chartpy'], capture_output=True, text=True)
+lines = [l for l in output.stderr.split('\n') if l.startswith('import time:') and 'self [us]' not in l]
+lines = sorted(lines, key=lambda l: int(l.split('|')[1]), reverse=True)
+
+print("\nSlowest cumulative imports")
+print('\n'.join(lines[0:10]))
+
+sys.exit(1 if failed else 0)
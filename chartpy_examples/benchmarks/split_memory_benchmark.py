@@ -0,0 +1,75 @@
+__author__ = 'saeedamen'  # Saeed Amen
+
+#
+# Copyright 2016 Cuemacro
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+"""
+Checks that splitting a wide DataFrame into subplots (style.subplots = True) doesn't copy its columns, ie. that each
+subplot's DataFrame is a view on the original data. Measures the peak memory allocated (with tracemalloc) while
+splitting a 200 column DataFrame and reading the values of every subplot, as the engines do. Exits with a non-zero code
+if the peak is more than a small fraction of the size of the DataFrame, so can be used in CI.
+
+python chartpy_examples/benchmarks/split_memory_benchmark.py
+
+"""
+
+import sys
+import tracemalloc
+
+import numpy
+import pandas
+
+from chartpy import Style
+from chartpy.engine_matplotlib import EngineMatplotlib
+
+no_of_rows = 50000
+no_of_columns = 200
+
+# Peak allocation allowed, as a fraction of the size of the DataFrame (a copy of every column would be 1.0)
+max_peak_fraction = 0.1
+
+data_frame = pandas.DataFrame(numpy.random.randn(no_of_rows, no_of_columns),
+                              index=pandas.date_range('2020-01-01', periods=no_of_rows, freq='1min'),
+                              columns=['Series ' + str(i) for i in range(0, no_of_columns)])
+
+frame_bytes = data_frame.memory_usage(index=False).sum()
+
+style = Style(subplots=True)
+
+tracemalloc.start()
+
+data_frame_list = EngineMatplotlib().split_data_frame_to_list(data_frame, style, chart_type='line')
+
+total = 0.0
+
+for d in data_frame_list:
+    total = total + d.iloc[:, 0].to_numpy().sum()
+
+current, peak = tracemalloc.get_traced_memory()
+tracemalloc.stop()
+
+print("DataFrame: " + "{:.1f}".format(frame_bytes / 1e6) + "MB, " + str(no_of_columns) + " columns")
+print("split_data_frame_to_list: peak " + "{:.2f}".format(peak / 1e6) + "MB allocated, "
+      + "{:.1%}".format(peak / frame_bytes) + " of the DataFrame")
+
+failed = False
+
+if len(data_frame_list) != no_of_columns:
+    print("FAIL: expected " + str(no_of_columns) + " subplots, got " + str(len(data_frame_list)))
+    failed = True
+
+if peak > max_peak_fraction * frame_bytes:
+    print("FAIL: splitting into subplots allocated more than " + "{:.0%}".format(max_peak_fraction)
+          + " of the DataFrame, are the columns being copied?")
+    failed = True
+
+sys.exit(1 if failed else 0)
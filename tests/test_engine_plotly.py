@@ -0,0 +1,56 @@
+__author__ = 'saeedamen'  # Saeed Amen
+
+#
+# Copyright 2016 Cuemacro
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+import os
+
+import pytest
+
+pytest.importorskip('plotly')
+pytest.importorskip('kaleido')
+
+from chartpy import Style
+from chartpy.engine_plotly import EnginePlotly
+
+
+def _create_fig_list(no_of_figs):
+    import plotly.graph_objects as go
+
+    return [go.Figure(go.Scatter(y=[1, i, 2])) for i in range(0, no_of_figs)]
+
+
+def test_publish_many_one_file_per_figure_with_shared_style(tmp_path, monkeypatch):
+    # auto generated file names are relative to the working directory
+    monkeypatch.chdir(tmp_path)
+
+    style = Style(plotly_plot_mode='offline_png')
+
+    output_list = EnginePlotly().publish_many(_create_fig_list(4), style)
+
+    files = sorted(f for f in os.listdir(tmp_path) if f.endswith('.png'))
+
+    assert len(output_list) == 4
+    assert len(files) == 4
+
+    # the caller's Style isn't changed
+    assert style.file_output is None
+
+
+def test_publish_many_one_file_per_figure_with_same_file_output(tmp_path):
+    style = Style(plotly_plot_mode='offline_png', file_output=str(tmp_path / 'chart.png'))
+
+    EnginePlotly().publish_many(_create_fig_list(3), style)
+
+    files = sorted(f for f in os.listdir(tmp_path) if f.endswith('.png'))
+
+    assert len(files) == 3
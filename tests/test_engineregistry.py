@@ -0,0 +1,57 @@
+__author__ = 'saeedamen'  # Saeed Amen
+
+#
+# Copyright 2016 Cuemacro
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+from chartpy import EngineRegistry
+from chartpy.engine import EngineTemplate
+
+
+class _EngineTest(EngineTemplate):
+
+    def plot_chart(self, data_frame, style, type):
+        return
+
+
+def test_clear_cache_keeps_registered_instance():
+    registry = EngineRegistry()
+    engine = _EngineTest()
+
+    registry.register_engine('test-instance', engine)
+
+    try:
+        assert registry.get_engine('test-instance') is engine
+
+        registry.clear_cache()
+        assert registry.get_engine('test-instance') is engine
+
+        registry.clear_cache('test-instance')
+        assert registry.get_engine('test-instance') is engine
+    finally:
+        registry.unregister_engine('test-instance')
+
+
+def test_clear_cache_rebuilds_registered_class():
+    registry = EngineRegistry()
+    registry.register_engine('test-class', _EngineTest)
+
+    try:
+        engine = registry.get_engine('test-class')
+        assert isinstance(engine, _EngineTest)
+
+        registry.clear_cache('test-class')
+        engine_rebuilt = registry.get_engine('test-class')
+
+        assert isinstance(engine_rebuilt, _EngineTest)
+        assert engine_rebuilt is not engine
+    finally:
+        registry.unregister_engine('test-class')